@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Замер памяти, занимаемой разобранным плейлистом
+
+Сравнивает прежнее представление канала (словарь с отдельным словарем опций)
+с компактной записью Channel на синтетическом плейлисте.
+
+Запуск: python benchmarks/bench_channel_memory.py [количество_каналов]
+"""
+
+import os
+import sys
+import gc
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playlist import M3UParser  # noqa: E402
+
+CATEGORIES = ["Фильмы", "Спорт", "Новости", "Музыка", "Детские", ""]
+
+
+def generate_playlist(path, count):
+    """Создает синтетический M3U плейлист"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('#EXTM3U\n')
+        for i in range(count):
+            category = CATEGORIES[i % len(CATEGORIES)]
+            f.write(f'#EXTINF:-1 tvg-id="id{i}" tvg-logo="http://logo{i % 50}.example/{i % 500}.png" '
+                    f'group-title="{category}",Канал {i} HD\n')
+            if i % 11 == 0:
+                f.write('#EXTVLCOPT:http-user-agent=Mozilla/5.0\n')
+            f.write(f'http://stream.example/{i}.m3u8\n')
+
+
+def as_dict(channel):
+    """Прежнее представление канала в виде словаря"""
+    return {
+        'name': channel.name,
+        'options': dict(channel.options or {}),
+        'category': str(channel.category),
+        'tvg_id': channel.tvg_id,
+        'tvg_logo': str(channel.tvg_logo),
+        'url': channel.url
+    }
+
+
+def measure(path, convert):
+    """Возвращает объем памяти (байт), удерживаемой списком каналов"""
+    gc.collect()
+    tracemalloc.start()
+    parser = M3UParser()
+    channels = []
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            channel = parser.feed_line(line)
+            if channel is not None:
+                channels.append(convert(channel))
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, len(channels)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, 'bench.m3u')
+        generate_playlist(path, count)
+
+        dict_bytes, parsed = measure(path, as_dict)
+        slots_bytes, _ = measure(path, lambda channel: channel)
+
+    mb = 1024 * 1024
+    print(f"Каналов: {parsed}")
+    print(f"dict:    {dict_bytes / mb:8.1f} МБ")
+    print(f"Channel: {slots_bytes / mb:8.1f} МБ")
+    print(f"Экономия: {(1 - slots_bytes / dict_bytes) * 100:.0f}%")
+
+
+if __name__ == '__main__':
+    main()
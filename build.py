@@ -40,6 +40,9 @@ HIDDEN_IMPORTS = [
     "constants",        # Константы и стили
     "platform_utils",   # Платформенные утилиты
     "playlist",         # Управление плейлистами
+    "channel_model",    # Модели списков каналов
+    "http_client",      # Общий HTTP-клиент с пулом соединений
+    "logo_cache",       # Кэш логотипов каналов
     "ui_components",    # UI компоненты
     "media_player",     # Медиаплеер с поддержкой перемотки
     "threads",          # Управление потоками
@@ -343,6 +346,9 @@ def show_module_info():
         "constants.py": "Константы, стили CSS и настройки по умолчанию",
         "platform_utils.py": "Платформенно-зависимая логика (Windows/Linux/macOS)",
         "playlist.py": "Парсинг и управление плейлистами M3U",
+        "channel_model.py": "Модели Qt для виртуализированных списков каналов",
+        "http_client.py": "Общий HTTP-клиент с пулом соединений для всех загрузок",
+        "logo_cache.py": "Дисковый кэш логотипов с ограничением размера",
         "ui_components.py": "Переиспользуемые UI компоненты и фабрики",
         "media_player.py": "Медиаплеер с поддержкой перемотки и временных меток",
         "threads.py": "Управление потоками и асинхронными операциями"
@@ -380,6 +386,9 @@ def check_tools():
         "constants.py",     # Константы и стили
         "platform_utils.py", # Платформенные утилиты
         "playlist.py",      # Управление плейлистами
+        "channel_model.py", # Модели списков каналов
+        "http_client.py",   # Общий HTTP-клиент
+        "logo_cache.py",    # Кэш логотипов
         "ui_components.py", # UI компоненты
         "media_player.py",  # Медиаплеер с поддержкой перемотки
         "threads.py"        # Управление потоками
@@ -0,0 +1,450 @@
+"""
+Модуль моделей каналов для MaksIPTV Player
+Версия 0.13.0
+
+Содержит модели Qt для отображения каналов через QListView/QTreeView:
+- ChannelListModel - плоский список каналов
+- ChannelTreeModel - дерево "категория -> каналы"
+
+Модели хранят только идентификаторы каналов и берут данные напрямую из
+PlaylistManager, поэтому элементы создаются лишь для видимых строк.
+Для отображенных строк модели ведут обратный индекс "URL логотипа -> строки",
+чтобы загруженный логотип обновлял только использующие его строки.
+Изменения перезагруженного плейлиста применяются к моделям на месте, поэтому
+представления сохраняют прокрутку, выделение и развернутые категории.
+Менеджер к этому моменту уже содержит новые каналы, поэтому до первого
+сигнала модели все строки переводятся на новые идентификаторы, а удаляемые
+строки до конца удаления показывают прежние объекты каналов.
+"""
+
+import bisect
+
+from PyQt5.QtCore import Qt, QAbstractItemModel, QAbstractListModel, QModelIndex
+
+
+def _is_display_ordered(channel_ids, id_map, rank):
+    """Проверяет, что сохранившиеся каналы не поменяли взаимный порядок"""
+    previous = -1
+    for channel_id in channel_ids:
+        new_id = id_map.get(channel_id)
+        if new_id is None:
+            continue
+        position = rank(new_id)
+        if position < previous:
+            return False
+        previous = position
+    return True
+
+
+def _detach_rows(channel_ids, id_map, removed_channels, detached):
+    """Переводит строки на новые идентификаторы до отправки сигналов модели
+
+    Сохранившиеся каналы получают новые идентификаторы, а строки исчезнувших
+    каналов - временные отрицательные ключи в detached, по которым модель
+    отдает прежние объекты каналов, пока строки не удалены.
+
+    Args:
+        channel_ids: Список идентификаторов строк, изменяемый на месте
+        id_map: Старый идентификатор -> новый для сохранившихся каналов
+        removed_channels: Старый идентификатор -> исчезнувший канал
+        detached: Временный ключ -> канал удаляемой строки (дополняется)
+    """
+    for row, channel_id in enumerate(channel_ids):
+        new_id = id_map.get(channel_id)
+        if new_id is None:
+            new_id = -len(detached) - 1
+            detached[new_id] = removed_channels[channel_id]
+        channel_ids[row] = new_id
+
+
+def _remove_detached_rows(model, parent, channel_ids):
+    """Удаляет строки исчезнувших каналов непрерывными диапазонами с конца"""
+    row = len(channel_ids) - 1
+    while row >= 0:
+        if channel_ids[row] >= 0:
+            row -= 1
+            continue
+        last = row
+        while row >= 0 and channel_ids[row] < 0:
+            row -= 1
+        model.beginRemoveRows(parent, row + 1, last)
+        del channel_ids[row + 1:last + 1]
+        model.endRemoveRows()
+
+
+def _insert_rows(model, parent, channel_ids, added_ids, rank):
+    """Вставляет новые каналы по порядку отображения
+
+    Позиции вставки ищутся по исходному списку, вставка идет с конца
+    непрерывными диапазонами, поэтому число сигналов модели пропорционально
+    числу изменений, а не размеру списка.
+
+    Args:
+        model: Модель, от имени которой отправляются сигналы
+        parent: Родительский индекс строк
+        channel_ids: Список идентификаторов строк, изменяемый на месте
+        added_ids: Новые идентификаторы для вставки
+        rank: Функция id -> позиция канала в порядке отображения
+    """
+    if not added_ids:
+        return
+
+    ranks = [rank(channel_id) for channel_id in channel_ids]
+    runs = []
+    for channel_id in sorted(added_ids, key=rank):
+        position = bisect.bisect(ranks, rank(channel_id))
+        if runs and runs[-1][0] == position:
+            runs[-1][1].append(channel_id)
+        else:
+            runs.append((position, [channel_id]))
+
+    for position, run in reversed(runs):
+        model.beginInsertRows(parent, position, position + len(run) - 1)
+        channel_ids[position:position] = run
+        model.endInsertRows()
+
+
+def _find_rows(channel_ids, wanted_ids):
+    """Возвращает номера строк с указанными идентификаторами по возрастанию"""
+    return [row for row, channel_id in enumerate(channel_ids) if channel_id in wanted_ids]
+
+
+class ChannelListModel(QAbstractListModel):
+    """Плоский список каналов, заданный идентификаторами"""
+
+    def __init__(self, playlist_manager, icon_provider=None, parent=None):
+        """
+        Args:
+            playlist_manager: Источник данных о каналах
+            icon_provider: Функция channel -> QIcon | None для иконок каналов
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.playlist_manager = playlist_manager
+        self.icon_provider = icon_provider
+        self._channel_ids = []
+        self._rows_by_logo = {}  # URL логотипа -> строки, для которых запрашивалась иконка
+        self._detached_channels = {}  # Временный ключ -> канал строки, удаляемой при слиянии
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._channel_ids)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        channel_id = self._channel_ids[index.row()]
+        if role == Qt.UserRole:
+            return channel_id
+
+        if channel_id < 0:
+            channel = self._detached_channels[channel_id]
+        else:
+            channel = self.playlist_manager.channels[channel_id]
+        if role == Qt.DisplayRole:
+            return channel.name
+        if role == Qt.DecorationRole and self.icon_provider is not None:
+            if channel.tvg_logo:
+                self._rows_by_logo.setdefault(channel.tvg_logo, set()).add(index.row())
+            return self.icon_provider(channel)
+        return None
+
+    def set_channel_ids(self, channel_ids):
+        """Заменяет содержимое списка"""
+        self.beginResetModel()
+        self._channel_ids = list(channel_ids)
+        self._rows_by_logo = {}
+        self.endResetModel()
+
+    def append_channel_ids(self, channel_ids):
+        """Добавляет каналы в конец списка"""
+        if not channel_ids:
+            return
+        first = len(self._channel_ids)
+        self.beginInsertRows(QModelIndex(), first, first + len(channel_ids) - 1)
+        self._channel_ids.extend(channel_ids)
+        self.endInsertRows()
+
+    def channel_id(self, index):
+        """Возвращает идентификатор канала для индекса или None"""
+        if not index.isValid() or index.row() >= len(self._channel_ids):
+            return None
+        return self._channel_ids[index.row()]
+
+    def update_logo(self, logo_url):
+        """Перерисовывает строки, которые показывали канал с этим логотипом"""
+        for row in self._rows_by_logo.pop(logo_url, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def apply_channel_changes(self, id_map, removed_channels, added_ids, changed_ids, rank):
+        """Применяет изменения перезагруженного плейлиста без сброса модели
+
+        Args:
+            id_map: Старый идентификатор -> новый для сохранившихся каналов
+            removed_channels: Старый идентификатор -> исчезнувший канал
+            added_ids: Новые каналы, которые нужно показать в списке
+            changed_ids: Новые идентификаторы каналов с изменившимися данными
+            rank: Функция id -> позиция канала в порядке отображения
+
+        Returns:
+            bool: False, если сохранившиеся каналы поменяли порядок
+                и список нужно заполнить заново (модель не изменяется)
+        """
+        if not _is_display_ordered(self._channel_ids, id_map, rank):
+            return False
+
+        # Номера строк сдвигаются; индекс заполнится заново при отрисовке
+        self._rows_by_logo = {}
+        _detach_rows(self._channel_ids, id_map, removed_channels, self._detached_channels)
+        _remove_detached_rows(self, QModelIndex(), self._channel_ids)
+        self._detached_channels = {}
+        _insert_rows(self, QModelIndex(), self._channel_ids, added_ids, rank)
+
+        if changed_ids:
+            rows = _find_rows(self._channel_ids, set(changed_ids))
+            if rows:
+                self.dataChanged.emit(self.index(rows[0]), self.index(rows[-1]))
+        return True
+
+
+class ChannelTreeModel(QAbstractItemModel):
+    """Дерево каналов, сгруппированных по категориям
+
+    Верхний уровень - категории в алфавитном порядке, второй - каналы.
+    Группы хранятся в списке, который только дополняется, и номер группы
+    служит internalId строк каналов, поэтому вставка новой категории
+    не делает недействительными индексы уже показанных каналов.
+    """
+
+    def __init__(self, playlist_manager, icon_provider=None, parent=None):
+        """
+        Args:
+            playlist_manager: Источник данных о каналах и иконок категорий
+            icon_provider: Функция channel -> QIcon | None для иконок каналов
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.playlist_manager = playlist_manager
+        self.icon_provider = icon_provider
+        self._reset_groups()
+
+    def _reset_groups(self):
+        self._group_names = []      # Название категории по номеру группы
+        self._group_ids = []        # Идентификаторы каналов по номеру группы
+        self._row_groups = []       # Номера групп в порядке отображения
+        self._sorted_names = []     # Названия категорий в порядке отображения
+        self._group_rows = {}       # Номер группы -> строка верхнего уровня
+        self._rows_by_logo = {}     # URL логотипа -> (номер группы, строка) отображенных каналов
+        self._detached_channels = {}  # Временный ключ -> канал строки, удаляемой при слиянии
+
+    def index(self, row, column=0, parent=QModelIndex()):
+        # Метод вызывается представлением для каждой строки, поэтому проверки минимальны
+        if parent.isValid():
+            if parent.internalId() == 0 and column == 0:
+                group = self._row_groups[parent.row()]
+                if 0 <= row < len(self._group_ids[group]):
+                    return self.createIndex(row, 0, group + 1)
+            return QModelIndex()
+
+        if column == 0 and 0 <= row < len(self._row_groups):
+            return self.createIndex(row, 0, 0)
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        group = index.internalId() - 1
+        return self.createIndex(self._group_rows[group], 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self._row_groups)
+        if parent.internalId() != 0:
+            return 0
+        return len(self._group_ids[self._row_groups[parent.row()]])
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return bool(self._row_groups)
+        # У каналов дочерних строк нет
+        return parent.internalId() == 0 and bool(self._group_ids[self._row_groups[parent.row()]])
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        if index.internalId() == 0:
+            group = self._row_groups[index.row()]
+            category = self._group_names[group]
+            if role == Qt.DisplayRole:
+                return f"{category} ({len(self._group_ids[group])})"
+            if role == Qt.DecorationRole:
+                return self.playlist_manager.category_icons.get(category)
+            return None
+
+        group = index.internalId() - 1
+        channel_id = self._group_ids[group][index.row()]
+        if role == Qt.UserRole:
+            return channel_id
+
+        if channel_id < 0:
+            channel = self._detached_channels[channel_id]
+        else:
+            channel = self.playlist_manager.channels[channel_id]
+        if role == Qt.DisplayRole:
+            return channel.name
+        if role == Qt.DecorationRole and self.icon_provider is not None:
+            if channel.tvg_logo:
+                self._rows_by_logo.setdefault(channel.tvg_logo, set()).add((group, index.row()))
+            return self.icon_provider(channel)
+        return None
+
+    def set_groups(self, groups):
+        """Заменяет содержимое дерева
+
+        Args:
+            groups: Пары (категория, идентификаторы каналов)
+        """
+        self.beginResetModel()
+        self._reset_groups()
+        for category, channel_ids in sorted(groups, key=lambda group: group[0]):
+            self._group_names.append(category)
+            self._group_ids.append(list(channel_ids))
+            self._sorted_names.append(category)
+        self._row_groups = list(range(len(self._group_names)))
+        self._group_rows = {group: group for group in self._row_groups}
+        self.endResetModel()
+
+    def append_channel_ids(self, channel_ids_by_category):
+        """Дополняет дерево каналами, создавая недостающие категории
+
+        Args:
+            channel_ids_by_category: Словарь категория -> идентификаторы каналов
+
+        Returns:
+            list: Индексы добавленных категорий
+        """
+        new_categories = []
+        for category, channel_ids in channel_ids_by_category.items():
+            row = bisect.bisect_left(self._sorted_names, category)
+            if row < len(self._sorted_names) and self._sorted_names[row] == category:
+                group = self._row_groups[row]
+                group_ids = self._group_ids[group]
+                if channel_ids:
+                    parent = self.createIndex(row, 0, 0)
+                    first = len(group_ids)
+                    self.beginInsertRows(parent, first, first + len(channel_ids) - 1)
+                    group_ids.extend(channel_ids)
+                    self.endInsertRows()
+                    self.dataChanged.emit(parent, parent, [Qt.DisplayRole])
+                continue
+
+            group = len(self._group_names)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._group_names.append(category)
+            self._group_ids.append(list(channel_ids))
+            self._sorted_names.insert(row, category)
+            self._row_groups.insert(row, group)
+            self._group_rows = {group: row for row, group in enumerate(self._row_groups)}
+            self.endInsertRows()
+            new_categories.append(category)
+
+        return [self.createIndex(bisect.bisect_left(self._sorted_names, category), 0, 0)
+                for category in new_categories]
+
+    def channel_id(self, index):
+        """Возвращает идентификатор канала для индекса или None для категории"""
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        return self._group_ids[index.internalId() - 1][index.row()]
+
+    def first_channel_index(self):
+        """Возвращает индекс первого канала в дереве или невалидный индекс"""
+        for row, group in enumerate(self._row_groups):
+            if self._group_ids[group]:
+                return self.createIndex(0, 0, group + 1)
+        return QModelIndex()
+
+    def update_logo(self, logo_url):
+        """Перерисовывает строки, которые показывали канал с этим логотипом
+
+        Строки каналов адресуются номером группы, поэтому индекс остается
+        верным при добавлении новых категорий.
+        """
+        for group, row in self._rows_by_logo.pop(logo_url, ()):
+            index = self.createIndex(row, 0, group + 1)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def apply_channel_changes(self, id_map, removed_channels, added_ids_by_category, changed_ids, rank,
+                              categories):
+        """Применяет изменения перезагруженного плейлиста без сброса модели
+
+        Args:
+            id_map: Старый идентификатор -> новый для сохранившихся каналов
+            removed_channels: Старый идентификатор -> исчезнувший канал
+            added_ids_by_category: Категория -> новые каналы, которые нужно показать
+            changed_ids: Новые идентификаторы каналов с изменившимися данными
+            rank: Функция id -> позиция канала в порядке отображения
+            categories: Категории, которые остаются в дереве
+
+        Returns:
+            list | None: Индексы добавленных категорий или None, если сохранившиеся
+                каналы поменяли порядок и дерево нужно заполнить заново
+                (модель не изменяется)
+        """
+        for group in self._row_groups:
+            if not _is_display_ordered(self._group_ids[group], id_map, rank):
+                return None
+
+        self._rows_by_logo = {}
+        for group in self._row_groups:
+            _detach_rows(self._group_ids[group], id_map, removed_channels, self._detached_channels)
+
+        counts = {}
+        for row, group in enumerate(self._row_groups):
+            counts[group] = len(self._group_ids[group])
+            _remove_detached_rows(self, self.createIndex(row, 0, 0), self._group_ids[group])
+        self._detached_channels = {}
+
+        # Убираем исчезнувшие категории; номера групп остальных не меняются
+        for row in range(len(self._row_groups) - 1, -1, -1):
+            group = self._row_groups[row]
+            if self._group_names[group] in categories:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._row_groups[row]
+            del self._sorted_names[row]
+            self._group_ids[group] = []
+            self._group_rows = {group: row for row, group in enumerate(self._row_groups)}
+            self.endRemoveRows()
+
+        for row, group in enumerate(self._row_groups):
+            group_ids = self._group_ids[group]
+            parent = self.createIndex(row, 0, 0)
+            _insert_rows(self, parent, group_ids, added_ids_by_category.get(self._group_names[group], ()), rank)
+            if len(group_ids) != counts[group]:
+                self.dataChanged.emit(parent, parent, [Qt.DisplayRole])
+
+        if changed_ids:
+            changed_ids = set(changed_ids)
+            for group in self._row_groups:
+                rows = _find_rows(self._group_ids[group], changed_ids)
+                if rows:
+                    self.dataChanged.emit(self.createIndex(rows[0], 0, group + 1),
+                                          self.createIndex(rows[-1], 0, group + 1))
+
+        new_categories = {category: sorted(channel_ids, key=rank)
+                          for category, channel_ids in added_ids_by_category.items()
+                          if category in categories and not self._has_category(category)}
+        return self.append_channel_ids(new_categories)
+
+    def _has_category(self, category):
+        """Проверяет, есть ли категория на верхнем уровне дерева"""
+        row = bisect.bisect_left(self._sorted_names, category)
+        return row < len(self._sorted_names) and self._sorted_names[row] == category
@@ -9,10 +9,13 @@
 import os
 import json
 import logging
-from typing import Any
+from typing import Any, Iterable, Set
 from threading import Lock
 from PyQt5.QtCore import Qt
-from constants import DEFAULT_WINDOW_SIZE, DEFAULT_WINDOW_POSITION, DEFAULT_VOLUME
+from constants import (
+    DEFAULT_WINDOW_SIZE, DEFAULT_WINDOW_POSITION, DEFAULT_VOLUME, LOGO_DISK_CACHE_MAX_BYTES,
+    LOGO_MEMORY_CACHE_SIZE
+)
 
 
 class ConfigManager:
@@ -33,8 +36,12 @@ class ConfigManager:
             "hidden_channels": [],
             "recent_playlists": [],
             "playlist_names": {},
+            "playlist_sources": {},
             "show_hidden": False,
             "show_logos": True,
+            "logo_cache_max_bytes": LOGO_DISK_CACHE_MAX_BYTES,
+            "logo_memory_cache_size": LOGO_MEMORY_CACHE_SIZE,
+            "logo_atlas": True,
             "window_size": DEFAULT_WINDOW_SIZE,
             "window_position": DEFAULT_WINDOW_POSITION,
             "always_on_top": False
@@ -94,6 +101,16 @@ class ConfigManager:
         with self._config_lock:
             self.config[key] = value
 
+    def get_set(self, key: str) -> Set[str]:
+        """Получает список из конфигурации в виде множества"""
+        with self._config_lock:
+            return set(self.config.get(key) or [])
+
+    def set_set(self, key: str, values: Iterable[str]) -> None:
+        """Сохраняет множество в конфигурации в виде отсортированного списка"""
+        with self._config_lock:
+            self.config[key] = sorted(values)
+
     def _validate_and_fix_config(self) -> None:
         """Валидирует и исправляет некорректные значения в конфигурации"""
         # Проверяем размер окна
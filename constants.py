@@ -330,6 +330,72 @@ MAX_RETRY_COUNT = 3
 MAX_CONCURRENT_DOWNLOADS = 5
 MAX_CONCURRENT_THREADS = 8
 
+# Количество каналов в одной порции при фоновом разборе плейлиста
+PLAYLIST_PARSE_BATCH_SIZE = 2000
+
+# Доля добавленных и удаленных каналов, до которой изменения перезагруженного
+# плейлиста применяются к представлению на месте (при большей - перестроение)
+PLAYLIST_MERGE_MAX_CHANGE_RATIO = 0.25
+
+# Задержка перед запуском поиска после ввода символа (мс)
+SEARCH_DEBOUNCE_MS = 200
+
+# Общий HTTP-клиент: число хостов с открытыми пулами и соединений на хост
+HTTP_POOL_CONNECTIONS = 16
+HTTP_POOL_MAXSIZE = 10
+HTTP_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+# Размер порции при потоковой записи загружаемых файлов на диск (байт)
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+# Сколько первых байт загружаемого плейлиста проверяется на признаки M3U
+PLAYLIST_SIGNATURE_BYTES = 64 * 1024
+
+# Загрузка файлов: время ожидания соединения и очередной порции данных (с),
+# начальная и максимальная пауза перед повторной попыткой (с) и ответы сервера,
+# после которых запрос повторяется (число повторов - MAX_RETRY_COUNT)
+DOWNLOAD_CONNECT_TIMEOUT = DEFAULT_TIMEOUT
+DOWNLOAD_READ_TIMEOUT = 30
+DOWNLOAD_RETRY_DELAY = 1.0
+DOWNLOAD_RETRY_MAX_DELAY = 30.0
+DOWNLOAD_RETRY_STATUSES = (408, 429, 500, 502, 503, 504)
+
+# Максимальная длина очереди запросов на загрузку логотипов
+LOGO_QUEUE_SIZE = 256
+
+# Бюджет дискового кэша логотипов (байт) и задержка первого обслуживания после запуска (мс)
+LOGO_DISK_CACHE_MAX_BYTES = 64 * 1024 * 1024
+LOGO_CACHE_MAINTENANCE_DELAY_MS = 5000
+
+# Количество иконок логотипов в кэше памяти (около 4 КБ на логотип 32x32)
+LOGO_MEMORY_CACHE_SIZE = 2000
+
+# Неудачные загрузки логотипов: начальный и максимальный срок до повторной попытки (с),
+# число ошибок соединения подряд до блокировки хоста и начальный срок блокировки (с)
+LOGO_FAILURE_TTL = 6 * 60 * 60
+LOGO_FAILURE_MAX_TTL = 14 * 24 * 60 * 60
+LOGO_HOST_FAILURE_LIMIT = 3
+LOGO_HOST_BLOCK_TTL = 24 * 60 * 60
+
+# Приоритеты загрузки логотипов (меньше - срочнее)
+LOGO_PRIORITY_VISIBLE = 0  # Строки в видимой области списка
+LOGO_PRIORITY_NEAR = 1  # Строки рядом с видимой областью
+LOGO_PRIORITY_BACKGROUND = 2  # Остальные запросы
+
+# Сколько страниц строк вокруг видимой области загружать заранее
+LOGO_PREFETCH_PAGES = 1
+
+# Задержка пересчета приоритетов логотипов после прокрутки (мс)
+LOGO_REPRIORITIZE_DELAY_MS = 100
+
+# Проверка актуальности логотипов условными запросами: через сколько секунд после
+# последней проверки логотип проверяется снова, сколько логотипов за проход,
+# задержка первого прохода после запуска и интервал между проходами (мс)
+LOGO_REVALIDATE_AFTER = 7 * 24 * 60 * 60
+LOGO_REVALIDATE_BATCH = 200
+LOGO_REVALIDATE_DELAY_MS = 60 * 1000
+LOGO_REVALIDATE_INTERVAL_MS = 6 * 60 * 60 * 1000
+
 # URL для обновления плейлиста
 DEFAULT_PLAYLIST_URL = "https://gitlab.com/iptv135435/iptvshared/raw/main/IPTV_SHARED.m3u"
 
@@ -0,0 +1,81 @@
+"""
+Модуль HTTP-клиента для MaksIPTV Player
+Версия 0.13.0
+
+Содержит HttpClient - общий для всех потоков загрузки HTTP-клиент
+на основе requests.Session. Соединения с каждым хостом держатся открытыми
+(keep-alive) и переиспользуются, поэтому загрузка тысяч логотипов с
+нескольких CDN не требует нового TCP/TLS-рукопожатия на каждый файл.
+Ответы запрашиваются сжатыми (Accept-Encoding) и распаковываются
+прозрачно при чтении тела.
+Реализует принцип единственной ответственности (SRP).
+"""
+
+import logging
+from threading import Lock
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+from constants import HTTP_USER_AGENT, HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+
+class HttpClient:
+    """Потокобезопасный HTTP-клиент с пулом соединений
+
+    Одна сессия используется всеми потоками: HTTPAdapter хранит пулы
+    соединений для HTTP_POOL_CONNECTIONS хостов, по HTTP_POOL_MAXSIZE
+    соединений в каждом. Заголовки сессии задаются один раз при создании
+    и после этого не меняются, поэтому общая сессия безопасна для
+    одновременных запросов.
+    """
+
+    _shared = None
+    _shared_lock = Lock()
+
+    def __init__(self, pool_connections: int = HTTP_POOL_CONNECTIONS,
+                 pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                 user_agent: str = HTTP_USER_AGENT):
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = user_agent
+        # Все поддерживаемые urllib3 кодировки сжатия (gzip, deflate, а при
+        # установленных пакетах также br и zstd)
+        self.session.headers.update(make_headers(accept_encoding=True))
+
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @classmethod
+    def shared(cls) -> 'HttpClient':
+        """Возвращает общий для приложения экземпляр клиента"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                logging.info("Создан общий HTTP-клиент")
+            return cls._shared
+
+    def get(self, url: str, timeout: Union[float, Tuple[float, float]] = 30, stream: bool = False, verify: bool = True,
+            headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Выполняет GET-запрос через общий пул соединений
+
+        При stream=True ответ нужно закрыть (или использовать как контекстный
+        менеджер), чтобы соединение вернулось в пул.
+
+        Args:
+            url: Адрес ресурса
+            timeout: Время ожидания в секундах или пара (соединение, чтение)
+            stream: Читать тело ответа порциями
+            verify: Проверять сертификат сервера
+            headers: Дополнительные заголовки запроса
+
+        Returns:
+            requests.Response: Ответ сервера
+        """
+        return self.session.get(url, timeout=timeout, stream=stream, verify=verify, headers=headers)
+
+    def close(self) -> None:
+        """Закрывает все открытые соединения"""
+        self.session.close()
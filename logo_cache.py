@@ -0,0 +1,790 @@
+"""
+Модуль кэша логотипов для MaksIPTV Player
+Версия 0.13.0
+
+Содержит:
+- LogoDiskCache - дисковый кэш логотипов с ограничением размера
+- LogoIconCache - кэш готовых иконок в памяти с ограничением числа записей
+- LogoFailureCache - сохраняемый между запусками кэш неудачных загрузок
+- LogoAtlas - упакованное хранилище готовых плиток логотипов для быстрого запуска
+
+Сведения о файлах дискового кэша (размер и время последнего обращения)
+хранятся в индексном файле, поэтому при запуске не нужно проверять каждый
+файл на диске. Вытеснение давно не используемых логотипов и сверка индекса
+с каталогом выполняются методом maintain в фоновом потоке.
+Реализует принцип единственной ответственности (SRP).
+"""
+
+import os
+import json
+import mmap
+import time
+import struct
+import hashlib
+import logging
+from threading import Lock
+from collections import OrderedDict
+from urllib.parse import urlsplit
+from typing import Callable, Dict, List, Optional
+
+from PyQt5.QtGui import QIcon, QImage
+
+from constants import (
+    LOGO_DISK_CACHE_MAX_BYTES, LOGO_MEMORY_CACHE_SIZE, SKIP_LOGO_DOMAINS,
+    LOGO_FAILURE_TTL, LOGO_FAILURE_MAX_TTL, LOGO_HOST_FAILURE_LIMIT, LOGO_HOST_BLOCK_TTL, LOGO_SIZE
+)
+
+LOGO_INDEX_VERSION = 2
+LOGO_FAILURES_VERSION = 1
+
+# Формат атласа: плитки LOGO_SIZE в ARGB32 с предумножением альфы, строка плитки
+# всегда занимает полную ширину; запись индекса - MD5 URL, ширина и высота логотипа
+LOGO_ATLAS_MAGIC = b'MLA1'
+LOGO_ATLAS_STRIDE = LOGO_SIZE[0] * 4
+LOGO_ATLAS_TILE_BYTES = LOGO_ATLAS_STRIDE * LOGO_SIZE[1]
+LOGO_ATLAS_RECORD = struct.Struct('<16sBB')
+
+# Атлас перестраивается, когда устаревшие плитки занимают больше этой доли файла
+LOGO_ATLAS_COMPACT_RATIO = 0.25
+
+# После вытеснения кэш занимает не больше этой доли бюджета,
+# чтобы обслуживание не запускалось после каждой новой загрузки
+LOGO_CACHE_LOW_WATER = 0.9
+
+
+class LogoDiskCache:
+    """Дисковый кэш логотипов с вытеснением по времени последнего обращения
+
+    Логотип хранится в файле md5(url).png. Индекс в памяти сопоставляет
+    ключ с записью [размер, время обращения, URL, ETag, Last-Modified,
+    время последней проверки] и защищен блокировкой, так как главный поток
+    читает и пополняет кэш одновременно с обслуживанием. ETag и
+    Last-Modified позволяют проверять актуальность логотипа условным
+    запросом, на который сервер отвечает 304 без тела.
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, cache_dir: str, max_bytes: int = LOGO_DISK_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._entries: Dict[str, list] = {}  # Ключ -> запись индекса (см. описание класса)
+        self._total_bytes = 0
+        self._dirty = False
+        self._lock = Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._complete = self._load_index()
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        """Возвращает ключ кэша для URL логотипа"""
+        return hashlib.md5(url.encode('utf-8')).hexdigest()
+
+    def get_path(self, url: str) -> str:
+        """Возвращает путь к файлу логотипа в кэше"""
+        return os.path.join(self.cache_dir, self.get_key(url) + '.png')
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Ищет логотип в кэше и отмечает обращение к нему
+
+        Returns:
+            str | None: Путь к файлу логотипа или None, если его нет в кэше
+        """
+        key = self.get_key(url)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry[1] = time.time()
+                self._dirty = True
+                return self.get_path(url)
+            complete = self._complete
+
+        # Пока индекс не восстановлен, проверяем файл напрямую
+        path = self.get_path(url)
+        if not complete and os.path.exists(path):
+            return path
+        return None
+
+    def contains(self, url: str) -> bool:
+        """Проверяет по индексу, есть ли логотип в кэше
+
+        В отличие от lookup() не отмечает обращение и не обращается к файлам,
+        поэтому подходит для проверок, после которых логотип не читается.
+        Пока индекс не восстановлен, логотипы вне индекса не находятся.
+        """
+        key = self.get_key(url)
+        with self._lock:
+            return key in self._entries
+
+    def store(self, url: str, data: bytes, etag: Optional[str] = None,
+              last_modified: Optional[str] = None) -> None:
+        """Сохраняет логотип в кэш
+
+        Файл записывается во временный и затем переименовывается,
+        чтобы обслуживание никогда не видело недописанный логотип.
+
+        Args:
+            url: URL логотипа
+            data: Содержимое PNG-файла
+            etag: Заголовок ETag ответа сервера
+            last_modified: Заголовок Last-Modified ответа сервера
+        """
+        path = self.get_path(url)
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить логотип в кэш {url}: {e}")
+            return
+
+        key = self.get_key(url)
+        with self._lock:
+            old_entry = self._entries.get(key)
+            if old_entry is not None:
+                self._total_bytes -= old_entry[0]
+            now = time.time()
+            self._entries[key] = [len(data), now, url, etag, last_modified, now]
+            self._total_bytes += len(data)
+            self._dirty = True
+
+    def get_stale(self, max_age: float, limit: int) -> List[tuple]:
+        """Возвращает логотипы, которые пора проверить на сервере
+
+        Сначала идут недавно использованные логотипы: их обновление
+        пользователь увидит первым.
+
+        Args:
+            max_age: Сколько секунд после последней проверки логотип считается актуальным
+            limit: Максимальное количество логотипов
+
+        Returns:
+            list: Кортежи (URL, ETag, Last-Modified)
+        """
+        deadline = time.time() - max_age
+        with self._lock:
+            stale = [entry for entry in self._entries.values() if entry[2] and entry[5] < deadline]
+        stale.sort(key=lambda entry: entry[1], reverse=True)
+        return [(entry[2], entry[3], entry[4]) for entry in stale[:limit]]
+
+    def mark_validated(self, url: str) -> None:
+        """Отмечает, что сервер подтвердил актуальность логотипа"""
+        with self._lock:
+            entry = self._entries.get(self.get_key(url))
+            if entry is not None:
+                entry[5] = time.time()
+                self._dirty = True
+
+    def remove(self, url: str) -> None:
+        """Удаляет логотип из кэша (например, поврежденный файл)"""
+        key = self.get_key(url)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._total_bytes -= entry[0]
+                self._dirty = True
+        try:
+            os.remove(self.get_path(url))
+        except OSError:
+            pass
+
+    def needs_maintenance(self) -> bool:
+        """Проверяет, превышен ли бюджет или требуется восстановить индекс"""
+        with self._lock:
+            return not self._complete or self._total_bytes > self.max_bytes
+
+    def get_total_bytes(self) -> int:
+        """Возвращает суммарный размер логотипов в кэше"""
+        with self._lock:
+            return self._total_bytes
+
+    def get_keys(self) -> set:
+        """Возвращает ключи всех логотипов в кэше"""
+        with self._lock:
+            return set(self._entries)
+
+    def maintain(self, is_cancelled: Optional[Callable[[], bool]] = None) -> int:
+        """Сверяет индекс с каталогом, вытесняет старые логотипы и сохраняет индекс
+
+        Выполняется в фоновом потоке: обходит каталог, поэтому на больших
+        кэшах занимает заметное время.
+
+        Args:
+            is_cancelled: Функция, возвращающая True, если работу нужно прервать
+
+        Returns:
+            int: Количество удаленных логотипов
+        """
+        self._reconcile(is_cancelled)
+        if is_cancelled and is_cancelled():
+            return 0
+
+        with self._lock:
+            victims = []
+            if self._total_bytes > self.max_bytes:
+                target = self.max_bytes * LOGO_CACHE_LOW_WATER
+                total = self._total_bytes
+                for key, entry in sorted(self._entries.items(), key=lambda item: item[1][1]):
+                    if total <= target:
+                        break
+                    victims.append(key)
+                    total -= entry[0]
+
+        removed = 0
+        for key in victims:
+            if is_cancelled and is_cancelled():
+                break
+            with self._lock:
+                entry = self._entries.pop(key, None)
+                if entry is None:
+                    continue
+                self._total_bytes -= entry[0]
+                self._dirty = True
+                # Файл удаляется под блокировкой, чтобы не задеть логотип, сохраненный заново
+                try:
+                    os.remove(os.path.join(self.cache_dir, key + '.png'))
+                    removed += 1
+                except OSError:
+                    pass
+
+        if removed:
+            logging.info(f"Из кэша логотипов удалено файлов: {removed}, "
+                         f"размер кэша: {self.get_total_bytes()} байт")
+
+        self.save_index()
+        return removed
+
+    def save_index(self) -> None:
+        """Сохраняет индекс, если он изменился"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = {key: list(entry) for key, entry in self._entries.items()}
+            self._dirty = False
+
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        temp_path = index_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': LOGO_INDEX_VERSION, 'entries': snapshot}, f)
+            os.replace(temp_path, index_path)
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить индекс кэша логотипов: {e}")
+            with self._lock:
+                self._dirty = True
+
+    def _load_index(self) -> bool:
+        """Загружает индекс из файла
+
+        Returns:
+            bool: True, если индекс прочитан и ему можно доверять
+        """
+        index_path = os.path.join(self.cache_dir, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return False
+
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            version = data.get('version')
+            if version == 1:
+                # Индекс без сведений для проверки актуальности - логотипы считаются проверенными
+                self._entries = {key: [int(size), float(atime), None, None, None, float(atime)]
+                                 for key, (size, atime) in data['entries'].items()}
+                self._dirty = True
+            elif version == LOGO_INDEX_VERSION:
+                self._entries = {key: [int(size), float(atime), url, etag, last_modified, float(validated)]
+                                 for key, (size, atime, url, etag, last_modified, validated)
+                                 in data['entries'].items()}
+            else:
+                return False
+            self._total_bytes = sum(entry[0] for entry in self._entries.values())
+            return True
+        except Exception as e:
+            logging.warning(f"Не удалось прочитать индекс кэша логотипов: {e}")
+            self._entries = {}
+            self._total_bytes = 0
+            return False
+
+    def _reconcile(self, is_cancelled: Optional[Callable[[], bool]] = None) -> None:
+        """Приводит индекс в соответствие с файлами в каталоге
+
+        Добавляет файлы, которых нет в индексе (время обращения берется из
+        времени изменения), и убирает записи об исчезнувших файлах.
+        """
+        found = {}
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if is_cancelled and is_cancelled():
+                        return
+                    if not entry.name.endswith('.png') or not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    found[entry.name[:-4]] = (stat.st_size, stat.st_mtime)
+        except OSError as e:
+            logging.warning(f"Не удалось прочитать каталог кэша логотипов: {e}")
+            return
+
+        with self._lock:
+            for key in [key for key in self._entries if key not in found]:
+                # Запись могла появиться после обхода каталога
+                if not os.path.exists(os.path.join(self.cache_dir, key + '.png')):
+                    del self._entries[key]
+                    self._dirty = True
+            for key, (size, mtime) in found.items():
+                if key not in self._entries:
+                    # URL неизвестен, поэтому такой логотип не проверяется на сервере
+                    self._entries[key] = [size, mtime, None, None, None, mtime]
+                    self._dirty = True
+            self._total_bytes = sum(entry[0] for entry in self._entries.values())
+            self._complete = True
+
+
+class LogoIconCache:
+    """Кэш готовых иконок логотипов в памяти с вытеснением LRU
+
+    Иконка создается один раз на логотип и разделяется всеми строками,
+    которые его показывают. Размер кэша ограничен числом записей: логотип
+    масштабирован до 32x32, поэтому запись занимает около 4 КБ. Вытесненный
+    логотип при следующей отрисовке строки читается из дискового кэша.
+    Используется только из главного потока.
+    """
+
+    def __init__(self, max_entries: int = LOGO_MEMORY_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._icons: "OrderedDict[str, QIcon]" = OrderedDict()
+
+    def get(self, url: str) -> Optional[QIcon]:
+        """Возвращает иконку и отмечает ее как недавно использованную"""
+        icon = self._icons.get(url)
+        if icon is not None:
+            self._icons.move_to_end(url)
+        return icon
+
+    def put(self, url: str, pixmap) -> QIcon:
+        """Создает иконку из логотипа и помещает ее в кэш
+
+        Returns:
+            QIcon: Созданная иконка
+        """
+        icon = QIcon(pixmap)
+        self._icons[url] = icon
+        self._icons.move_to_end(url)
+        while len(self._icons) > self.max_entries:
+            self._icons.popitem(last=False)
+        return icon
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._icons
+
+    def __len__(self) -> int:
+        return len(self._icons)
+
+    def clear(self) -> None:
+        """Очищает кэш"""
+        self._icons.clear()
+
+
+class LogoFailureCache:
+    """Кэш неудачных загрузок логотипов с повторной проверкой по времени
+
+    После каждой неудачи URL не запрашивается LOGO_FAILURE_TTL секунд,
+    и этот срок удваивается с каждой следующей неудачей (не больше
+    LOGO_FAILURE_MAX_TTL). Хост, который LOGO_HOST_FAILURE_LIMIT раз подряд
+    не ответил или не принял соединение, блокируется целиком, также с
+    удвоением срока при повторной блокировке. Домены из SKIP_LOGO_DOMAINS
+    заблокированы всегда. Состояние сохраняется в файл между запусками.
+    Используется одновременно главным потоком и рабочими потоками загрузки.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self._urls: Dict[str, List[float]] = {}  # URL -> [число неудач, время повторной попытки]
+        self._hosts: Dict[str, List[float]] = {}  # Хост -> [неудач подряд, заблокирован до, число блокировок]
+        self._dirty = False
+        self._lock = Lock()
+        self._load()
+
+    @staticmethod
+    def _get_retry_delay(base: float, count: int) -> float:
+        return min(base * 2 ** max(0, count - 1), LOGO_FAILURE_MAX_TTL)
+
+    def is_failed(self, url: str, host: Optional[str] = None) -> bool:
+        """Проверяет, нужно ли пропустить загрузку URL
+
+        Args:
+            url: URL логотипа
+            host: Хост URL, если уже известен
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._urls.get(url)
+            if entry is not None and now < entry[1]:
+                return True
+        return self.is_host_blocked(host if host is not None else self.get_host(url))
+
+    def is_host_blocked(self, host: str) -> bool:
+        """Проверяет, заблокирован ли хост"""
+        if not host:
+            return False
+        if any(host == domain or host.endswith('.' + domain) for domain in SKIP_LOGO_DOMAINS):
+            return True
+        with self._lock:
+            entry = self._hosts.get(host)
+            return entry is not None and time.time() < entry[1]
+
+    def record_failure(self, url: str, host_error: bool = False) -> None:
+        """Отмечает неудачную загрузку
+
+        Args:
+            url: URL логотипа
+            host_error: Хост не ответил вовремя или не принял соединение
+        """
+        now = time.time()
+        with self._lock:
+            failures = self._urls.get(url, [0, 0])[0] + 1
+            self._urls[url] = [failures, now + self._get_retry_delay(LOGO_FAILURE_TTL, failures)]
+            if host_error:
+                self._record_host_failure(self.get_host(url), now)
+            self._dirty = True
+
+    def record_host_failure(self, url: str) -> None:
+        """Отмечает, что хост URL не ответил, не откладывая сам URL
+
+        Используется при проверке логотипов, которые уже есть в кэше: из-за
+        недоступного сервера их не нужно перестать показывать.
+        """
+        with self._lock:
+            self._record_host_failure(self.get_host(url), time.time())
+            self._dirty = True
+
+    def _record_host_failure(self, host: str, now: float) -> None:
+        """Учитывает ошибку соединения с хостом (вызывается под блокировкой)"""
+        if not host:
+            return
+        entry = self._hosts.setdefault(host, [0, 0, 0])
+        entry[0] += 1
+        if entry[0] >= LOGO_HOST_FAILURE_LIMIT:
+            entry[0] = 0
+            entry[2] += 1
+            entry[1] = now + self._get_retry_delay(LOGO_HOST_BLOCK_TTL, entry[2])
+            logging.info(f"Хост логотипов {host} заблокирован до "
+                         f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(entry[1]))}")
+
+    def record_success(self, url: str) -> None:
+        """Отмечает успешную загрузку, сбрасывая счетчики URL и его хоста"""
+        host = self.get_host(url)
+        with self._lock:
+            if self._urls.pop(url, None) is not None:
+                self._dirty = True
+            if self._hosts.pop(host, None) is not None:
+                self._dirty = True
+
+    @staticmethod
+    def get_host(url: str) -> str:
+        """Возвращает хост URL в нижнем регистре"""
+        try:
+            return (urlsplit(url).hostname or '').lower()
+        except ValueError:
+            return ''
+
+    def save(self) -> None:
+        """Сохраняет состояние, отбрасывая записи, срок которых давно истек
+
+        Запись о URL хранится, пока не истечет удвоенный срок следующей
+        попытки, чтобы повторная неудача продлила интервал, а не начала его заново.
+        """
+        now = time.time()
+        with self._lock:
+            if not self._dirty:
+                return
+            urls = {url: entry for url, entry in self._urls.items()
+                    if now < entry[1] + self._get_retry_delay(LOGO_FAILURE_TTL, entry[0])}
+            hosts = {host: entry for host, entry in self._hosts.items()
+                     if entry[2] == 0 or now < entry[1] + self._get_retry_delay(LOGO_HOST_BLOCK_TTL, entry[2])}
+            self._dirty = False
+
+        temp_path = self.file_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': LOGO_FAILURES_VERSION, 'urls': urls, 'hosts': hosts}, f)
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            logging.warning(f"Не удалось сохранить список недоступных логотипов: {e}")
+
+    def _load(self) -> None:
+        if not os.path.exists(self.file_path):
+            return
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != LOGO_FAILURES_VERSION:
+                return
+            self._urls = {url: [int(count), float(retry_at)]
+                          for url, (count, retry_at) in data['urls'].items()}
+            self._hosts = {host: [int(count), float(blocked_until), int(blocks)]
+                           for host, (count, blocked_until, blocks) in data['hosts'].items()}
+        except Exception as e:
+            logging.warning(f"Не удалось прочитать список недоступных логотипов: {e}")
+            self._urls = {}
+            self._hosts = {}
+
+
+class LogoAtlas:
+    """Упакованное хранилище готовых плиток логотипов
+
+    Все логотипы лежат в одном файле atlas.bin плитками фиксированного
+    размера в формате, который QPixmap.fromImage принимает без
+    преобразования, а atlas.idx перечисляет плитки по порядку. Файл
+    отображается в память, поэтому иконка строится прямо из отображенного
+    буфера без открытия файлов и декодирования PNG.
+
+    Плитки только дописываются в конец: новая версия логотипа получает
+    новую плитку, а старая остается мертвой до перестройки атласа методом
+    compact. Дописанная запись индекса ссылается на уже записанную плитку,
+    поэтому после сбоя недописанный хвост просто отбрасывается.
+    """
+
+    DATA_FILE = 'atlas.bin'
+    INDEX_FILE = 'atlas.idx'
+
+    def __init__(self, cache_dir: str):
+        self.data_path = os.path.join(cache_dir, self.DATA_FILE)
+        self.index_path = os.path.join(cache_dir, self.INDEX_FILE)
+        self._slots: Dict[bytes, tuple] = {}  # MD5 URL -> (номер плитки, ширина, высота)
+        self._tile_count = 0
+        self._data_file = None
+        self._index_file = None
+        self._map = None
+        self._lock = Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._lock:
+            self._open()
+
+    @staticmethod
+    def _get_key(url: str) -> bytes:
+        return hashlib.md5(url.encode('utf-8')).digest()
+
+    def __contains__(self, url: str) -> bool:
+        with self._lock:
+            return self._get_key(url) in self._slots
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._slots)
+
+    def get(self, url: str) -> Optional[QImage]:
+        """Возвращает логотип из атласа
+
+        Returns:
+            QImage | None: Логотип или None, если его нет в атласе
+        """
+        with self._lock:
+            entry = self._slots.get(self._get_key(url))
+            if entry is None:
+                return None
+            slot, width, height = entry
+            offset = slot * LOGO_ATLAS_TILE_BYTES
+            if self._map is None or offset + LOGO_ATLAS_TILE_BYTES > len(self._map):
+                # Плитка дописана после отображения файла - отображаем его заново
+                self._remap()
+            tile = self._map[offset:offset + LOGO_ATLAS_TILE_BYTES]
+
+        # QImage не владеет переданными байтами, поэтому возвращаем копию
+        return QImage(tile, width, height, LOGO_ATLAS_STRIDE, QImage.Format_ARGB32_Premultiplied).copy()
+
+    def add(self, url: str, image: QImage) -> None:
+        """Дописывает логотип в атлас
+
+        Изображения больше LOGO_SIZE не принимаются.
+        """
+        if image.isNull() or image.width() > LOGO_SIZE[0] or image.height() > LOGO_SIZE[1]:
+            return
+
+        tile = self._pack_tile(image)
+        key = self._get_key(url)
+        with self._lock:
+            if self._data_file is None:
+                return
+            try:
+                self._data_file.write(tile)
+                self._data_file.flush()
+                self._index_file.write(LOGO_ATLAS_RECORD.pack(key, image.width(), image.height()))
+                self._index_file.flush()
+            except OSError as e:
+                logging.warning(f"Не удалось дописать логотип в атлас: {e}")
+                return
+            self._slots[key] = (self._tile_count, image.width(), image.height())
+            self._tile_count += 1
+
+    def needs_compaction(self, keep_keys: Optional[set] = None) -> bool:
+        """Проверяет, занимают ли устаревшие плитки заметную часть файла
+
+        Args:
+            keep_keys: Ключи дискового кэша (MD5 в hex); плитки остальных
+                логотипов тоже считаются устаревшими
+        """
+        with self._lock:
+            live = len(self._slots)
+            if keep_keys is not None:
+                live = sum(1 for key in self._slots if key.hex() in keep_keys)
+            dead = self._tile_count - live
+            return dead > 0 and dead >= self._tile_count * LOGO_ATLAS_COMPACT_RATIO
+
+    def compact(self, keep_keys: Optional[set] = None,
+                is_cancelled: Optional[Callable[[], bool]] = None) -> None:
+        """Перестраивает атлас без устаревших плиток
+
+        Выполняется в фоновом потоке. Плитки копируются из неизменяемой
+        части файла без блокировки, под блокировкой переносится только
+        хвост, дописанный во время копирования, и подменяются файлы.
+
+        Args:
+            keep_keys: Ключи дискового кэша (MD5 в hex); плитки остальных
+                логотипов отбрасываются, чтобы атлас не переживал вытеснение
+            is_cancelled: Функция, возвращающая True, если работу нужно прервать
+        """
+        with self._lock:
+            if self._data_file is None:
+                return
+            snapshot = dict(self._slots)
+            snapshot_count = self._tile_count
+
+        if keep_keys is not None:
+            snapshot = {key: entry for key, entry in snapshot.items() if key.hex() in keep_keys}
+
+        temp_data_path = self.data_path + '.tmp'
+        temp_index_path = self.index_path + '.tmp'
+        new_slots = {}
+
+        def copy_tiles(entries, source, data_file, index_file):
+            for key, (slot, width, height) in sorted(entries, key=lambda item: item[1][0]):
+                source.seek(slot * LOGO_ATLAS_TILE_BYTES)
+                data_file.write(source.read(LOGO_ATLAS_TILE_BYTES))
+                index_file.write(LOGO_ATLAS_RECORD.pack(key, width, height))
+                new_slots[key] = (len(new_slots), width, height)
+
+        try:
+            with open(self.data_path, 'rb') as source, \
+                    open(temp_data_path, 'wb') as data_file, \
+                    open(temp_index_path, 'wb') as index_file:
+                index_file.write(LOGO_ATLAS_MAGIC)
+                copy_tiles(snapshot.items(), source, data_file, index_file)
+                if is_cancelled and is_cancelled():
+                    return
+
+                with self._lock:
+                    tail = [(key, entry) for key, entry in self._slots.items() if entry[0] >= snapshot_count]
+                    copy_tiles(tail, source, data_file, index_file)
+
+                    # Перед подменой закрываем все дескрипторы старых файлов
+                    for f in (source, data_file, index_file):
+                        f.close()
+                    removed = self._tile_count - len(new_slots)
+                    self._close()
+                    os.replace(temp_data_path, self.data_path)
+                    try:
+                        os.replace(temp_index_path, self.index_path)
+                    except OSError:
+                        # Старый индекс не подходит к новым плиткам - атлас начнется заново
+                        os.remove(self.index_path)
+                        raise
+                    self._open()
+
+            logging.info(f"Атлас логотипов перестроен, удалено плиток: {removed}")
+        except OSError as e:
+            logging.warning(f"Не удалось перестроить атлас логотипов: {e}")
+        finally:
+            for path in (temp_data_path, temp_index_path):
+                if os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+            with self._lock:
+                if self._data_file is None:
+                    self._open()
+
+    def close(self) -> None:
+        """Закрывает файлы атласа"""
+        with self._lock:
+            self._close()
+
+    @staticmethod
+    def _pack_tile(image: QImage) -> bytes:
+        """Упаковывает изображение в плитку с полной шириной строки"""
+        image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        row_bytes = image.width() * 4
+        bits = image.constBits()
+        bits.setsize(image.byteCount())
+        data = bytes(bits)
+        rows = [data[y * image.bytesPerLine():y * image.bytesPerLine() + row_bytes].ljust(LOGO_ATLAS_STRIDE, b'\0')
+                for y in range(image.height())]
+        return b''.join(rows).ljust(LOGO_ATLAS_TILE_BYTES, b'\0')
+
+    def _open(self) -> None:
+        """Читает индекс и открывает файлы атласа (вызывается под блокировкой)"""
+        self._slots = {}
+        self._tile_count = 0
+        try:
+            data_size = os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+            index = b''
+            if os.path.exists(self.index_path):
+                with open(self.index_path, 'rb') as f:
+                    index = f.read()
+
+            if not index.startswith(LOGO_ATLAS_MAGIC):
+                index = LOGO_ATLAS_MAGIC
+                data_size = 0
+
+            # Учитываем только записи, плитки которых целиком записаны
+            count = min((len(index) - len(LOGO_ATLAS_MAGIC)) // LOGO_ATLAS_RECORD.size,
+                        data_size // LOGO_ATLAS_TILE_BYTES)
+            for slot, (key, width, height) in enumerate(
+                    LOGO_ATLAS_RECORD.iter_unpack(index[len(LOGO_ATLAS_MAGIC):
+                                                        len(LOGO_ATLAS_MAGIC) + count * LOGO_ATLAS_RECORD.size])):
+                self._slots[key] = (slot, width, height)
+            self._tile_count = count
+
+            # Обрезаем недописанный хвост, чтобы новые плитки шли сразу за целыми
+            with open(self.data_path, 'ab') as f:
+                f.truncate(count * LOGO_ATLAS_TILE_BYTES)
+            with open(self.index_path, 'wb' if index == LOGO_ATLAS_MAGIC else 'ab') as f:
+                if index == LOGO_ATLAS_MAGIC:
+                    f.write(LOGO_ATLAS_MAGIC)
+                else:
+                    f.truncate(len(LOGO_ATLAS_MAGIC) + count * LOGO_ATLAS_RECORD.size)
+
+            self._data_file = open(self.data_path, 'ab')
+            self._index_file = open(self.index_path, 'ab')
+            self._remap()
+        except OSError as e:
+            logging.warning(f"Не удалось открыть атлас логотипов: {e}")
+            self._close()
+            self._slots = {}
+            self._tile_count = 0
+
+    def _remap(self) -> None:
+        """Отображает файл плиток в память заново (вызывается под блокировкой)"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._tile_count:
+            with open(self.data_path, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), self._tile_count * LOGO_ATLAS_TILE_BYTES,
+                                      access=mmap.ACCESS_READ)
+
+    def _close(self) -> None:
+        """Закрывает отображение и файлы (вызывается под блокировкой)"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        for f in (self._data_file, self._index_file):
+            if f is not None:
+                f.close()
+        self._data_file = None
+        self._index_file = None
@@ -3,7 +3,7 @@ import os
 import time
 import logging
 import warnings
-import hashlib
+import bisect
 from datetime import datetime
 
 """
@@ -48,13 +48,13 @@ from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QComboBox, QLineEdit, QPushButton, QSlider, QStyle, QAction,
     QStatusBar, QProgressBar, QMenu, QSystemTrayIcon, QFileDialog, QInputDialog,
-    QListWidgetItem, QWidgetAction, QMessageBox,
-    QTreeWidget, QTreeWidgetItem, QFrame, QSplitter, QListWidget,
+    QWidgetAction, QMessageBox,
+    QTreeView, QFrame, QSplitter, QListView,
     QDialog, QSizePolicy, QStackedWidget,
     QAbstractItemView, QDialogButtonBox
 )
 from PyQt5.QtCore import (
-    Qt, QTimer, QSize, QEvent
+    Qt, QTimer, QSize, QEvent, QPoint
 )
 from PyQt5.QtGui import (
     QIcon, QColor, QPixmap, QCursor, QPainter, QBrush, QPen, QLinearGradient
@@ -63,7 +63,8 @@ from PyQt5.QtGui import (
 # Импортируем классы потоков из отдельного модуля
 from threads import (
     ThreadManager, DownloadThread, ChannelPlayThread,
-    PlaylistDownloadThread, LogoDownloadThread
+    PlaylistDownloadThread, PlaylistParseThread, ChannelSearchThread, LogoFetchService,
+    LogoCacheMaintenanceThread, LogoRevalidationThread
 )
 
 # Классы потоков теперь импортируются из модуля threads.py
@@ -73,7 +74,12 @@ from threads import (
 # Методы PlaylistUIManager перемещены в ui_components.py
 
 # Стили приложения вынесены в отдельный модуль constants.py
-from constants import STYLESHEET
+from constants import (
+    STYLESHEET, SEARCH_DEBOUNCE_MS, LOGO_PRIORITY_VISIBLE, LOGO_PRIORITY_NEAR,
+    LOGO_PREFETCH_PAGES, LOGO_REPRIORITIZE_DELAY_MS, LOGO_DISK_CACHE_MAX_BYTES,
+    LOGO_CACHE_MAINTENANCE_DELAY_MS, LOGO_MEMORY_CACHE_SIZE, LOGO_REVALIDATE_DELAY_MS,
+    LOGO_REVALIDATE_INTERVAL_MS, PLAYLIST_MERGE_MAX_CHANGE_RATIO
+)
 
 # ConfigManager вынесен в отдельный модуль config.py
 from config import ConfigManager
@@ -87,7 +93,13 @@ from media_player import MediaPlayerManager
 from platform_utils import PlatformManager
 
 # PlaylistManager вынесен в отдельный модуль playlist.py
-from playlist import PlaylistManager
+from playlist import PlaylistManager, open_playlist_file
+
+# Модели для виртуализированных списков каналов
+from channel_model import ChannelListModel, ChannelTreeModel
+
+# Импортируем кэш логотипов
+from logo_cache import LogoDiskCache, LogoIconCache, LogoFailureCache, LogoAtlas
 
 class IPTVPlayer(QMainWindow):
     def __init__(self):
@@ -122,8 +134,9 @@ class IPTVPlayer(QMainWindow):
         # Применяем стили
         self.setStyleSheet(STYLESHEET)
 
-        # Стандартная иконка для каналов без логотипа
+        # Стандартная иконка для каналов без логотипа, одна на все строки
         self.default_channel_icon = self.create_default_channel_icon()
+        self.default_channel_qicon = QIcon(self.default_channel_icon)
 
         # Инициализируем иконки категорий в менеджере плейлистов
         self.playlist_manager.set_category_icons(self.style())
@@ -131,8 +144,9 @@ class IPTVPlayer(QMainWindow):
         # Получаем данные из конфигурации
         self.current_channel_index = -1
         self.current_channel = ""
-        self.favorites = self.config_manager.get('favorites', [])
-        self.hidden_channels = self.config_manager.get('hidden_channels', [])
+        # Избранные и скрытые каналы хранятся множествами названий
+        self.favorites = self.config_manager.get_set('favorites')
+        self.hidden_channels = self.config_manager.get_set('hidden_channels')
         self.volume = self.config_manager.get('volume', 50)
         self.last_channel = self.config_manager.get('last_channel')
         self.last_category = self.config_manager.get('last_category', "Все каналы")
@@ -149,6 +163,8 @@ class IPTVPlayer(QMainWindow):
         # История плейлистов
         self.recent_playlists = self.config_manager.get('recent_playlists', ["local.m3u"])
         self.playlist_names = self.config_manager.get('playlist_names', {})
+        # Данные последней загрузки плейлистов по URL для условных запросов
+        self.playlist_sources = self.config_manager.get('playlist_sources', {})
 
         # Устанавливаем имя для локального плейлиста, если его нет
         if "local.m3u" not in self.playlist_names and os.path.exists("local.m3u"):
@@ -158,6 +174,23 @@ class IPTVPlayer(QMainWindow):
         self.current_playlist = self.recent_playlists[0] if self.recent_playlists else "local.m3u"
         self.temp_playlist_path = None
 
+        # Состояние фонового разбора плейлиста
+        self.playlist_parse_thread = None
+        self._playlist_loaded_callback = None
+        self._pending_category = None
+        self._channel_view_outdated = False
+        self._merged_channels = None  # Каналы новой версии при перезагрузке с применением изменений
+        self._playlist_view_reset_pending = False  # Плейлист заменится с приходом первых каналов
+        self._loaded_playlist_file = None  # Файл, из которого полностью загружен показанный плейлист
+
+        # Асинхронный поиск: актуальный запрос (номер, текст, категория, время запуска)
+        self._search_request = None
+        self.search_thread = ChannelSearchThread(self.playlist_manager)
+        self.search_thread.search_finished.connect(self.on_search_finished)
+        # Поток живет все время работы приложения, поэтому не занимает место
+        # в ThreadManager, ограничивающем число одновременных операций
+        self.search_thread.start()
+
         # Настройка VLC
         vlc_args = []
 
@@ -188,9 +221,39 @@ class IPTVPlayer(QMainWindow):
         # Время ожидания начала воспроизведения (сек)
         self.play_timeout = 10
 
-        # Словарь для отслеживания потоков загрузки логотипов (для совместимости)
-        self.logo_download_threads = {}
-        self.max_concurrent_downloads = 3
+        # Дисковый кэш логотипов с ограничением размера, обслуживается в фоне
+        logos_cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'logos')
+        self.logo_disk_cache = LogoDiskCache(
+            logos_cache_dir, self.config_manager.get('logo_cache_max_bytes', LOGO_DISK_CACHE_MAX_BYTES))
+        self.logo_cache_maintenance_thread = None
+        QTimer.singleShot(LOGO_CACHE_MAINTENANCE_DELAY_MS, self.start_logo_cache_maintenance)
+
+        # Атлас готовых плиток логотипов: иконки без чтения отдельных файлов и декодирования PNG
+        self.logo_atlas = LogoAtlas(logos_cache_dir) if self.config_manager.get('logo_atlas', True) else None
+
+        # Недоступные логотипы и хосты, сохраняются между запусками
+        self.logo_failures = LogoFailureCache(os.path.join(logos_cache_dir, 'failures.json'))
+
+        # Готовые иконки логотипов в памяти
+        self.logo_cache = LogoIconCache(
+            self.config_manager.get('logo_memory_cache_size', LOGO_MEMORY_CACHE_SIZE))
+
+        # Загрузка логотипов через общий пул рабочих потоков
+        self.logo_fetch_service = LogoFetchService(self.logo_failures, self.logo_disk_cache, self.logo_atlas)
+        self.logo_fetch_service.logo_loaded.connect(self.on_logo_loaded)
+        self.logo_fetch_service.start()
+
+        # Периодическая проверка актуальности логотипов в кэше условными запросами
+        self.logo_revalidation_thread = None
+        self.logo_revalidation_timer = QTimer(self)
+        self.logo_revalidation_timer.setInterval(LOGO_REVALIDATE_INTERVAL_MS)
+        self.logo_revalidation_timer.timeout.connect(self.start_logo_revalidation)
+        self.logo_revalidation_timer.start()
+        QTimer.singleShot(LOGO_REVALIDATE_DELAY_MS, self.start_logo_revalidation)
+
+        # Логотипы загружаются без проверки сертификата, предупреждения об этом не нужны
+        import urllib3
+        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
         # Инициализируем менеджер медиаплеера с поддержкой перемотки
         self.media_player_manager = MediaPlayerManager(self.media_player, self)
@@ -232,6 +295,11 @@ class IPTVPlayer(QMainWindow):
         # Привязываем обработчик закрытия окна для корректного завершения потоков
         self.closeEvent = self.handle_close_event
 
+        # Сразу показываем локальный плейлист (из кэша, если он актуален),
+        # обновление из интернета выполняется следом
+        if os.path.exists("local.m3u"):
+            self.load_playlist()
+
         # Обновление встроенного плейлиста при запуске
         QTimer.singleShot(0, self.update_playlist_from_url)
 
@@ -302,8 +370,13 @@ class IPTVPlayer(QMainWindow):
             # Останавливаем все потоки через ThreadManager
             self.thread_manager.stop_all_threads(timeout=1000)
 
-            # Очищаем словарь потоков логотипов для совместимости
-            self.logo_download_threads.clear()
+            # Пул загрузки логотипов и поток поиска не регистрируются в ThreadManager
+            self.logo_fetch_service.stop(timeout=1000)
+            self.search_thread.abort()
+            if not self.search_thread.wait(1000):
+                logging.warning("Принудительное завершение потока поиска")
+                self.search_thread.terminate()
+                self.search_thread.wait(500)
 
             logging.info("Все потоки остановлены")
 
@@ -427,7 +500,13 @@ class IPTVPlayer(QMainWindow):
         # Поиск
         self.search_box = QLineEdit()
         self.search_box.setPlaceholderText("Поиск каналов...")
-        self.search_box.textChanged.connect(self.filter_channels)
+        self.search_box.textChanged.connect(self.on_search_text_changed)
+
+        # Поиск запускается после паузы в наборе текста
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self._start_search)
 
         search_container = self.create_labeled_control("Поиск:", self.search_box)
 
@@ -501,87 +580,98 @@ class IPTVPlayer(QMainWindow):
 
     def create_channel_view_widgets(self):
         """Создает виджеты для отображения списка каналов"""
+        # Модели каналов: хранят только идентификаторы, данные берутся из PlaylistManager
+        self.channel_list_model = ChannelListModel(self.playlist_manager, self.get_channel_icon, self)
+        self.channel_tree_model = ChannelTreeModel(self.playlist_manager, self.get_channel_icon, self)
+
         # Список каналов
-        self.channel_list = QListWidget()
+        self.channel_list = QListView()
+        self.channel_list.setModel(self.channel_list_model)
+        self.channel_list.setUniformItemSizes(True)  # Строки одной высоты: прокрутка не зависит от размера списка
         self.channel_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
         self.channel_list.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.channel_list.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.channel_list.setAlternatingRowColors(True)  # Включаем чередование цветов строк
 
         # Настраиваем стиль и размеры для отображения логотипов
         self.channel_list.setStyleSheet("""
-            QListWidget {
+            QListView {
                 alternate-background-color: #383838;
                 background-color: #2a2a2a;
             }
 
-            QListWidget::item {
+            QListView::item {
                 padding: 10px 10px 10px 44px; /* Отступ слева под логотип */
                 margin: 2px 0;
                 height: 40px; /* Фиксированная высота для элементов списка */
             }
 
-            QListWidget::item:nth-child(odd) {
+            QListView::item:nth-child(odd) {
                 background-color: #2a2a2a;
             }
 
-            QListWidget::item:nth-child(even) {
+            QListView::item:nth-child(even) {
                 background-color: #383838;
             }
 
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: #4080b0;
                 color: white;
             }
         """)
 
         self.channel_list.setIconSize(QSize(32, 32))  # Устанавливаем размер иконок для логотипов
-        self.channel_list.currentRowChanged.connect(self.channel_changed)
+        self.channel_list.selectionModel().currentRowChanged.connect(
+            lambda current, previous: self.channel_changed(current.row()))
 
         # Двойной клик на канале начинает воспроизведение
-        self.channel_list.itemDoubleClicked.connect(self.on_channel_double_clicked)
+        self.channel_list.doubleClicked.connect(self.on_channel_double_clicked)
 
         # Добавляем контекстное меню к списку каналов
         self.channel_list.setContextMenuPolicy(Qt.CustomContextMenu)
         self.channel_list.customContextMenuRequested.connect(self.show_channel_context_menu)
 
         # Древовидный список каналов
-        self.channel_tree = QTreeWidget()
+        self.channel_tree = QTreeView()
+        self.channel_tree.setModel(self.channel_tree_model)
+        self.channel_tree.setUniformRowHeights(True)  # Строки одной высоты: прокрутка не зависит от размера дерева
         self.channel_tree.setHeaderHidden(True)
         self.channel_tree.setIconSize(QSize(32, 32))  # Устанавливаем размер иконок для логотипов
         self.channel_tree.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.channel_tree.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.channel_tree.setAlternatingRowColors(True)  # Включаем чередование цветов строк
 
         # Настраиваем стиль для древовидного списка
         self.channel_tree.setStyleSheet("""
-            QTreeWidget {
+            QTreeView {
                 alternate-background-color: #383838;
                 background-color: #2a2a2a;
             }
 
-            QTreeWidget::item {
+            QTreeView::item {
                 padding: 8px;
                 margin: 2px 0;
                 height: 40px; /* Фиксированная высота для элементов списка */
             }
 
-            QTreeWidget::item:nth-child(odd) {
+            QTreeView::item:nth-child(odd) {
                 background-color: #2a2a2a;
             }
 
-            QTreeWidget::item:nth-child(even) {
+            QTreeView::item:nth-child(even) {
                 background-color: #383838;
             }
 
-            QTreeWidget::item:selected {
+            QTreeView::item:selected {
                 background-color: #4080b0;
                 color: white;
             }
         """)
 
-        self.channel_tree.itemSelectionChanged.connect(self.tree_selection_changed)
+        self.channel_tree.selectionModel().selectionChanged.connect(self.tree_selection_changed)
 
         # Двойной клик на канале начинает воспроизведение
-        self.channel_tree.itemDoubleClicked.connect(lambda item: self.on_channel_double_clicked(item))
+        self.channel_tree.doubleClicked.connect(self.on_channel_double_clicked)
 
         # Добавляем контекстное меню к дереву каналов
         self.channel_tree.setContextMenuPolicy(Qt.CustomContextMenu)
@@ -595,6 +685,18 @@ class IPTVPlayer(QMainWindow):
         # По умолчанию показываем обычный список
         self.channels_stack.setCurrentIndex(1)
 
+        # Приоритеты загрузки логотипов пересчитываются после прокрутки и смены содержимого
+        self.logo_priority_timer = QTimer(self)
+        self.logo_priority_timer.setSingleShot(True)
+        self.logo_priority_timer.setInterval(LOGO_REPRIORITIZE_DELAY_MS)
+        self.logo_priority_timer.timeout.connect(self.update_logo_priorities)
+        for view in (self.channel_list, self.channel_tree):
+            view.verticalScrollBar().valueChanged.connect(self.schedule_logo_priorities)
+            view.model().modelReset.connect(self.schedule_logo_priorities)
+            view.model().rowsInserted.connect(self.schedule_logo_priorities)
+        self.channel_tree.expanded.connect(self.schedule_logo_priorities)
+        self.channels_stack.currentChanged.connect(self.schedule_logo_priorities)
+
         return self.channels_stack
 
     def create_right_panel(self):
@@ -1086,9 +1188,22 @@ class IPTVPlayer(QMainWindow):
                 self.statusbar_label.setText("Скачивание плейлиста...")
                 self.progress_bar.setVisible(True)
 
-                # Загружаем и обрабатываем как обычно
+                def playlist_loaded():
+                    self.info_label.setText(f"Загружен плейлист из URL")
+
+                    # Обновляем отображение количества каналов
+                    total_channels = len(self.channels)
+                    visible_channels = total_channels - len(self.hidden_channels)
+                    self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+
+                    # UX-твик: автоматически выделяем первый канал
+                    self.select_first_channel()
+
+                # Каналы разбираются и появляются в списке по мере загрузки
                 def download_finished(success, error_message, source_url=""):
                     self.progress_bar.setVisible(False)
+                    if not self.finish_streamed_playlist(download_thread, success):
+                        return
 
                     if success:
                         try:
@@ -1099,53 +1214,30 @@ class IPTVPlayer(QMainWindow):
 
                             # Сохраняем путь к временному плейлисту
                             self.temp_playlist_path = temp_file
-
-                            # Загружаем внешний плейлист
                             self.stop()
-                            self.channels = []
-                            self.categories = {"Все каналы": []}
-                            self.load_external_playlist(temp_file)
-                            self.fill_channel_list()
 
                             # Обновляем меню недавних плейлистов
                             self.update_recent_menu()
-
-                            self.info_label.setText(f"Загружен плейлист из URL")
-
-                            # Обновляем отображение количества каналов
-                            total_channels = len(self.channels)
-                            visible_channels = total_channels - len(self.hidden_channels)
-                            self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
-
-                            # UX-твик: автоматически выделяем первый канал
-                            self.select_first_channel()
+                            playlist_loaded()
                         except Exception as e:
                             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить плейлист: {str(e)}")
-
-                            if os.path.exists(temp_file):
-                                os.remove(temp_file)
                     else:
                         self.info_label.setText(f"Ошибка загрузки плейлиста: {error_message}")
                         self.statusbar_label.setText("Ошибка загрузки плейлиста")
                         QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить плейлист: {error_message}")
 
                 # Создаем и запускаем поток
-                download_thread = PlaylistDownloadThread(url, temp_file)
+                download_thread = PlaylistDownloadThread(url, temp_file, playlist_manager=self.playlist_manager)
+                self.connect_download_progress(download_thread)
                 download_thread.finished.connect(download_finished)
 
-                # Регистрируем поток в ThreadManager
-                thread_id = f"playlist_download_{int(time.time())}"
-                if self.thread_manager.register_thread(thread_id, download_thread):
-                    download_thread.start()
-                else:
+                if not self.start_streaming_playlist_download(download_thread):
                     self.progress_bar.setVisible(False)
                     self.info_label.setText("Ошибка: превышен лимит потоков")
                     return
             else:
                 # Это локальный файл
                 self.stop()
-                self.channels = []
-                self.categories = {"Все каналы": []}
 
                 # Обновляем историю плейлистов с сохраненным именем
                 playlist_name = self.playlist_names.get(playlist_path)
@@ -1155,24 +1247,24 @@ class IPTVPlayer(QMainWindow):
                 # Сохраняем путь к временному плейлисту
                 self.temp_playlist_path = playlist_path
 
-                # Загружаем плейлист
-                self.load_external_playlist(playlist_path)
-                self.fill_channel_list()
+                def playlist_loaded():
+                    # Используем имя плейлиста для отображения
+                    display_name = self.playlist_names.get(playlist_path, os.path.basename(playlist_path))
+                    self.info_label.setText(f"Загружен внешний плейлист: {display_name}")
 
-                # Обновляем меню недавних плейлистов
-                self.update_recent_menu()
+                    # Обновляем отображение количества каналов
+                    total_channels = len(self.channels)
+                    visible_channels = total_channels - len(self.hidden_channels)
+                    self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
 
-                # Используем имя плейлиста для отображения
-                display_name = self.playlist_names.get(playlist_path, os.path.basename(playlist_path))
-                self.info_label.setText(f"Загружен внешний плейлист: {display_name}")
+                    # Автоматически выбираем первый канал
+                    self.select_first_channel()
 
-                # Обновляем отображение количества каналов
-                total_channels = len(self.channels)
-                visible_channels = total_channels - len(self.hidden_channels)
-                self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+                # Загружаем плейлист
+                self.load_external_playlist(playlist_path, playlist_loaded)
 
-                # Автоматически выбираем первый канал
-                self.select_first_channel()
+                # Обновляем меню недавних плейлистов
+                self.update_recent_menu()
         except Exception as e:
             QMessageBox.critical(self, "Ошибка", f"Не удалось открыть плейлист: {str(e)}")
 
@@ -1196,15 +1288,8 @@ class IPTVPlayer(QMainWindow):
             # Сначала сохраняем конфигурацию
             self.save_config()
 
-            # Останавливаем все активные потоки загрузки логотипов
-            if hasattr(self, 'logo_download_threads'):
-                for url, thread in list(self.logo_download_threads.items()):
-                    if thread and thread.isRunning():
-                        try:
-                            # Устанавливаем флаг прерывания
-                            thread.abort()
-                        except Exception as e:
-                            logging.error(f"Ошибка при остановке потока логотипа {url}: {e}")
+            # Прерываем загрузку логотипов
+            self.logo_fetch_service.abort()
 
             # Затем выполняем очистку ресурсов
             # полная очистка будет выполнена через aboutToQuit в методе cleanup
@@ -1224,11 +1309,7 @@ class IPTVPlayer(QMainWindow):
             self.category_combo.setCurrentIndex(index)
         else:
             # Если категории нет, добавляем её
-            self.categories["Избранное"] = []
-            for fav in self.favorites:
-                for channel in self.channels:
-                    if channel['name'] == fav:
-                        self.categories["Избранное"].append(channel)
+            self.categories["Избранное"] = self._get_favorite_channels()
 
             self.category_combo.clear()
             self.category_combo.addItems(sorted(self.categories.keys()))
@@ -1243,7 +1324,7 @@ class IPTVPlayer(QMainWindow):
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            self.favorites = []
+            self.favorites.clear()
             self.save_config()
             self.fill_channel_list()
             QMessageBox.information(self, "Информация", "Список избранных каналов очищен")
@@ -1256,7 +1337,7 @@ class IPTVPlayer(QMainWindow):
             return
 
         # Отображаем список скрытых каналов
-        hidden_list = "\n".join(self.hidden_channels)
+        hidden_list = "\n".join(sorted(self.hidden_channels))
         QMessageBox.information(self, "Скрытые каналы",
                                f"Скрытые каналы ({len(self.hidden_channels)}):\n\n{hidden_list}\n\n"
                                "Для управления скрытыми каналами используйте контекстное меню канала.")
@@ -1268,7 +1349,7 @@ class IPTVPlayer(QMainWindow):
                                     QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
-            self.hidden_channels = []
+            self.hidden_channels.clear()
             self.save_config()
             self.fill_channel_list()
             QMessageBox.information(self, "Информация", "Все скрытые каналы теперь видны")
@@ -1276,32 +1357,20 @@ class IPTVPlayer(QMainWindow):
     def fill_favorites_list(self):
         """Заполняет список избранных каналов"""
         self.channels_stack.setCurrentIndex(1)  # Переключаемся на обычный список
-        self.channel_list.clear()
-
-        for channel_name in self.favorites:
-            # Находим канал по имени
-            for channel in self.channels:
-                if channel['name'] == channel_name:
-                    # Пропускаем скрытые каналы если не в режиме отображения скрытых
-                    if channel['name'] in self.hidden_channels and not self.show_hidden:
-                        continue
 
-                    # Создаем элемент списка с логотипом
-                    item = self.create_channel_item(channel['name'], channel)
-                    self.channel_list.addItem(item)
+        # Пропускаем скрытые каналы если не в режиме отображения скрытых
+        favorite_names = self.favorites if self.show_hidden else self.favorites - self.hidden_channels
+        self.channel_list_model.set_channel_ids(self.playlist_manager.get_channel_ids_by_names(favorite_names))
 
     def fill_hidden_list(self):
         """Заполняет список скрытых каналов"""
         self.channels_stack.setCurrentIndex(1)  # Переключаемся на обычный список
-        self.channel_list.clear()
+        self.channel_list_model.set_channel_ids(self.playlist_manager.get_channel_ids_by_names(self.hidden_channels))
 
-        for channel_name in self.hidden_channels:
-            # Находим канал по имени
-            for channel in self.channels:
-                if channel['name'] == channel_name:
-                    # Создаем элемент списка с логотипом
-                    item = self.create_channel_item(channel['name'], channel)
-                    self.channel_list.addItem(item)
+    def _get_favorite_channels(self):
+        """Возвращает избранные каналы текущего плейлиста в порядке отображения"""
+        return self.playlist_manager.get_channels_by_ids(
+            self.playlist_manager.get_channel_ids_by_names(self.favorites))
 
     def show_about(self):
         """Показывает информацию о программе"""
@@ -1319,255 +1388,230 @@ class IPTVPlayer(QMainWindow):
             QMessageBox.critical(None, "Ошибка", f"Плейлист {playlist_file} не найден!")
             sys.exit(1)
 
-        try:
-            self.playlist_manager.parse_playlist(playlist_file)
-            # Обновляем ссылки для совместимости
-            self.channels = self.playlist_manager.get_channels()
-            self.categories = self.playlist_manager.get_categories()
-
-        except Exception as e:
-            QMessageBox.critical(None, "Ошибка", f"Ошибка при чтении плейлиста: {str(e)}")
-            sys.exit(1)
+        self.load_external_playlist(playlist_file)
 
     def fill_channel_list(self):
         """Заполняет список или дерево каналов в зависимости от выбранной категории"""
         current_category = self.category_combo.currentText()
-        search_text = self.search_box.text().lower()
+
+        if self.search_box.text().strip():
+            # При активном поиске представление заполняет результат запроса,
+            # который выполняется в потоке поиска, а не в главном потоке
+            self.search_timer.stop()
+            self._start_search()
+            return
 
         if current_category == "Избранное":
             # Заполняем список избранных каналов
             self.channels_stack.setCurrentIndex(1)
-            self.channel_list.clear()
-
-            for channel_name in self.favorites:
-                # Находим канал по имени
-                for channel in self.channels:
-                    if channel['name'] == channel_name and (not search_text or search_text in channel['name'].lower()):
-                        # Пропускаем скрытые каналы
-                        if channel['name'] in self.hidden_channels:
-                            continue
-
-                        # Создаем элемент списка с логотипом
-                        item = self.create_channel_item(channel['name'], channel)
-                        # Сохраняем индекс канала в основном массиве
-                        channel_index = self.channels.index(channel)
-                        item.setData(Qt.UserRole, channel_index)
-                        self.channel_list.addItem(item)
+
+            # Пропускаем скрытые каналы
+            channel_ids = self.playlist_manager.get_channel_ids_by_names(self.favorites - self.hidden_channels)
+
+            self.channel_list_model.set_channel_ids(channel_ids)
             return
 
         if current_category == "Все каналы":
             # Используем древовидное представление для всех категорий
             self.channels_stack.setCurrentIndex(0)
-            self.channel_tree.clear()
-
-            # Создаем корневые элементы для каждой категории
-            category_items = {}
-            for category in sorted(self.categories.keys()):
-                if category == "Все каналы":
-                    continue
-
-                category_item = QTreeWidgetItem([category])
-
-                # Применяем иконку категории, если есть
-                if category in self.playlist_manager.category_icons:
-                    category_item.setIcon(0, self.playlist_manager.category_icons[category])
-
-                self.channel_tree.addTopLevelItem(category_item)
-                category_items[category] = category_item
 
-                # Подсчет видимых каналов в категории (исключая скрытые)
-                visible_channels = 0
-                for ch in self.categories[category]:
-                    if ch['name'] not in self.hidden_channels:
-                        visible_channels += 1
-
-                # Устанавливаем количество каналов в категории
-                category_item.setText(0, f"{category} ({visible_channels})")
-
-            # Добавляем каналы в соответствующие категории
-            for channel in self.channels:
+            # Группируем видимые каналы по категориям (включая пустые категории)
+            channel_ids_by_category = {category: [] for category in self.categories
+                                       if category not in ("Все каналы", "Избранное")}
+            for channel in self.categories["Все каналы"]:
                 # Пропускаем скрытые каналы
-                if channel['name'] in self.hidden_channels:
+                if channel.name in self.hidden_channels:
                     continue
 
-                if search_text and search_text not in channel['name'].lower():
-                    continue
+                channel_ids_by_category[channel.category].append(channel.id)
 
-                category = channel['category']
-                if category in category_items:
-                    channel_item = QTreeWidgetItem([channel['name']])
-                    channel_item.setData(0, Qt.UserRole, self.channels.index(channel))
-
-                    # Добавляем логотип, если доступен
-                    if self.show_logos:
-                        if 'tvg_logo' in channel and channel['tvg_logo']:
-                            logo = self.load_channel_logo(channel['tvg_logo'])
-                            if logo:
-                                channel_item.setIcon(0, QIcon(logo))
-                            else:
-                                # Если не удалось загрузить логотип, используем стандартную иконку
-                                channel_item.setIcon(0, QIcon(self.default_channel_icon))
-                        else:
-                            # Если у канала нет логотипа, используем стандартную иконку
-                            channel_item.setIcon(0, QIcon(self.default_channel_icon))
-
-                    category_items[category].addChild(channel_item)
+            self.channel_tree_model.set_groups(channel_ids_by_category.items())
 
             # Разворачиваем все категории
-            self.channel_tree.expandAll()
+            self._expand_tree_categories()
 
             # Обновляем информацию о количестве каналов (всего и видимых)
-            total_channels = len(self.channels)
-            visible_channels = total_channels - len(self.hidden_channels)
-            self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+            self._update_playlist_info_label()
         else:
             # Используем обычный список для конкретной категории
             self.channels_stack.setCurrentIndex(1)
-            self.channel_list.clear()
 
             channels_in_category = self.categories.get(current_category, [])
             visible_count = 0
+            channel_ids = []
 
             for channel in channels_in_category:
                 # Пропускаем скрытые каналы
-                if channel['name'] in self.hidden_channels:
+                if channel.name in self.hidden_channels:
                     continue
 
                 visible_count += 1
+                channel_ids.append(channel.id)
 
-                if not search_text or search_text in channel['name'].lower():
-                    # Создаем элемент списка с логотипом
-                    item = self.create_channel_item(channel['name'], channel)
-                    # Сохраняем индекс канала в основном массиве
-                    channel_index = self.channels.index(channel)
-                    item.setData(Qt.UserRole, channel_index)
-                    self.channel_list.addItem(item)
+            self.channel_list_model.set_channel_ids(channel_ids)
 
             # Обновляем информацию о количестве каналов в категории
             total_in_category = len(channels_in_category)
             self.playlist_info_label.setText(f"Каналов в категории: {total_in_category} (видимых: {visible_count})")
 
+    def _update_playlist_info_label(self):
+        """Обновляет информацию о количестве каналов для текущей категории"""
+        current_category = self.category_combo.currentText()
+
+        if current_category == "Все каналы":
+            total_channels = len(self.channels)
+            visible_channels = total_channels - len(self.hidden_channels)
+            self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+        elif current_category != "Избранное":
+            channels_in_category = self.categories.get(current_category, [])
+            visible_count = sum(1 for ch in channels_in_category if ch.name not in self.hidden_channels)
+            self.playlist_info_label.setText(
+                f"Каналов в категории: {len(channels_in_category)} (видимых: {visible_count})")
+
+    def _expand_tree_categories(self):
+        """Разворачивает категории дерева каналов
+
+        В отличие от expandAll() не обходит строки каналов, поэтому время
+        не зависит от количества каналов.
+        """
+        for row in range(self.channel_tree_model.rowCount()):
+            self.channel_tree.expand(self.channel_tree_model.index(row))
+
     def category_changed(self, category):
         """Обработчик смены категории"""
         # Добавляем категорию "Избранное" если её нет
         if category == "Избранное" and "Избранное" not in self.categories:
-            self.categories["Избранное"] = []
-            for fav in self.favorites:
-                for channel in self.channels:
-                    if channel['name'] == fav:
-                        self.categories["Избранное"].append(channel)
+            self.categories["Избранное"] = self._get_favorite_channels()
 
         self.fill_channel_list()
 
     def filter_channels(self, text):
         """Фильтрация списка каналов по введенному тексту"""
-        search_text = text.lower().strip()
+        search_text = text.strip()
         current_category = self.category_combo.currentText()
 
+        # Синхронный поиск заменяет результат асинхронного запроса
+        self._cancel_search()
+
         # Если поиск пустой, просто обновляем список
         if not search_text:
             self.fill_channel_list()
             return
 
-        # Получаем список каналов для фильтрации
-        if current_category == "Все каналы":
-            channels_to_filter = self.channels.copy()
-        else:
-            channels_to_filter = self.categories.get(current_category, []).copy()
+        started = time.perf_counter()
+        channel_ids = self.playlist_manager.search_channels(
+            search_text, current_category, self._get_search_hidden_names())
+        self._show_search_results(text, current_category, channel_ids, time.perf_counter() - started)
 
-        # Фильтруем каналы
-        filtered_channels = []
+    def on_search_text_changed(self, text):
+        """Обработчик ввода в поле поиска
 
-        # Разбиваем поисковый запрос на отдельные слова для улучшенного поиска
-        search_terms = search_text.split()
+        Запрос откладывается до паузы в наборе, выполняется в потоке поиска,
+        а в интерфейс попадает только результат последнего запроса.
+        """
+        if not text.strip():
+            # Очистка поиска не требует запроса к индексу
+            self.search_timer.stop()
+            self._cancel_search()
+            self.fill_channel_list()
+            return
 
-        for channel in channels_to_filter:
-            # Пропускаем скрытые каналы, если не находимся в режиме просмотра скрытых
-            if channel['name'] in self.hidden_channels and not self.show_hidden:
-                continue
+        self.search_timer.start()
 
-            channel_name = channel['name'].lower()
+    def _start_search(self):
+        """Отправляет текущий запрос в поток поиска"""
+        text = self.search_box.text()
+        if not text.strip():
+            return
 
-            # Проверяем по всем поисковым терминам
-            all_terms_found = True
-            for term in search_terms:
-                if term not in channel_name:
-                    all_terms_found = False
-                    break
+        if not self.search_thread.isRunning():
+            # Без потока поиска выполняем запрос синхронно
+            self.filter_channels(text)
+            return
+
+        category = self.category_combo.currentText()
+        generation = self.search_thread.search(text.strip(), category, self._get_search_hidden_names())
+        self._search_request = (generation, text, category, time.perf_counter())
+
+    def _cancel_search(self):
+        """Отменяет асинхронный запрос, результат которого еще не получен"""
+        if self._search_request is not None:
+            self._search_request = None
+            self.search_thread.cancel()
+
+    def _get_search_hidden_names(self):
+        """Возвращает названия каналов, исключаемых из результатов поиска"""
+        # Скрытые каналы остаются в результатах в режиме просмотра скрытых
+        if self.show_hidden or not self.hidden_channels:
+            return None
+        return frozenset(self.hidden_channels)
+
+    def on_search_finished(self, generation, channel_ids):
+        """Применяет результат асинхронного поиска, если он еще актуален"""
+        if self.sender() is not self.search_thread or self._search_request is None:
+            return
+
+        request_generation, text, category, started = self._search_request
+        if generation != request_generation:
+            return
+        self._search_request = None
+
+        # Запрос мог устареть, пока выполнялся: сменились текст или категория
+        if text != self.search_box.text() or category != self.category_combo.currentText():
+            return
 
-            if all_terms_found:
-                filtered_channels.append(channel)
+        self._show_search_results(text, category, channel_ids, time.perf_counter() - started)
 
+    def _show_search_results(self, text, current_category, channel_ids, elapsed):
+        """Отображает результаты поиска в дереве или списке
+
+        Args:
+            text: Текст запроса
+            current_category: Категория, в которой выполнялся поиск
+            channel_ids: Идентификаторы найденных каналов
+            elapsed: Время выполнения запроса в секундах
+        """
         # Количество найденных каналов
-        found_count = len(filtered_channels)
+        found_count = len(channel_ids)
 
         # Отображаем результаты поиска
         if current_category == "Все каналы":
             # Используем древовидное представление
             self.channels_stack.setCurrentIndex(0)
-            self.channel_tree.clear()
 
             # Группируем каналы по категориям
+            channels = self.channels
             channels_by_category = {}
-            for channel in filtered_channels:
-                category = channel['category']
-                if category not in channels_by_category:
-                    channels_by_category[category] = []
-                channels_by_category[category].append(channel)
-
-            # Создаем элементы дерева
-            for category, channels in sorted(channels_by_category.items()):
-                category_item = QTreeWidgetItem([f"{category} ({len(channels)})"])
+            for channel_id in channel_ids:
+                channels_by_category.setdefault(channels[channel_id].category, []).append(channel_id)
 
-                # Применяем иконку категории, если есть
-                if category in self.playlist_manager.category_icons:
-                    category_item.setIcon(0, self.playlist_manager.category_icons[category])
-
-                self.channel_tree.addTopLevelItem(category_item)
-
-                # Добавляем каналы в категорию
-                for channel in channels:
-                    channel_item = QTreeWidgetItem([channel['name']])
-                    channel_item.setData(0, Qt.UserRole, self.channels.index(channel))
-                    category_item.addChild(channel_item)
+            self.channel_tree_model.set_groups(channels_by_category.items())
 
             # Разворачиваем все категории для лучшей видимости результатов поиска
-            self.channel_tree.expandAll()
+            self._expand_tree_categories()
 
             # Обновляем информацию о количестве найденных каналов
             self.playlist_info_label.setText(f"Результаты поиска: найдено {found_count} каналов")
         else:
             # Используем обычный список
             self.channels_stack.setCurrentIndex(1)
-            self.channel_list.clear()
-
-            # Добавляем найденные каналы в список с правильными индексами
-            for channel in filtered_channels:
-                item = self.create_channel_item(channel['name'], channel)
-                # Сохраняем индекс канала в основном массиве
-                channel_index = self.channels.index(channel)
-                item.setData(Qt.UserRole, channel_index)
-                self.channel_list.addItem(item)
+            self.channel_list_model.set_channel_ids(channel_ids)
 
             # Обновляем информацию о количестве найденных каналов
             self.playlist_info_label.setText(f"Результаты поиска: найдено {found_count} каналов")
 
-        # Обновляем статус бар
-        self.statusbar_label.setText(f"Найдено {found_count} каналов по запросу '{text}'")
+        # Обновляем статус бар (с временем выполнения запроса)
+        self.statusbar_label.setText(
+            f"Найдено {found_count} каналов по запросу '{text}' ({elapsed * 1000:.0f} мс)")
 
         # Если найден только один канал, автоматически выбираем его
         if found_count == 1:
             if current_category == "Все каналы":
                 # Выбираем единственный канал в дереве
-                for i in range(self.channel_tree.topLevelItemCount()):
-                    category_item = self.channel_tree.topLevelItem(i)
-                    if category_item.childCount() == 1:
-                        channel_item = category_item.child(0)
-                        self.channel_tree.setCurrentItem(channel_item)
-                        break
+                self.channel_tree.setCurrentIndex(self.channel_tree_model.first_channel_index())
             else:
                 # Выбираем единственный канал в списке
-                self.channel_list.setCurrentRow(0)
+                self.channel_list.setCurrentIndex(self.channel_list_model.index(0))
 
     def tree_selection_changed(self):
         """Обработчик выбора канала в дереве категорий"""
@@ -1611,25 +1655,22 @@ class IPTVPlayer(QMainWindow):
         channel = self.channels[channel_index]
 
         # Показываем имя канала и информацию о буферизации
-        self.info_label.setText(f"Загрузка: {channel['name']}")
-        self.channel_name_label.setText(channel['name'])
-        self.statusbar_label.setText(f"Загрузка: {channel['name']}")
+        self.info_label.setText(f"Загрузка: {channel.name}")
+        self.channel_name_label.setText(channel.name)
+        self.statusbar_label.setText(f"Загрузка: {channel.name}")
         self.progress_bar.setVisible(True)
 
         # Добавляем в недавние каналы
-        self.current_channel = channel['name']
-        self.last_channel = channel['name']
+        self.current_channel = channel.name
+        self.last_channel = channel.name
         self.save_config()
 
         # Запускаем таймер ожидания начала воспроизведения
         self.play_timeout_timer.start(self.play_timeout * 1000)
 
         try:
-            # Подготавливаем опции для канала
-            options = channel.get('options', {})
-
             # Создаем и запускаем поток для асинхронной подготовки медиа
-            channel_play_thread = ChannelPlayThread(channel['url'], options, self.instance)
+            channel_play_thread = ChannelPlayThread(channel, self.instance)
             channel_play_thread.setup_finished.connect(self.on_channel_setup_finished)
 
             # Регистрируем поток в ThreadManager
@@ -1650,7 +1691,7 @@ class IPTVPlayer(QMainWindow):
             self.statusbar_label.setText("Ошибка воспроизведения")
             logging.error(f"Ошибка воспроизведения канала: {str(e)}")
             QMessageBox.critical(self, "Ошибка воспроизведения",
-                              f"Не удалось воспроизвести канал '{channel['name']}'.\n{str(e)}")
+                              f"Не удалось воспроизвести канал '{channel.name}'.\n{str(e)}")
 
     def on_channel_setup_finished(self, success: bool, error_message: str, media) -> None:
         """Обработчик завершения настройки медиа в потоке"""
@@ -1691,7 +1732,7 @@ class IPTVPlayer(QMainWindow):
             logging.error(f"Ошибка подготовки медиа: {error_msg}")
 
             if self.current_channel_index >= 0 and self.current_channel_index < len(self.channels):
-                channel_name = self.channels[self.current_channel_index]['name']
+                channel_name = self.channels[self.current_channel_index].name
                 QMessageBox.warning(self, "Ошибка воспроизведения",
                                   f"Не удалось воспроизвести канал '{channel_name}'.\n{error_msg}")
 
@@ -1707,7 +1748,7 @@ class IPTVPlayer(QMainWindow):
             # Получаем информацию о канале
             channel_name = "Неизвестный канал"
             if self.current_channel_index >= 0 and self.current_channel_index < len(self.channels):
-                channel_name = self.channels[self.current_channel_index]['name']
+                channel_name = self.channels[self.current_channel_index].name
 
             # Логируем проблему
             logging.warning(f"Таймаут воспроизведения канала '{channel_name}'. Попытка {self.retry_count} из {self.max_retry_count}")
@@ -1878,35 +1919,6 @@ class IPTVPlayer(QMainWindow):
                 except Exception as e:
                     logging.error(f"Ошибка при освобождении инстанса VLC: {e}")
 
-            # Останавливаем все потоки загрузки логотипов
-            if hasattr(self, 'logo_download_threads'):
-                for url, thread in list(self.logo_download_threads.items()):
-                    try:
-                        if thread and thread.isRunning():
-                            # Сначала устанавливаем флаг прерывания
-                            thread.abort()
-                            # Отсоединяем сигналы
-                            try:
-                                thread.logo_loaded.disconnect()
-                                thread.logo_failed.disconnect()
-                            except:
-                                pass
-                            # Вызываем quit для корректного завершения
-                            thread.quit()
-                            # Ждем завершения потока с увеличенным таймаутом
-                            if not thread.wait(300):
-                                logging.warning(f"Не удалось завершить поток загрузки логотипа {url}, принудительное завершение.")
-                                # Если не удалось завершить, используем terminate
-                                thread.terminate()
-                                # Даем немного времени на завершение
-                                time.sleep(0.05)
-                        # Планируем удаление объекта позже
-                        thread.deleteLater()
-                    except Exception as e:
-                        logging.error(f"Ошибка при остановке потока загрузки логотипа {url}: {e}")
-                # Очищаем словарь потоков
-                self.logo_download_threads.clear()
-
             # Удаляем временные файлы
             if hasattr(self, 'temp_playlist_path') and self.temp_playlist_path and self.temp_playlist_path.startswith("temp_"):
                 try:
@@ -2264,8 +2276,8 @@ class IPTVPlayer(QMainWindow):
             self.progress_bar.setVisible(True)
         elif state == vlc.State.Playing and is_playing:
             self.progress_bar.setVisible(False)
-            if self.current_channel_index >= 0:
-                channel_name = self.channels[self.current_channel_index]['name']
+            if 0 <= self.current_channel_index < len(self.channels):
+                channel_name = self.channels[self.current_channel_index].name
                 self.info_label.setText(f"Воспроизведение: {channel_name}")
                 self.statusbar_label.setText(f"Воспроизведение: {channel_name}")
         elif state == vlc.State.Playing and not is_playing:
@@ -2274,8 +2286,8 @@ class IPTVPlayer(QMainWindow):
             self.progress_bar.setVisible(True)
         elif state == vlc.State.Paused:
             self.progress_bar.setVisible(False)
-            if self.current_channel_index >= 0:
-                channel_name = self.channels[self.current_channel_index]['name']
+            if 0 <= self.current_channel_index < len(self.channels):
+                channel_name = self.channels[self.current_channel_index].name
                 self.info_label.setText(f"Пауза: {channel_name}")
                 self.statusbar_label.setText(f"Пауза: {channel_name}")
         elif state == vlc.State.Stopped:
@@ -2339,7 +2351,7 @@ class IPTVPlayer(QMainWindow):
             channel_name = None
             if 0 <= self.current_channel_index < len(self.channels):
                 channel = self.channels[self.current_channel_index]
-                channel_name = channel.get('name', 'Неизвестный канал')
+                channel_name = channel.name
                 error_msg = f"Ошибка воспроизведения канала: {channel_name}"
 
             # Обновляем информационную метку
@@ -2385,8 +2397,8 @@ class IPTVPlayer(QMainWindow):
         # Запускаем получение длительности с правильной задержкой
         self.media_player_manager.on_playback_started()
 
-        if self.current_channel_index >= 0:
-            channel_name = self.channels[self.current_channel_index]['name']
+        if 0 <= self.current_channel_index < len(self.channels):
+            channel_name = self.channels[self.current_channel_index].name
             self.info_label.setText(f"Воспроизведение: {channel_name}")
             self.channel_name_label.setText(channel_name)
             self.statusbar_label.setText(f"Воспроизведение: {channel_name}")
@@ -2396,8 +2408,8 @@ class IPTVPlayer(QMainWindow):
 
     def media_paused(self, event):
         """Событие паузы воспроизведения"""
-        if self.current_channel_index >= 0:
-            channel_name = self.channels[self.current_channel_index]['name']
+        if 0 <= self.current_channel_index < len(self.channels):
+            channel_name = self.channels[self.current_channel_index].name
             self.info_label.setText(f"Пауза: {channel_name}")
             self.statusbar_label.setText(f"Пауза: {channel_name}")
 
@@ -2447,7 +2459,7 @@ class IPTVPlayer(QMainWindow):
         options = QFileDialog.Options()
         filename, _ = QFileDialog.getOpenFileName(
             self, "Открыть плейлист", "",
-            "Плейлисты (*.m3u *.m3u8);;Все файлы (*)",
+            "Плейлисты (*.m3u *.m3u8 *.m3u.gz *.m3u8.gz *.xz *.zip);;Все файлы (*)",
             options=options
         )
 
@@ -2531,8 +2543,6 @@ class IPTVPlayer(QMainWindow):
                 else:
                     # Открываем внешний плейлист без копирования
                     self.stop()
-                    self.channels = []
-                    self.categories = {"Все каналы": []}
 
                     # Обновляем историю плейлистов с указанным именем
                     self.update_recent_playlists(filename, playlist_name)
@@ -2541,20 +2551,20 @@ class IPTVPlayer(QMainWindow):
                     # Сохраняем путь к временному плейлисту
                     self.temp_playlist_path = filename
 
+                    def playlist_loaded():
+                        self.info_label.setText(f"Загружен внешний плейлист: {playlist_name}")
+
+                        # Обновляем отображение количества каналов
+                        total_channels = len(self.channels)
+                        visible_channels = total_channels - len(self.hidden_channels)
+                        self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+
                     # Загружаем плейлист
-                    self.load_external_playlist(filename)
-                    self.fill_channel_list()
+                    self.load_external_playlist(filename, playlist_loaded)
 
                     # Обновляем меню недавних плейлистов
                     self.update_recent_menu()
 
-                    self.info_label.setText(f"Загружен внешний плейлист: {playlist_name}")
-
-                    # Обновляем отображение количества каналов
-                    total_channels = len(self.channels)
-                    visible_channels = total_channels - len(self.hidden_channels)
-                    self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
-
             except Exception as e:
                 QMessageBox.critical(self, "Ошибка", f"Не удалось открыть плейлист: {str(e)}")
 
@@ -2600,51 +2610,412 @@ class IPTVPlayer(QMainWindow):
             self.update_recent_menu()
 
     def select_first_channel(self):
-        """Выбирает первый канал в списке без автоматического воспроизведения"""
+        """Выбирает первый канал в списке без автоматического воспроизведения
+
+        Не меняет выбор, если пользователь уже выбрал канал (например,
+        пока плейлист загружался в фоне).
+        """
         if self.channels:
             if self.channels_stack.currentIndex() == 0:  # Дерево категорий
+                if self.channel_tree_model.channel_id(self.channel_tree.currentIndex()) is not None:
+                    return
+
                 # Выбираем первую категорию и разворачиваем её
-                if self.channel_tree.topLevelItemCount() > 0:
-                    category_item = self.channel_tree.topLevelItem(0)
-                    self.channel_tree.expandItem(category_item)
+                category_index = self.channel_tree_model.index(0)
+                if category_index.isValid():
+                    self.channel_tree.expand(category_index)
 
                     # Выбираем первый канал в категории, если он есть
-                    if category_item.childCount() > 0:
-                        channel_item = category_item.child(0)
-                        self.channel_tree.setCurrentItem(channel_item)
+                    channel_index = self.channel_tree_model.index(0, 0, category_index)
+                    if channel_index.isValid():
+                        self.channel_tree.setCurrentIndex(channel_index)
                         # Не воспроизводим канал автоматически
             else:  # Обычный список
-                if self.channel_list.count() > 0:
-                    self.channel_list.setCurrentRow(0)
+                if self.channel_list_model.rowCount() > 0 and not self.channel_list.currentIndex().isValid():
+                    self.channel_list.setCurrentIndex(self.channel_list_model.index(0))
                     # Не запускаем автоматическое воспроизведение
 
-    def load_external_playlist(self, playlist_file):
-        """Загружает внешний плейлист"""
+    def load_external_playlist(self, playlist_file, on_loaded=None, merge=False):
+        """Загружает внешний плейлист в фоновом потоке
+
+        Каналы добавляются в интерфейс порциями по мере разбора файла,
+        поэтому окно остается отзывчивым даже на больших плейлистах.
+
+        При merge=True (новая версия уже показанного плейлиста) прежние каналы
+        остаются на экране до конца разбора, после чего к представлению
+        применяются только изменения.
+
+        Args:
+            playlist_file: Путь к файлу плейлиста
+            on_loaded: Функция, вызываемая после успешного завершения разбора
+            merge: Применить новую версию как изменения текущего плейлиста
+        """
         if not os.path.exists(playlist_file):
             QMessageBox.critical(None, "Ошибка", f"Плейлист {playlist_file} не найден!")
             return
 
-        try:
-            self.playlist_manager.parse_playlist(playlist_file)
-            # Обновляем ссылки для совместимости
-            self.channels = self.playlist_manager.get_channels()
-            self.categories = self.playlist_manager.get_categories()
+        # Изменения можно применить только к полностью загруженному плейлисту
+        merge = merge and bool(self.channels) and self.playlist_parse_thread is None
 
-            # Обновляем выпадающий список категорий
-            current_category = self.category_combo.currentText()
-            self.category_combo.clear()
-            self.category_combo.addItems(sorted(self.categories.keys()))
+        # Прерываем предыдущий разбор, если он еще идет
+        self.thread_manager.stop_thread("playlist_parse", timeout=1000)
+        self.playlist_parse_thread = None
 
-            # Пытаемся восстановить выбранную категорию
-            index = self.category_combo.findText(current_category)
-            if index >= 0:
-                self.category_combo.setCurrentIndex(index)
+        self._playlist_loaded_callback = on_loaded
+        self._playlist_view_reset_pending = False
+        if merge:
+            self._merged_channels = []
+            self._start_playlist_parse(playlist_file)
+            return
+        self._merged_channels = None
+
+        self._reset_playlist_view()
+        self._start_playlist_parse(playlist_file)
+
+    def _reset_playlist_view(self):
+        """Очищает текущий плейлист и представления перед загрузкой нового"""
+        self._playlist_view_reset_pending = False
+
+        # Результаты поиска по старому плейлисту больше не нужны
+        self._cancel_search()
+
+        # Пытаемся восстановить выбранную категорию, когда она появится
+        self._pending_category = self.category_combo.currentText()
+
+        self.playlist_manager.clear()
+        # Обновляем ссылки для совместимости
+        self.channels = self.playlist_manager.get_channels()
+        self.categories = self.playlist_manager.get_categories()
+
+        # Модели не должны ссылаться на каналы старого плейлиста
+        self.channel_list_model.set_channel_ids([])
+        self.channel_tree_model.set_groups([])
+
+        # Сбрасываем список категорий и отображение каналов
+        self.category_combo.blockSignals(True)
+        self.category_combo.clear()
+        self.category_combo.addItems(sorted(self.categories.keys()))
+        self.category_combo.blockSignals(False)
+        self.fill_channel_list()
 
+        self._channel_view_outdated = False
+
+    def _start_playlist_parse(self, playlist_file):
+        """Запускает поток разбора плейлиста"""
+        parse_thread = PlaylistParseThread(self.playlist_manager, playlist_file)
+        parse_thread.channels_parsed.connect(self.on_playlist_channels_parsed)
+        parse_thread.finished.connect(self.on_playlist_parse_finished)
+
+        # Регистрируем поток в ThreadManager
+        if self.thread_manager.register_thread("playlist_parse", parse_thread):
+            self.playlist_parse_thread = parse_thread
+            self.info_label.setText("Загрузка плейлиста...")
+            parse_thread.start()
+        else:
+            logging.error("Не удалось зарегистрировать поток разбора плейлиста")
+            self.info_label.setText("Ошибка: превышен лимит потоков")
+
+    def on_playlist_channels_parsed(self, channels):
+        """Добавляет очередную порцию каналов из потока разбора"""
+        if self.sender() is not self.playlist_parse_thread:
+            return
+
+        if self._playlist_view_reset_pending:
+            # Первая порция загружаемого плейлиста заменяет прежний
+            self._reset_playlist_view()
+
+        if self._merged_channels is not None:
+            # Новая версия плейлиста применяется целиком после разбора
+            self._merged_channels.extend(channels)
+            self.playlist_info_label.setText(f"Обновление плейлиста: {len(self._merged_channels)} каналов...")
+            return
+
+        for channel in channels:
+            self.playlist_manager.add_channel(channel)
+
+        self._append_channels_to_view(channels)
+        self._update_category_combo()
+
+        self.playlist_info_label.setText(f"Загрузка плейлиста: {len(self.channels)} каналов...")
+
+    def start_streaming_playlist_download(self, download_thread):
+        """Запускает загрузку плейлиста с разбором по мере получения данных
+
+        Поток загрузки (PlaylistDownloadThread с playlist_manager) выступает
+        потоком разбора, поэтому каналы появляются в интерфейсе до окончания
+        загрузки. Прежний плейлист остается на экране до первой порции
+        каналов и не теряется, если загрузка не удалась. Обработчик
+        завершения загрузки должен вызвать finish_streamed_playlist().
+
+        Args:
+            download_thread: Поток загрузки, еще не запущенный
+
+        Returns:
+            bool: True, если поток запущен
+        """
+        # Прерываем предыдущий разбор, если он еще идет
+        self.thread_manager.stop_thread("playlist_parse", timeout=1000)
+        self.playlist_parse_thread = None
+
+        download_thread.channels_parsed.connect(self.on_playlist_channels_parsed)
+        if not self.thread_manager.register_thread("playlist_parse", download_thread):
+            logging.error("Не удалось зарегистрировать поток загрузки плейлиста")
+            return False
+
+        self._playlist_loaded_callback = None
+        self._merged_channels = None
+        self._playlist_view_reset_pending = True
+        self.playlist_parse_thread = download_thread
+        download_thread.start()
+        return True
+
+    def finish_streamed_playlist(self, download_thread, success):
+        """Завершает загрузку плейлиста, разобранного по мере получения данных
+
+        Args:
+            download_thread: Завершившийся поток загрузки
+            success: Загрузка выполнена успешно
+
+        Returns:
+            bool: False, если загрузку сменила другая (ее результат не нужен)
+        """
+        if download_thread is not self.playlist_parse_thread:
+            return False
+
+        if success:
+            if self._playlist_view_reset_pending:
+                # Плейлист без каналов тоже заменяет прежний
+                self._reset_playlist_view()
+            self._complete_playlist_parse(download_thread, True, "")
+            return True
+
+        # Об ошибке загрузки сообщает вызывающий обработчик
+        self.thread_manager.unregister_thread("playlist_parse")
+        self.playlist_parse_thread = None
+        if not self._playlist_view_reset_pending:
+            # На экране неполный плейлист, который не совпадает ни с одним файлом:
+            # показываем прежний плейлист снова (обычно из кэша разобранных плейлистов)
+            self._restore_loaded_playlist()
+        else:
+            self._pending_category = None
+        self._playlist_view_reset_pending = False
+        return True
+
+    def _restore_loaded_playlist(self):
+        """Показывает последний полностью загруженный плейлист вместо неполного"""
+        playlist_file = self._loaded_playlist_file
+        pending_category = self._pending_category
+        if playlist_file and os.path.exists(playlist_file):
+            logging.info(f"Восстановление прежнего плейлиста {playlist_file}")
+            self.load_external_playlist(playlist_file)
+        else:
+            self._reset_playlist_view()
+        # Категория, выбранная до загрузки и так и не появившаяся, важнее текущей
+        if pending_category is not None:
+            self._pending_category = pending_category
+
+    def on_playlist_parse_finished(self, success, error_message):
+        """Обработчик завершения фонового разбора плейлиста"""
+        parse_thread = self.playlist_parse_thread
+        if self.sender() is not parse_thread:
+            return
+
+        self._complete_playlist_parse(parse_thread, success, error_message)
+
+    def _complete_playlist_parse(self, parse_thread, success, error_message):
+        """Завершает загрузку плейлиста после окончания разбора"""
+        self.thread_manager.unregister_thread("playlist_parse")
+        self.playlist_parse_thread = None
+
+        on_loaded = self._playlist_loaded_callback
+        self._playlist_loaded_callback = None
+        self._pending_category = None
+        merged_channels = self._merged_channels
+        self._merged_channels = None
+
+        if not success:
+            logging.error(f"Ошибка при чтении плейлиста: {error_message}")
+            QMessageBox.critical(None, "Ошибка", f"Ошибка при чтении плейлиста: {error_message}")
+            if merged_channels is not None:
+                # Прежняя версия плейлиста осталась на экране
+                self._update_playlist_info_label()
+            return
+
+        self._loaded_playlist_file = parse_thread.file_path
+
+        if merged_channels is not None:
+            diff = self.playlist_manager.merge_channels(merged_channels, parse_thread.search_index)
+            logging.info(f"Плейлист перезагружен: {diff}")
+            self._apply_playlist_diff(diff)
             self.info_label.setText(f"Загружен плейлист: {len(self.channels)} каналов")
+            if on_loaded:
+                on_loaded()
+            return
 
-        except Exception as e:
-            logging.error(f"Ошибка при чтении плейлиста: {str(e)}")
-            QMessageBox.critical(None, "Ошибка", f"Ошибка при чтении плейлиста: {str(e)}")
+        # Индекс построен потоком разбора для тех же каналов в том же порядке
+        self.playlist_manager.set_search_index(parse_thread.search_index)
+
+        # Представления, которые не дополнялись порциями, перестраиваем один раз
+        if self._channel_view_outdated:
+            self._channel_view_outdated = False
+            self._refresh_channel_view()
+        else:
+            self._update_playlist_info_label()
+
+        self.info_label.setText(f"Загружен плейлист: {len(self.channels)} каналов")
+
+        if on_loaded:
+            on_loaded()
+
+    def _update_category_combo(self):
+        """Добавляет в выпадающий список новые категории с сохранением сортировки"""
+        existing = [self.category_combo.itemText(i) for i in range(self.category_combo.count())]
+        new_categories = set(self.categories.keys()).difference(existing)
+        if not new_categories:
+            return
+
+        self.category_combo.blockSignals(True)
+        for category in sorted(new_categories):
+            position = bisect.bisect(existing, category)
+            self.category_combo.insertItem(position, category)
+            existing.insert(position, category)
+        self.category_combo.blockSignals(False)
+
+        # Восстанавливаем ранее выбранную категорию, как только она появилась
+        if self._pending_category in new_categories:
+            self.category_combo.setCurrentText(self._pending_category)
+            self._pending_category = None
+
+    def _append_channels_to_view(self, channels):
+        """Дополняет текущее представление новой порцией каналов
+
+        Args:
+            channels: Новые каналы, уже добавленные в PlaylistManager
+        """
+        current_category = self.category_combo.currentText()
+
+        # Результаты поиска, избранное и скрытые каналы перестраиваются после разбора
+        if (self.search_box.text().strip() or self.show_favorites or self.show_hidden or
+                current_category == "Избранное"):
+            self._channel_view_outdated = True
+            return
+
+        if current_category == "Все каналы":
+            channel_ids_by_category = {}
+            for channel in channels:
+                # Категория появляется в дереве, даже если все ее каналы скрыты
+                category_ids = channel_ids_by_category.setdefault(channel.category, [])
+                if channel.name not in self.hidden_channels:
+                    category_ids.append(channel.id)
+
+            for category_index in self.channel_tree_model.append_channel_ids(channel_ids_by_category):
+                self.channel_tree.expand(category_index)
+        else:
+            self.channel_list_model.append_channel_ids([
+                channel.id for channel in channels
+                if channel.category == current_category and channel.name not in self.hidden_channels
+            ])
+
+    def _apply_playlist_diff(self, diff):
+        """Применяет к представлению каналов изменения перезагруженного плейлиста
+
+        Изменения вносятся в модели на месте, поэтому сохраняются прокрутка,
+        выделение и развернутые категории. Если изменилась большая часть
+        плейлиста, каналы поменяли порядок или показаны результаты поиска,
+        избранное либо скрытые каналы, представление перестраивается целиком
+        с сохранением позиции прокрутки.
+        """
+        # Обновляем ссылки для совместимости
+        self.channels = self.playlist_manager.get_channels()
+        self.categories = self.playlist_manager.get_categories()
+
+        # Каналы получили новые идентификаторы; если текущий канал исчез из
+        # плейлиста, повторные попытки его воспроизведения прекращаются
+        if self.current_channel_index >= 0:
+            self.current_channel_index = diff.id_map.get(self.current_channel_index, -1)
+            if self.current_channel_index < 0:
+                logging.info("Текущий канал отсутствует в обновленном плейлисте")
+
+        if diff.is_empty():
+            self._update_playlist_info_label()
+            return
+
+        category_removed = self._remove_missing_categories()
+        self._update_category_combo()
+
+        current_category = self.category_combo.currentText()
+        change_limit = max(len(self.channels), len(diff.id_map)) * PLAYLIST_MERGE_MAX_CHANGE_RATIO
+        applied = False
+        if (not category_removed and len(diff.added) + len(diff.removed) <= change_limit and
+                not (self.search_box.text().strip() or self.show_favorites or self.show_hidden or
+                     current_category == "Избранное")):
+            rank = self.playlist_manager.get_display_position
+            removed_channels = {channel.id: channel for channel in diff.removed}
+            changed_ids = [channel.id for channel in diff.changed]
+
+            if current_category == "Все каналы":
+                added_ids_by_category = {}
+                for channel in diff.added:
+                    # Категория появляется в дереве, даже если все ее каналы скрыты
+                    category_ids = added_ids_by_category.setdefault(channel.category, [])
+                    if channel.name not in self.hidden_channels:
+                        category_ids.append(channel.id)
+
+                categories = set(self.categories).difference(("Все каналы", "Избранное"))
+                new_category_indexes = self.channel_tree_model.apply_channel_changes(
+                    diff.id_map, removed_channels, added_ids_by_category, changed_ids, rank, categories)
+                if new_category_indexes is not None:
+                    for category_index in new_category_indexes:
+                        self.channel_tree.expand(category_index)
+                    applied = True
+            else:
+                added_ids = [channel.id for channel in diff.added
+                             if channel.category == current_category and channel.name not in self.hidden_channels]
+                applied = self.channel_list_model.apply_channel_changes(
+                    diff.id_map, removed_channels, added_ids, changed_ids, rank)
+
+        if applied:
+            self._update_playlist_info_label()
+            return
+
+        view = self.channel_tree if self.channels_stack.currentIndex() == 0 else self.channel_list
+        scroll_position = view.verticalScrollBar().value()
+        self._refresh_channel_view()
+        view = self.channel_tree if self.channels_stack.currentIndex() == 0 else self.channel_list
+        view.verticalScrollBar().setValue(scroll_position)
+
+    def _remove_missing_categories(self):
+        """Убирает из выпадающего списка категории, которых нет в плейлисте
+
+        Returns:
+            bool: True, если исчезла выбранная категория (выбирается "Все каналы")
+        """
+        current_category = self.category_combo.currentText()
+        current_removed = False
+
+        self.category_combo.blockSignals(True)
+        for index in range(self.category_combo.count() - 1, -1, -1):
+            category = self.category_combo.itemText(index)
+            if category in self.categories or category == "Избранное":
+                continue
+            self.category_combo.removeItem(index)
+            if category == current_category:
+                current_removed = True
+
+        if current_removed:
+            self.category_combo.setCurrentText("Все каналы")
+        self.category_combo.blockSignals(False)
+        return current_removed
+
+    def _refresh_channel_view(self):
+        """Перестраивает текущее представление каналов с учетом режима и поиска"""
+        if self.show_favorites:
+            self.fill_favorites_list()
+        elif self.show_hidden:
+            self.fill_hidden_list()
+        else:
+            # При активном поиске запрос уходит в поток поиска
+            self.fill_channel_list()
 
     def add_playlist_from_url(self):
         """Добавляет плейлист из URL"""
@@ -2712,14 +3083,8 @@ class IPTVPlayer(QMainWindow):
         playlist_file = "local.m3u"
         playlist_url = "https://gitlab.com/iptv135435/iptvshared/raw/main/IPTV_SHARED.m3u"
 
-        # Создаем резервную копию текущего плейлиста
-        if os.path.exists(playlist_file):
-            backup_file = f"{playlist_file}.backup"
-            with open(playlist_file, 'rb') as src:
-                with open(backup_file, 'wb') as dst:
-                    dst.write(src.read())
-
-        # Загружаем плейлист по URL
+        # Загружаем плейлист по URL (прежняя версия сохраняется как резервная копия
+        # только если плейлист изменился)
         self.download_playlist_from_url(playlist_url, playlist_file, is_update=True)
 
     def download_playlist_from_url(self, url, target_file, is_update=False):
@@ -2740,17 +3105,48 @@ class IPTVPlayer(QMainWindow):
             self.statusbar_label.setText("Скачивание плейлиста...")
             self.progress_bar.setVisible(True)
 
+            def playlist_loaded():
+                # Устанавливаем сообщение об успешной загрузке
+                if is_update:
+                    self.info_label.setText("Плейлист успешно обновлен")
+                    self.statusbar_label.setText("Плейлист успешно обновлен")
+                    QMessageBox.information(self, "Информация", "Плейлист успешно обновлен из интернета")
+                else:
+                    self.info_label.setText(f"Загружен плейлист из URL")
+
+                # Обновляем отображение количества каналов
+                total_channels = len(self.channels)
+                visible_channels = total_channels - len(self.hidden_channels)
+
+                if hasattr(self, 'playlist_info_label'):
+                    self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+                else:
+                    self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+
+                # Автоматически выбираем первый канал
+                self.select_first_channel()
+
             def download_finished(success, error_message, source_url=""):
                 self.progress_bar.setVisible(False)
+                if not is_update and not self.finish_streamed_playlist(download_thread, success):
+                    return
+
+                if success and is_update and download_thread.not_modified:
+                    # Плейлист на сервере не изменился - показанные каналы актуальны
+                    self.remember_playlist_source(url, target_file, download_thread.validators)
+                    self.info_label.setText("Плейлист актуален")
+                    self.statusbar_label.setText("Обновление не требуется: плейлист не изменился")
+                    return
 
                 if success:
                     try:
                         # Проверяем, что файл действительно загружен и имеет формат M3U (для обновления)
                         if is_update:
-                            with open(target_file, 'r', encoding='utf-8', errors='ignore') as f:
+                            with open_playlist_file(target_file) as f:
                                 first_line = f.readline().strip()
                                 if not first_line.startswith('#EXTM3U'):
                                     raise ValueError("Файл не является плейлистом M3U")
+                            self.remember_playlist_source(url, target_file, download_thread.validators)
 
                         # Обновляем историю плейлистов
                         if is_update:
@@ -2769,36 +3165,15 @@ class IPTVPlayer(QMainWindow):
                         # Останавливаем текущий плейбек
                         self.stop()
 
-                        # Очищаем текущие данные каналов
-                        self.channels = []
-                        self.categories = {"Все каналы": []}
-
-                        # Загружаем внешний плейлист
-                        self.load_external_playlist(target_file)
-                        self.fill_channel_list()
-
-                        # Обновляем меню недавних плейлистов
-                        self.update_recent_menu()
-
-                        # Устанавливаем сообщение об успешной загрузке
+                        # Обновление применяется как изменения показанного плейлиста,
+                        # новый плейлист уже разобран во время загрузки
                         if is_update:
-                            self.info_label.setText("Плейлист успешно обновлен")
-                            self.statusbar_label.setText("Плейлист успешно обновлен")
-                            QMessageBox.information(self, "Информация", "Плейлист успешно обновлен из интернета")
-                        else:
-                            self.info_label.setText(f"Загружен плейлист из URL")
-
-                        # Обновляем отображение количества каналов
-                        total_channels = len(self.channels)
-                        visible_channels = total_channels - len(self.hidden_channels)
-
-                        if hasattr(self, 'playlist_info_label'):
-                            self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+                            self.load_external_playlist(target_file, playlist_loaded, merge=True)
                         else:
-                            self.statusbar_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+                            playlist_loaded()
 
-                        # Автоматически выбираем первый канал
-                        self.select_first_channel()
+                        # Обновляем меню недавних плейлистов
+                        self.update_recent_menu()
 
                     except Exception as e:
                         self.info_label.setText(f"Ошибка обработки плейлиста: {str(e)}")
@@ -2812,13 +3187,6 @@ class IPTVPlayer(QMainWindow):
                                 with open(backup_file, 'rb') as src:
                                     with open(target_file, 'wb') as dst:
                                         dst.write(src.read())
-                        else:
-                            # Удаляем неудачный временный файл
-                            try:
-                                if os.path.exists(target_file):
-                                    os.remove(target_file)
-                            except:
-                                pass
                 else:
                     self.info_label.setText(f"Ошибка загрузки плейлиста: {error_message}")
                     self.statusbar_label.setText("Ошибка загрузки плейлиста")
@@ -2834,19 +3202,28 @@ class IPTVPlayer(QMainWindow):
 
             # Выбираем соответствующий поток для загрузки
             if is_update:
-                # Для обновления используем обычный DownloadThread
-                download_thread = DownloadThread(url, target_file)
+                # Для обновления используем обычный DownloadThread с условным запросом
+                download_thread = DownloadThread(url, target_file,
+                                                 validators=self.get_playlist_validators(url, target_file),
+                                                 backup_path=f"{target_file}.backup")
             else:
-                # Для добавления нового используем PlaylistDownloadThread (возвращает source_url)
-                download_thread = PlaylistDownloadThread(url, target_file)
+                # Новый плейлист разбирается и показывается по мере загрузки
+                # (PlaylistDownloadThread также возвращает source_url)
+                download_thread = PlaylistDownloadThread(url, target_file, playlist_manager=self.playlist_manager)
 
+            self.connect_download_progress(download_thread)
             download_thread.finished.connect(download_finished)
 
-            # Регистрируем поток в ThreadManager
-            thread_id = f"download_{int(time.time())}"
-            if self.thread_manager.register_thread(thread_id, download_thread):
-                download_thread.start()
+            if is_update:
+                # Регистрируем поток в ThreadManager
+                thread_id = f"download_{int(time.time())}"
+                started = self.thread_manager.register_thread(thread_id, download_thread)
+                if started:
+                    download_thread.start()
             else:
+                started = self.start_streaming_playlist_download(download_thread)
+
+            if not started:
                 self.progress_bar.setVisible(False)
                 self.info_label.setText("Ошибка: превышен лимит потоков")
                 return
@@ -2857,6 +3234,67 @@ class IPTVPlayer(QMainWindow):
             self.statusbar_label.setText("Ошибка загрузки плейлиста")
             QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить плейлист: {str(e)}")
 
+    def get_playlist_validators(self, url, file_path):
+        """Возвращает данные прошлой загрузки плейлиста для условного запроса
+
+        Данные используются, только если файл с тех пор не менялся, иначе
+        ответ 304 оставил бы на диске не то, что лежит на сервере.
+
+        Returns:
+            dict | None: ETag, Last-Modified и SHA-1 содержимого или None
+        """
+        source = self.playlist_sources.get(url)
+        if not source or source.get('file') != file_path:
+            return None
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        if [stat.st_size, stat.st_mtime_ns] != [source.get('size'), source.get('mtime_ns')]:
+            return None
+
+        return {key: source.get(key) for key in ('etag', 'last_modified', 'sha1')}
+
+    def remember_playlist_source(self, url, file_path, validators):
+        """Запоминает данные загрузки плейлиста для следующего условного запроса"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            self.playlist_sources.pop(url, None)
+            return
+
+        self.playlist_sources[url] = dict(validators, file=file_path,
+                                          size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        self.config_manager.set('playlist_sources', self.playlist_sources)
+        self.config_manager.save_config()
+
+    def connect_download_progress(self, download_thread):
+        """Подключает индикатор прогресса к потоку загрузки
+
+        Пока размер файла неизвестен, индикатор остается в режиме ожидания.
+        После завершения загрузки этот режим восстанавливается, так как
+        индикатор используется и другими операциями.
+        """
+        download_thread.progress.connect(self.on_download_progress)
+        download_thread.finished.connect(lambda *args: self.progress_bar.setRange(0, 0))
+
+    def on_download_progress(self, received, total):
+        """Показывает ход загрузки файла
+
+        Args:
+            received: Получено байт
+            total: Размер файла в байтах или 0, если он неизвестен
+        """
+        if total > 0:
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(min(received * 1000 // total, 1000))
+            self.statusbar_label.setText(
+                f"Скачивание плейлиста: {received // 1024} из {total // 1024} КБ")
+        else:
+            self.progress_bar.setRange(0, 0)
+            self.statusbar_label.setText(f"Скачивание плейлиста: {received // 1024} КБ")
+
     def _cleanup_temp_files(self):
         """Удаляет старые временные файлы плейлистов"""
         try:
@@ -2885,8 +3323,6 @@ class IPTVPlayer(QMainWindow):
     def reload_playlist(self):
         """Перезагружает текущий плейлист из его источника (URL или файл)"""
         self.stop()
-        self.channels = []
-        self.categories = {"Все каналы": []}
 
         if not self.current_playlist:
             QMessageBox.warning(self, "Ошибка", "Не выбран текущий плейлист для обновления.")
@@ -2905,18 +3341,26 @@ class IPTVPlayer(QMainWindow):
 
             def download_finished(success, error_message, source_url=""): # Добавлен source_url для совместимости
                 self.progress_bar.setVisible(False)
+                if success:
+                    self.remember_playlist_source(playlist_source, temp_file, download_thread.validators)
+                if success and download_thread.not_modified and self.temp_playlist_path == temp_file:
+                    # Показан тот же плейлист, что и на сервере - разбор и перестроение не нужны
+                    self.info_label.setText("Плейлист не изменился")
+                    self.statusbar_label.setText("Плейлист не изменился на сервере")
+                    return
                 if success:
                     try:
+                        def playlist_loaded():
+                            self.info_label.setText("Плейлист успешно обновлен из URL")
+                            self.statusbar_label.setText("Плейлист обновлен из URL")
+                            # Обновляем отображение количества каналов
+                            total_channels = len(self.channels)
+                            visible_channels = total_channels - len(self.hidden_channels)
+                            self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+
                         # Загружаем обновленный плейлист
                         self.temp_playlist_path = temp_file # Обновляем путь к временному файлу
-                        self.load_external_playlist(temp_file)
-                        self.fill_channel_list()
-                        self.info_label.setText("Плейлист успешно обновлен из URL")
-                        self.statusbar_label.setText("Плейлист обновлен из URL")
-                        # Обновляем отображение количества каналов
-                        total_channels = len(self.channels)
-                        visible_channels = total_channels - len(self.hidden_channels)
-                        self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+                        self.load_external_playlist(temp_file, playlist_loaded, merge=True)
                     except Exception as e:
                         QMessageBox.critical(self, "Ошибка", f"Не удалось загрузить каналы из обновленного плейлиста: {str(e)}")
                         self.info_label.setText("Ошибка загрузки каналов")
@@ -2928,18 +3372,23 @@ class IPTVPlayer(QMainWindow):
                      # Попытаться загрузить старую временную версию, если она есть
                     if hasattr(self, 'temp_playlist_path') and os.path.exists(self.temp_playlist_path):
                          try:
-                             self.load_external_playlist(self.temp_playlist_path)
-                             self.fill_channel_list()
-                             self.info_label.setText("Загружена предыдущая версия плейлиста")
-                             self.statusbar_label.setText("Загружена предыдущая версия")
-                             QMessageBox.information(self, "Информация", "Не удалось обновить плейлист. Загружена предыдущая версия.")
-                             self.select_first_channel()
+                             def previous_playlist_loaded():
+                                 self.info_label.setText("Загружена предыдущая версия плейлиста")
+                                 self.statusbar_label.setText("Загружена предыдущая версия")
+                                 QMessageBox.information(self, "Информация", "Не удалось обновить плейлист. Загружена предыдущая версия.")
+                                 self.select_first_channel()
+
+                             self.load_external_playlist(self.temp_playlist_path, previous_playlist_loaded)
                          except Exception as load_err:
                              QMessageBox.critical(self, "Критическая ошибка", f"Не удалось загрузить даже предыдущую версию: {load_err}")
 
 
             # Используем PlaylistDownloadThread для скачивания
-            download_thread = PlaylistDownloadThread(playlist_source, temp_file)
+            validators = None
+            if self.temp_playlist_path == temp_file:
+                validators = self.get_playlist_validators(playlist_source, temp_file)
+            download_thread = PlaylistDownloadThread(playlist_source, temp_file, validators=validators)
+            self.connect_download_progress(download_thread)
             download_thread.finished.connect(download_finished)
 
             # Регистрируем поток в ThreadManager
@@ -2955,17 +3404,18 @@ class IPTVPlayer(QMainWindow):
             # --- Обновление из файла ---
             if os.path.exists(playlist_source):
                 try:
-                    self.load_external_playlist(playlist_source)
-                    self.fill_channel_list()
-                    # Используем имя плейлиста для отображения
-                    display_name = self.playlist_names.get(playlist_source, os.path.basename(playlist_source))
-                    self.info_label.setText(f"Плейлист '{display_name}' перезагружен")
-                    self.statusbar_label.setText("Плейлист перезагружен из файла")
-                     # Обновляем отображение количества каналов
-                    total_channels = len(self.channels)
-                    visible_channels = total_channels - len(self.hidden_channels)
-                    self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
-                    self.select_first_channel()
+                    def playlist_loaded():
+                        # Используем имя плейлиста для отображения
+                        display_name = self.playlist_names.get(playlist_source, os.path.basename(playlist_source))
+                        self.info_label.setText(f"Плейлист '{display_name}' перезагружен")
+                        self.statusbar_label.setText("Плейлист перезагружен из файла")
+                         # Обновляем отображение количества каналов
+                        total_channels = len(self.channels)
+                        visible_channels = total_channels - len(self.hidden_channels)
+                        self.playlist_info_label.setText(f"Всего каналов: {total_channels} (видимых: {visible_channels})")
+                        self.select_first_channel()
+
+                    self.load_external_playlist(playlist_source, playlist_loaded, merge=True)
                 except Exception as e:
                     QMessageBox.critical(self, "Ошибка", f"Не удалось перезагрузить плейлист из файла: {str(e)}")
                     self.info_label.setText("Ошибка перезагрузки файла")
@@ -2995,10 +3445,7 @@ class IPTVPlayer(QMainWindow):
             self.fill_favorites_list()
 
             # Отображаем количество избранных каналов
-            visible_favorites = 0
-            for fav in self.favorites:
-                if fav not in self.hidden_channels:
-                    visible_favorites += 1
+            visible_favorites = len(self.favorites - self.hidden_channels)
 
             self.statusbar_label.setText(f"Избранных каналов: {len(self.favorites)} (видимых: {visible_favorites})")
             self.playlist_info_label.setText(f"Избранных каналов: {len(self.favorites)} (видимых: {visible_favorites})")
@@ -3163,12 +3610,13 @@ class IPTVPlayer(QMainWindow):
             # Обновляем конфигурацию текущими значениями
             self.config_manager.set('volume', self.volume)
             self.config_manager.set('last_channel', self.last_channel)
-            self.config_manager.set('favorites', self.favorites)
-            self.config_manager.set('hidden_channels', self.hidden_channels)
+            self.config_manager.set_set('favorites', self.favorites)
+            self.config_manager.set_set('hidden_channels', self.hidden_channels)
             self.config_manager.set('show_hidden', self.show_hidden)
             self.config_manager.set('show_logos', self.show_logos)
             self.config_manager.set('recent_playlists', self.recent_playlists)
             self.config_manager.set('playlist_names', self.playlist_names)
+            self.config_manager.set('playlist_sources', self.playlist_sources)
 
             # Определяем текущую категорию
             if hasattr(self, 'category_combo') and self.category_combo is not None:
@@ -3202,7 +3650,7 @@ class IPTVPlayer(QMainWindow):
         # Получаем имя текущего канала
         channel_name = None
         if self.current_channel_index >= 0 and self.current_channel_index < len(self.channels):
-            channel_name = self.channels[self.current_channel_index]['name']
+            channel_name = self.channels[self.current_channel_index].name
 
         # Используем улучшенный метод из MediaPlayerManager
         success, filepath, message = self.media_player_manager.take_snapshot(channel_name=channel_name)
@@ -3375,8 +3823,8 @@ class IPTVPlayer(QMainWindow):
         # Информация о канале
         if self.current_channel_index >= 0 and self.current_channel_index < len(self.channels):
             channel = self.channels[self.current_channel_index]
-            info_text += f"\n📡 Канал: {channel['name']}\n"
-            info_text += f"Категория: {channel['category']}\n"
+            info_text += f"\n📡 Канал: {channel.name}\n"
+            info_text += f"Категория: {channel.category}\n"
 
         # Показываем диалог
         msg_box = QMessageBox(self)
@@ -3391,53 +3839,16 @@ class IPTVPlayer(QMainWindow):
 
         # Определяем индекс выбранного канала
         if sender == self.channel_tree:
-            selected_items = self.channel_tree.selectedItems()
-            if not selected_items or not selected_items[0].parent():
-                return
-
-            channel_index = selected_items[0].data(0, Qt.UserRole)
-            if channel_index is None:
-                return
-            channel = self.channels[channel_index]
+            channel_index = self.channel_tree_model.channel_id(self.channel_tree.currentIndex())
         elif sender == self.channel_list:
-            current_row = self.channel_list.currentRow()
-            if current_row < 0:
-                return
-
-            current_category = self.category_combo.currentText()
-            if current_category == "Избранное":
-                # Находим канал из списка избранных
-                favorites_visible = []
-                for fav in self.favorites:
-                    for ch in self.channels:
-                        if ch['name'] == fav and ch['name'] not in self.hidden_channels:
-                            favorites_visible.append(ch)
-
-                if current_row >= len(favorites_visible):
-                    return
-
-                channel = favorites_visible[current_row]
-                for i, ch in enumerate(self.channels):
-                    if ch['name'] == channel['name']:
-                        channel_index = i
-                        break
-                else:
-                    return
-            else:
-                # Находим видимые каналы в текущей категории
-                visible_channels = []
-                for ch in self.categories.get(current_category, []):
-                    if ch['name'] not in self.hidden_channels:
-                        visible_channels.append(ch)
-
-                if current_row >= len(visible_channels):
-                    return
-
-                channel = visible_channels[current_row]
-                channel_index = self.channels.index(channel)
+            channel_index = self.channel_list_model.channel_id(self.channel_list.currentIndex())
         else:
             return
 
+        channel = self.playlist_manager.get_channel(channel_index)
+        if channel is None:
+            return
+
         # Создаем контекстное меню
         menu = QMenu(self)
 
@@ -3447,22 +3858,22 @@ class IPTVPlayer(QMainWindow):
         menu.addAction(play_action)
 
         # Пункт "Добавить в избранное" или "Удалить из избранного"
-        if channel['name'] in self.favorites:
+        if channel.name in self.favorites:
             fav_action = QAction("Удалить из избранного", self)
-            fav_action.triggered.connect(lambda: self.remove_from_favorites(channel['name']))
+            fav_action.triggered.connect(lambda: self.remove_from_favorites(channel.name))
         else:
             fav_action = QAction("Добавить в избранное", self)
-            fav_action.triggered.connect(lambda: self.add_to_favorites(channel['name']))
+            fav_action.triggered.connect(lambda: self.add_to_favorites(channel.name))
 
         menu.addAction(fav_action)
 
         # Пункт "Скрыть канал" или "Показать канал"
-        if channel['name'] in self.hidden_channels:
+        if channel.name in self.hidden_channels:
             hide_action = QAction("Показать канал", self)
-            hide_action.triggered.connect(lambda: self.show_channel(channel['name']))
+            hide_action.triggered.connect(lambda: self.show_channel(channel.name))
         else:
             hide_action = QAction("Скрыть канал", self)
-            hide_action.triggered.connect(lambda: self.hide_channel(channel['name']))
+            hide_action.triggered.connect(lambda: self.hide_channel(channel.name))
 
         menu.addAction(hide_action)
 
@@ -3477,7 +3888,7 @@ class IPTVPlayer(QMainWindow):
     def add_to_favorites(self, channel_name):
         """Добавляет канал в избранное"""
         if channel_name not in self.favorites:
-            self.favorites.append(channel_name)
+            self.favorites.add(channel_name)
 
             # Обновляем список если открыта категория "Избранное"
             if self.category_combo.currentText() == "Избранное":
@@ -3499,7 +3910,7 @@ class IPTVPlayer(QMainWindow):
     def remove_from_favorites(self, channel_name):
         """Удаляет канал из избранного"""
         if channel_name in self.favorites:
-            self.favorites.remove(channel_name)
+            self.favorites.discard(channel_name)
 
             # Обновляем список если открыта категория "Избранное"
             if self.category_combo.currentText() == "Избранное":
@@ -3510,27 +3921,27 @@ class IPTVPlayer(QMainWindow):
 
     def show_channel_info(self, channel):
         """Показывает информацию о канале"""
-        info = f"Название: {channel['name']}\n"
-        info += f"Категория: {channel['category']}\n"
+        info = f"Название: {channel.name}\n"
+        info += f"Категория: {channel.category}\n"
 
-        if 'tvg_id' in channel and channel['tvg_id']:
-            info += f"ID: {channel['tvg_id']}\n"
+        if channel.tvg_id:
+            info += f"ID: {channel.tvg_id}\n"
 
-        info += f"URL: {channel['url']}"
+        info += f"URL: {channel.url}"
 
         QMessageBox.information(self, "Информация о канале", info)
 
     def hide_channel(self, channel_name):
         """Скрывает канал из списков"""
         if channel_name not in self.hidden_channels:
-            self.hidden_channels.append(channel_name)
+            self.hidden_channels.add(channel_name)
             self.fill_channel_list()
             self.save_config()
 
     def show_channel(self, channel_name):
         """Показывает скрытый канал"""
         if channel_name in self.hidden_channels:
-            self.hidden_channels.remove(channel_name)
+            self.hidden_channels.discard(channel_name)
             self.fill_channel_list()
             self.save_config()
 
@@ -3583,9 +3994,9 @@ class IPTVPlayer(QMainWindow):
         """Восстанавливает воспроизведение последнего просмотренного канала"""
         # Найти канал по имени
         for i, channel in enumerate(self.channels):
-            if channel['name'] == channel_name:
+            if channel.name == channel_name:
                 # Найти категорию
-                category = channel['category']
+                category = channel.category
                 # Выбрать категорию в комбобоксе
                 index = self.category_combo.findText(category)
                 if index >= 0:
@@ -3603,7 +4014,7 @@ class IPTVPlayer(QMainWindow):
                 # Показываем пользователю сообщение
                 channel_name = "Неизвестный канал"
                 if 0 <= self.current_channel_index < len(self.channels):
-                    channel_name = self.channels[self.current_channel_index]['name']
+                    channel_name = self.channels[self.current_channel_index].name
 
                 # Обновляем UI
                 self.info_label.setText(f"Канал '{channel_name}' недоступен после {self.max_retry_count} попыток")
@@ -3653,71 +4064,15 @@ class IPTVPlayer(QMainWindow):
     def play_selected_channel(self):
         """Воспроизведение выбранного канала"""
         if self.channels_stack.currentIndex() == 0:  # Дерево категорий
-            selected_items = self.channel_tree.selectedItems()
-            if not selected_items:
-                return
-
-            item = selected_items[0]
-            # Проверяем, является ли выбранный элемент каналом (имеет родителя)
-            if item.parent():
-                channel_index = item.data(0, Qt.UserRole)
-                if channel_index is not None:
-                    self.play_channel(channel_index)
+            # Для категории идентификатор канала не определен
+            channel_index = self.channel_tree_model.channel_id(self.channel_tree.currentIndex())
         else:  # Обычный список
-            current_row = self.channel_list.currentRow()
-            if current_row < 0:
-                return
-
-            # Получаем элемент списка
-            item = self.channel_list.item(current_row)
-            if not item:
-                return
-
-            # Проверяем, есть ли сохраненный индекс канала (для отфильтрованных результатов)
-            channel_index = item.data(Qt.UserRole)
-            if channel_index is not None:
-                # Используем сохраненный индекс (для поиска и фильтрации)
-                self.play_channel(channel_index)
-                return
-
-            # Если индекс не сохранен, используем старую логику
-            current_category = self.category_combo.currentText()
-
-            if current_category == "Избранное":
-                # Находим канал из списка избранных
-                favorites_visible = []
-                for fav in self.favorites:
-                    for ch in self.channels:
-                        if ch['name'] == fav and (self.show_hidden or ch['name'] not in self.hidden_channels):
-                            favorites_visible.append(ch)
-
-                if current_row >= len(favorites_visible):
-                    return
-
-                channel = favorites_visible[current_row]
-                for i, ch in enumerate(self.channels):
-                    if ch['name'] == channel['name']:
-                        channel_index = i
-                        break
-                else:
-                    return
-
-                self.play_channel(channel_index)
-            else:
-                # Находим видимые каналы в текущей категории
-                visible_channels = []
-                for ch in self.categories.get(current_category, []):
-                    if self.show_hidden or ch['name'] not in self.hidden_channels:
-                        visible_channels.append(ch)
+            channel_index = self.channel_list_model.channel_id(self.channel_list.currentIndex())
 
-                if current_row >= len(visible_channels):
-                    return
+        if channel_index is not None:
+            self.play_channel(channel_index)
 
-                channel = visible_channels[current_row]
-                channel_index = self.channels.index(channel)
-                self.play_channel(channel_index)
-
-    def on_channel_double_clicked(self, item):
+    def on_channel_double_clicked(self, index):
         """Обработчик двойного клика по каналу"""
         # Просто вызываем метод воспроизведения выбранного канала
         self.play_selected_channel()
@@ -3738,173 +4093,229 @@ class IPTVPlayer(QMainWindow):
         # Логируем событие
         logging.debug("Окно восстановлено/показано")
 
-    def load_channel_logo(self, logo_url):
-        """Загружает и кэширует логотип канала"""
+    def load_channel_logo(self, logo_url, priority=LOGO_PRIORITY_VISIBLE):
+        """Возвращает иконку логотипа канала, при необходимости запрашивая загрузку
+
+        Args:
+            logo_url: URL логотипа
+            priority: Приоритет загрузки, если логотипа нет в кэше
+
+        Returns:
+            QIcon | None: Иконка или None, если логотип еще не загружен
+        """
         if not logo_url:
             return None
 
-        # Инициализация кэша и директории для кэша логотипов
-        if not hasattr(self, 'logo_cache'):
-            self.logo_cache = {}
-            self.logo_download_threads = {}
-            self.failed_logos = set()  # Список URL, которые не удалось загрузить
-            self.max_concurrent_downloads = 5  # Ограничение на количество одновременных загрузок
+        # Если иконка уже создана, возвращаем ее из кэша
+        icon = self.logo_cache.get(logo_url)
+        if icon is not None:
+            return icon
+
+        # Проверяем, есть ли логотип в кэше на диске (по индексу, без обращения к файлу).
+        # Логотип из кэша показываем, даже если его хост сейчас недоступен.
+        # Атлас используется только для логотипов из дискового кэша, чтобы вытеснение
+        # из кэша распространялось и на атлас
+        cache_path = self.logo_disk_cache.lookup(logo_url)
+        if cache_path:
+            if self.logo_atlas is not None:
+                image = self.logo_atlas.get(logo_url)
+                if image is not None:
+                    return self.logo_cache.put(logo_url, QPixmap.fromImage(image))
+
+            # На диске логотипы хранятся уже масштабированными, поэтому достаточно прочитать файл
+            pixmap = QPixmap(cache_path)
+            if not pixmap.isNull():
+                if self.logo_atlas is not None:
+                    self.logo_atlas.add(logo_url, pixmap.toImage())
+                return self.logo_cache.put(logo_url, pixmap)
+            # Файл поврежден или не читается - удаляем его и загружаем логотип заново
+            self.logo_disk_cache.remove(logo_url)
+
+        # Недавно не загрузившийся URL или недоступный хост не запрашиваем до истечения срока
+        if self.logo_failures.is_failed(logo_url):
+            return None
 
-            # Создаем директорию для кэша логотипов, если её нет
-            self.logos_cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'logos')
-            os.makedirs(self.logos_cache_dir, exist_ok=True)
+        # Повторные запросы одного URL сервис объединяет сам
+        self.logo_fetch_service.request(logo_url, priority)
 
-            # Отключаем предупреждения о небезопасных HTTPS-соединениях
-            import urllib3
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+        # Возвращаем None, логотип будет обновлен позже, когда загрузится
+        return None
 
-            # Включаем режим отладки для логов (устанавливаем False для рабочей версии)
-            self.debug_logo_loading = False
+    def on_logo_loaded(self, logo_url, image):
+        """Обработчик успешной загрузки логотипа
 
-        # Если URL уже в списке неудачных, не пытаемся загрузить снова
-        if logo_url in self.failed_logos:
-            return None
+        Логотип уже декодирован, масштабирован и сохранен на диск рабочим
+        потоком, здесь остается только создать QPixmap.
+        """
+        pixmap = QPixmap.fromImage(image)
 
-        # Если логотип уже загружен, возвращаем его из кэша
-        if logo_url in self.logo_cache:
-            return self.logo_cache[logo_url]
+        # Сохраняем иконку логотипа в кэше
+        self.logo_cache.put(logo_url, pixmap)
 
-        # Генерируем имя файла для кэша на основе URL
-        cache_filename = self._get_cache_filename(logo_url)
-        cache_path = os.path.join(self.logos_cache_dir, cache_filename)
+        if self.logo_disk_cache.needs_maintenance():
+            self.start_logo_cache_maintenance()
 
-        # Проверяем, есть ли логотип в кэше на диске
-        if os.path.exists(cache_path):
-            try:
-                # Загружаем изображение с поддержкой альфа-канала
-                pixmap = QPixmap(cache_path)
-                if not pixmap.isNull():
-                    # Убеждаемся, что pixmap поддерживает альфа-канал
-                    if pixmap.hasAlphaChannel():
-                        # Создаем новый pixmap с альфа-каналом
-                        alpha_pixmap = QPixmap(pixmap.size())
-                        alpha_pixmap.fill(Qt.transparent)
-                        painter = QPainter(alpha_pixmap)
-                        painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-                        painter.drawPixmap(0, 0, pixmap)
-                        painter.end()
-                        pixmap = alpha_pixmap
-
-                    self.logo_cache[logo_url] = pixmap
-                    return pixmap
-            except Exception:
-                # Если возникла ошибка при загрузке из кэша, удаляем файл и загружаем заново
-                try:
-                    os.remove(cache_path)
-                except Exception:
-                    pass
+        # Обновляем все элементы списка, которые используют этот логотип
+        self.update_channel_logos(logo_url, pixmap)
 
-        # Если логотип еще не загружается и не превышено ограничение на количество одновременных загрузок
-        if (logo_url not in self.logo_download_threads and
-                len(self.logo_download_threads) < self.max_concurrent_downloads):
-            thread = LogoDownloadThread(logo_url)
-            thread.logo_loaded.connect(lambda url, pixmap: self.on_logo_loaded(url, pixmap, cache_path))
-            thread.logo_failed.connect(self.on_logo_failed)
+    def start_logo_cache_maintenance(self):
+        """Запускает фоновое обслуживание дискового кэша логотипов"""
+        if self.logo_cache_maintenance_thread is not None:
+            return
 
-            # Регистрируем поток в ThreadManager
-            thread_id = f"logo_{hashlib.md5(logo_url.encode()).hexdigest()[:8]}"
-            if self.thread_manager.register_thread(thread_id, thread):
-                self.logo_download_threads[logo_url] = thread
-                thread.start()
-            else:
-                logging.warning(f"Не удалось зарегистрировать поток загрузки логотипа: {logo_url}")
+        thread = LogoCacheMaintenanceThread(self.logo_disk_cache, self.logo_atlas)
+        thread.finished.connect(self.on_logo_cache_maintenance_finished)
+        if self.thread_manager.register_thread("logo_cache_maintenance", thread):
+            self.logo_cache_maintenance_thread = thread
+            thread.start()
 
-        # Возвращаем None, логотип будет обновлен позже, когда загрузится
-        return None
+    def on_logo_cache_maintenance_finished(self, success, error_message):
+        """Обработчик завершения обслуживания кэша логотипов"""
+        thread = self.sender()
+        if thread is not self.logo_cache_maintenance_thread:
+            return
 
-    def _get_cache_filename(self, url):
-        """Генерирует имя файла для кэша на основе URL"""
-        # Используем MD5-хеш URL для имени файла
-        return hashlib.md5(url.encode('utf-8')).hexdigest() + '.png'
+        self.thread_manager.unregister_thread("logo_cache_maintenance")
+        self.logo_cache_maintenance_thread = None
+        thread.deleteLater()
 
-    def on_logo_loaded(self, logo_url, pixmap, cache_path=None):
-        """Обработчик успешной загрузки логотипа"""
-        # Сохраняем логотип в кэше
-        self.logo_cache[logo_url] = pixmap
+        if not success:
+            logging.warning(f"Обслуживание кэша логотипов не завершено: {error_message}")
 
-        # Сохраняем логотип в кэш на диске
-        if cache_path:
-            try:
-                pixmap.save(cache_path, 'PNG')
-            except Exception:
-                pass
+    def start_logo_revalidation(self):
+        """Запускает фоновую проверку актуальности логотипов в кэше"""
+        if self.logo_revalidation_thread is not None or not self.show_logos:
+            return
 
-        # Удаляем поток из списка активных загрузок и отменяем регистрацию в ThreadManager
-        if logo_url in self.logo_download_threads:
-            thread_id = f"logo_{hashlib.md5(logo_url.encode()).hexdigest()[:8]}"
-            self.thread_manager.unregister_thread(thread_id)
-            self.logo_download_threads[logo_url].deleteLater()
-            del self.logo_download_threads[logo_url]
+        thread = LogoRevalidationThread(self.logo_disk_cache, self.logo_atlas, self.logo_failures)
+        thread.logo_updated.connect(self.on_logo_revalidated)
+        thread.finished.connect(self.on_logo_revalidation_finished)
+        if self.thread_manager.register_thread("logo_revalidation", thread):
+            self.logo_revalidation_thread = thread
+            thread.start()
 
-        # Обновляем все элементы списка, которые используют этот логотип
-        self.update_channel_logos(logo_url, pixmap)
+    def on_logo_revalidated(self, logo_url, image):
+        """Заменяет логотип, который изменился на сервере"""
+        # Иконку обновляем, только если логотип уже показывался в этом сеансе
+        if logo_url in self.logo_cache:
+            pixmap = QPixmap.fromImage(image)
+            self.logo_cache.put(logo_url, pixmap)
+            self.update_channel_logos(logo_url, pixmap)
+
+    def on_logo_revalidation_finished(self, success, error_message):
+        """Обработчик завершения проверки актуальности логотипов"""
+        thread = self.sender()
+        if thread is not self.logo_revalidation_thread:
+            return
 
-    def on_logo_failed(self, logo_url):
-        """Обработчик неудачной загрузки логотипа"""
-        # Добавляем URL в список неудачных, чтобы не пытаться загрузить снова
-        self.failed_logos.add(logo_url)
+        self.thread_manager.unregister_thread("logo_revalidation")
+        self.logo_revalidation_thread = None
+        thread.deleteLater()
 
-        # Удаляем поток из списка активных загрузок и отменяем регистрацию в ThreadManager
-        if logo_url in self.logo_download_threads:
-            thread_id = f"logo_{hashlib.md5(logo_url.encode()).hexdigest()[:8]}"
-            self.thread_manager.unregister_thread(thread_id)
-            self.logo_download_threads[logo_url].deleteLater()
-            del self.logo_download_threads[logo_url]
+        if not success:
+            logging.warning(f"Проверка логотипов не завершена: {error_message}")
 
     def update_channel_logos(self, logo_url, pixmap):
         """Обновляет иконки каналов после загрузки логотипа"""
         if not self.show_logos:
             return
 
-        # Обновляем логотипы в обычном списке
-        for i in range(self.channel_list.count()):
-            item = self.channel_list.item(i)
-            idx = self.channel_list.row(item)
-            channel_idx = -1
-
-            # Получаем индекс канала
-            for channel in self.channels:
-                if channel['name'] == item.text():
-                    if 'tvg_logo' in channel and channel['tvg_logo'] == logo_url:
-                        item.setIcon(QIcon(pixmap))
-                    break
+        # Обратный индекс моделей содержит только строки с этим логотипом
+        self.channel_list_model.update_logo(logo_url)
+        self.channel_tree_model.update_logo(logo_url)
 
-        # Обновляем логотипы в дереве каналов
-        root = self.channel_tree.invisibleRootItem()
-        for i in range(root.childCount()):
-            category_item = root.child(i)
-            for j in range(category_item.childCount()):
-                channel_item = category_item.child(j)
-                channel_idx = channel_item.data(0, Qt.UserRole)
-                if channel_idx is not None and 0 <= channel_idx < len(self.channels):
-                    channel = self.channels[channel_idx]
-                    if 'tvg_logo' in channel and channel['tvg_logo'] == logo_url:
-                        channel_item.setIcon(0, QIcon(pixmap))
-
-    def create_channel_item(self, channel_name, channel=None):
-        """Создает элемент списка с логотипом (если доступен)"""
-        item = QListWidgetItem(channel_name)
-
-        # Если отображение логотипов включено
+    def schedule_logo_priorities(self, *args):
+        """Откладывает пересчет приоритетов логотипов до окончания прокрутки"""
         if self.show_logos:
-            # Если у нас есть информация о канале и URL логотипа
-            if channel and 'tvg_logo' in channel and channel['tvg_logo']:
-                logo = self.load_channel_logo(channel['tvg_logo'])
-                if logo:
-                    item.setIcon(QIcon(logo))
-                else:
-                    # Если не удалось загрузить логотип, используем стандартную иконку
-                    item.setIcon(QIcon(self.default_channel_icon))
-            else:
-                # Если у канала нет логотипа, используем стандартную иконку
-                item.setIcon(QIcon(self.default_channel_icon))
+            self.logo_priority_timer.start()
 
-        return item
+    def update_logo_priorities(self):
+        """Перестраивает очередь логотипов по видимой области текущего представления
+
+        Видимые строки загружаются первыми, затем строки в пределах
+        LOGO_PREFETCH_PAGES страниц вокруг, а ожидающие загрузки для строк,
+        ушедших дальше, отменяются.
+        """
+        if not self.show_logos:
+            return
+
+        view = self.channels_stack.currentWidget()
+        model = view.model()
+        visible, near = self._get_viewport_indexes(view)
+
+        priorities = {}
+        for priority, indexes in ((LOGO_PRIORITY_VISIBLE, visible), (LOGO_PRIORITY_NEAR, near)):
+            for index in indexes:
+                channel_id = model.channel_id(index)
+                if channel_id is None:
+                    continue
+                logo_url = self.playlist_manager.channels[channel_id].tvg_logo
+                if not logo_url or logo_url in priorities:
+                    continue
+                # Логотипы из кэша в памяти или на диске в очереди не нужны. Проверки
+                # не меняют порядок вытеснения кэшей, не обращаются к файлам и не ставят
+                # загрузку в очередь: иконки создаются при отрисовке строк, а очередь
+                # задает только reprioritize
+                if (logo_url in self.logo_cache or self.logo_failures.is_failed(logo_url) or
+                        self.logo_disk_cache.contains(logo_url)):
+                    continue
+                priorities[logo_url] = priority
+
+        self.logo_fetch_service.reprioritize(priorities)
+
+    def _get_viewport_indexes(self, view):
+        """Возвращает индексы видимых строк и строк рядом с видимой областью
+
+        Returns:
+            tuple: (видимые индексы, индексы в пределах LOGO_PREFETCH_PAGES страниц)
+        """
+        first = view.indexAt(QPoint(1, 1))
+        if not first.isValid():
+            return [], []
+
+        page = view.viewport().height() // max(1, view.visualRect(first).height()) + 1
+        if isinstance(view, QTreeView):
+            below, above = view.indexBelow, view.indexAbove
+        else:
+            def below(index):
+                return index.sibling(index.row() + 1, 0)
+
+            def above(index):
+                return index.sibling(index.row() - 1, 0)
+
+        visible = []
+        index = first
+        while index.isValid() and len(visible) < page:
+            visible.append(index)
+            index = below(index)
+
+        near = []
+        for step, index in ((below, index), (above, above(first))):
+            for _ in range(page * LOGO_PREFETCH_PAGES):
+                if not index.isValid():
+                    break
+                near.append(index)
+                index = step(index)
+
+        return visible, near
+
+    def get_channel_icon(self, channel):
+        """Возвращает иконку канала с логотипом (если доступен)
+
+        Вызывается моделями каналов только для отображаемых строк.
+        """
+        # Если отображение логотипов выключено, иконка не нужна
+        if not self.show_logos:
+            return None
+
+        # Если у канала есть URL логотипа
+        if channel.tvg_logo:
+            icon = self.load_channel_logo(channel.tvg_logo)
+            if icon is not None:
+                return icon
+
+        # Если у канала нет логотипа или он еще не загружен, используем стандартную иконку
+        return self.default_channel_qicon
 
     def toggle_logos(self):
         """Включает/выключает отображение логотипов каналов"""
@@ -3972,6 +4383,12 @@ class IPTVPlayer(QMainWindow):
             # Останавливаем все потоки
             self._stop_all_threads()
 
+            # Сохраняем индекс кэша логотипов и список недоступных логотипов
+            self.logo_disk_cache.save_index()
+            self.logo_failures.save()
+            if self.logo_atlas is not None:
+                self.logo_atlas.close()
+
             # Сохраняем конфигурацию
             self.config_manager.update_window_geometry(self)
             self.config_manager.save_config()
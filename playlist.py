@@ -2,15 +2,570 @@
 Модуль управления плейлистами для MaksIPTV Player
 Версия 0.13.0
 
-Содержит PlaylistManager для загрузки, парсинга и управления плейлистами.
+Содержит PlaylistManager для загрузки, парсинга и управления плейлистами,
+Channel - компактную запись о канале, M3UParser для потокового разбора M3U,
+PlaylistCache для бинарного кэша разобранных плейлистов, ChannelSearchIndex
+для поиска каналов по названию, PlaylistDiff - изменения плейлиста при
+повторной загрузке и PlaylistDecompressor для распаковки сжатых плейлистов
+(gzip, xz) по мере загрузки.
 Реализует принцип единственной ответственности (SRP).
 """
 
+import io
 import os
 import re
+import gc
+import sys
+import gzip
+import lzma
+import zlib
+import codecs
+import zipfile
+import struct
+import marshal
+import hashlib
+import logging
+from operator import attrgetter
+from collections import defaultdict, deque
 from PyQt5.QtWidgets import QStyle
 
 
+# Единый сканер строки #EXTINF: атрибуты вида key="value" (после пробела или
+# сразу после закрывающей кавычки предыдущего атрибута) и имя канала после
+# первой запятой вне кавычек
+EXTINF_SCANNER_RE = re.compile(r'(?:(?<=\s)|(?<="))([^\s=,"]+)="([^"]*)"|,(.*)')
+
+DEFAULT_CATEGORY = "Без категории"
+
+# Версия формата бинарного кэша плейлистов (увеличивать при изменении формата)
+PLAYLIST_CACHE_VERSION = 1
+
+# Сколько снимков плейлистов хранить (лишние удаляются, начиная с давно использованных)
+PLAYLIST_CACHE_MAX_SNAPSHOTS = 10
+
+# Сигнатуры сжатых файлов плейлистов
+COMPRESSION_SIGNATURES = (
+    (b'\x1f\x8b', 'gzip'),
+    (b'\xfd7zXZ\x00', 'xz'),
+    (b'PK\x03\x04', 'zip'),
+)
+COMPRESSION_SIGNATURE_SIZE = 6
+
+# Размер заголовка снимка, записываемый перед самим заголовком
+HEADER_SIZE_STRUCT = struct.Struct('<I')
+
+
+def detect_compression(head):
+    """Определяет формат сжатия по первым байтам файла
+
+    Returns:
+        str | None: 'gzip', 'xz', 'zip' или None для несжатого файла
+    """
+    for signature, compression in COMPRESSION_SIGNATURES:
+        if head.startswith(signature):
+            return compression
+    return None
+
+
+def open_playlist_file(file_path):
+    """Открывает файл плейлиста как текст, прозрачно распаковывая gzip, xz и zip
+
+    Из zip-архива читается первый файл .m3u/.m3u8, а если таких нет -
+    первый файл архива.
+
+    Returns:
+        Текстовый поток, который закрывает вызывающий код
+    """
+    with open(file_path, 'rb') as f:
+        compression = detect_compression(f.read(COMPRESSION_SIGNATURE_SIZE))
+
+    if compression == 'gzip':
+        return gzip.open(file_path, 'rt', encoding='utf-8', errors='ignore')
+    if compression == 'xz':
+        return lzma.open(file_path, 'rt', encoding='utf-8', errors='ignore')
+    if compression == 'zip':
+        with zipfile.ZipFile(file_path) as archive:
+            names = [info.filename for info in archive.infolist() if not info.is_dir()]
+            playlists = [name for name in names if name.lower().endswith(('.m3u', '.m3u8'))]
+            if not names:
+                raise ValueError("Архив не содержит плейлиста")
+            # Открытый файл архива остается доступным после закрытия самого архива
+            member = archive.open((playlists or names)[0])
+        return io.TextIOWrapper(member, encoding='utf-8', errors='ignore')
+    return open(file_path, 'r', encoding='utf-8', errors='ignore')
+
+
+class PlaylistDecompressor:
+    """Потоковая распаковка сжатого плейлиста по мере загрузки
+
+    Формат определяется по сигнатуре первых байт. gzip (в том числе из
+    нескольких частей) и xz распаковываются порциями, несжатые данные
+    передаются без изменений. У zip оглавление находится в конце архива,
+    поэтому такой плейлист порциями не распаковывается (streamable=False)
+    и разбирается из файла после загрузки.
+    """
+
+    def __init__(self):
+        self.compression = None
+        self.streamable = True
+        self._head = b''  # Первые байты, пока формат не определен
+        self._decompressor = None
+
+    def decompress(self, data):
+        """Распаковывает очередную порцию данных
+
+        Returns:
+            bytes: Распакованные данные (могут быть пустыми)
+        """
+        if self._head is not None:
+            self._head += data
+            if len(self._head) < COMPRESSION_SIGNATURE_SIZE:
+                return b''
+            data = self._start()
+
+        if not self.streamable:
+            return b''
+        if self._decompressor is None:
+            return data
+        return self._decompress(data)
+
+    def flush(self):
+        """Возвращает остаток данных после последней порции"""
+        if self._head is not None:
+            # Данных меньше длины сигнатуры
+            data = self._start()
+            return self._decompress(data) if self._decompressor is not None else data
+        if self.compression == 'gzip' and self.streamable:
+            return self._decompressor.flush()
+        return b''
+
+    def _start(self):
+        """Выбирает распаковщик по накопленным первым байтам"""
+        data, self._head = self._head, None
+        self.compression = detect_compression(data)
+        if self.compression == 'gzip':
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        elif self.compression == 'xz':
+            self._decompressor = lzma.LZMADecompressor()
+        elif self.compression == 'zip':
+            self.streamable = False
+        return data
+
+    def _decompress(self, data):
+        """Распаковывает данные, продолжая со следующей части gzip после конца предыдущей"""
+        result = self._decompressor.decompress(data)
+        while self.compression == 'gzip' and self._decompressor.eof and self._decompressor.unused_data:
+            data = self._decompressor.unused_data
+            self._decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            result += self._decompressor.decompress(data)
+        return result
+
+
+class Channel:
+    """Компактная запись о канале плейлиста
+
+    Использует __slots__ вместо словаря, что на плейлистах в сотни тысяч
+    каналов экономит сотни мегабайт. Повторяющиеся строки (категории,
+    логотипы) интернируются, пустые опции VLC не создаются.
+
+    Идентификатор id назначается PlaylistManager при добавлении канала
+    и совпадает с его позицией в PlaylistManager.channels.
+    """
+
+    __slots__ = ('id', 'name', 'category', 'tvg_id', 'tvg_logo', 'url', 'options')
+
+    def __init__(self, name, category=DEFAULT_CATEGORY, tvg_id='', tvg_logo='', url='', options=None):
+        self.id = -1
+        self.name = name
+        self.category = sys.intern(category)
+        self.tvg_id = tvg_id
+        self.tvg_logo = sys.intern(tvg_logo)
+        self.url = url
+        self.options = options  # Опции VLC (dict) или None
+
+    def __repr__(self):
+        return f"Channel({self.name!r}, category={self.category!r}, url={self.url!r})"
+
+    def to_record(self):
+        """Упаковывает канал в кортеж для бинарного кэша"""
+        return (self.name, self.category, self.tvg_id, self.tvg_logo, self.url, self.options)
+
+    @classmethod
+    def from_record(cls, record):
+        """Восстанавливает канал из кортежа бинарного кэша"""
+        return cls(*record)
+
+
+class M3UParser:
+    """Потоковый однопроходный парсер M3U
+
+    Принимает строки по одной и возвращает готовый канал, как только
+    встречается его URL. Весь файл в памяти не хранится, каждая строка
+    #EXTINF разбирается одним проходом предкомпилированного сканера.
+    Через feed() парсер также принимает произвольные порции байт, например
+    тело HTTP-ответа по мере загрузки.
+    """
+
+    def __init__(self):
+        self._channel = None
+        self._decoder = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self._tail = ''  # Неполная последняя строка из предыдущей порции байт
+
+    def feed(self, data):
+        """Обрабатывает очередную порцию байт плейлиста
+
+        Неполная последняя строка и незавершенный символ UTF-8 сохраняются
+        до следующей порции.
+
+        Returns:
+            list: Каналы, завершенные в этой порции
+        """
+        text = self._tail + self._decoder.decode(data)
+        # Переводы строк \r\n дают лишние пустые строки, которые пропускаются
+        lines = text.replace('\r', '\n').split('\n')
+        self._tail = lines.pop()
+
+        channels = []
+        for line in lines:
+            channel = self.feed_line(line)
+            if channel is not None:
+                channels.append(channel)
+        return channels
+
+    def finish(self):
+        """Завершает разбор порций байт
+
+        Returns:
+            list: Канал из последней строки, если она не заканчивалась переводом строки
+        """
+        tail = self._tail + self._decoder.decode(b'', final=True)
+        self._tail = ''
+        channel = self.feed_line(tail)
+        return [channel] if channel is not None else []
+
+    def feed_line(self, line):
+        """Обрабатывает очередную строку плейлиста
+
+        Returns:
+            Channel | None: Готовый канал или None, если канал еще не завершен
+        """
+        line = line.strip()
+        if not line:
+            return None
+
+        if line[0] == '#':
+            if line.startswith('#EXTINF:'):
+                self._channel = self._parse_extinf_line(line)
+            elif self._channel is not None:
+                if line.startswith('#EXTGRP:'):
+                    self._channel.category = sys.intern(line[len('#EXTGRP:'):].strip() or DEFAULT_CATEGORY)
+                elif line.startswith('#EXTVLCOPT:'):
+                    self._parse_vlc_option(line, self._channel)
+            return None
+
+        # Это URL канала
+        channel = self._channel
+        if channel is None:
+            return None
+
+        channel.url = line
+        self._channel = None
+        return channel
+
+    @staticmethod
+    def _parse_extinf_line(line):
+        """Парсит строку #EXTINF за один проход сканера"""
+        attrs = {}
+        name = None
+        for key, value, tail in EXTINF_SCANNER_RE.findall(line):
+            if key:
+                attrs[key] = value
+            else:
+                name = tail
+
+        if name is None:
+            return None
+
+        return Channel(
+            name.strip(),
+            attrs.get('group-title', '').strip() or DEFAULT_CATEGORY,
+            attrs.get('tvg-id', '').strip(),
+            attrs.get('tvg-logo', '').strip()
+        )
+
+    @staticmethod
+    def _parse_vlc_option(line, channel):
+        """Парсит опции VLC"""
+        opt = line[len('#EXTVLCOPT:'):].strip()
+        if 'http-user-agent=' in opt:
+            user_agent = opt.split('http-user-agent=')[1]
+            if channel.options is None:
+                channel.options = {}
+            channel.options['user-agent'] = user_agent
+
+
+class PlaylistCache:
+    """Бинарный кэш разобранных плейлистов
+
+    Хранит компактный снимок каналов плейлиста в каталоге cache/playlists.
+    Снимок считается актуальным, если совпадают размер и время изменения
+    файла, а при изменившемся времени - SHA-1 содержимого (например,
+    после повторного скачивания того же плейлиста).
+
+    Снимки файлов, которых больше нет (например, удаленных временных
+    плейлистов), удаляются при сохранении нового снимка; кроме того,
+    хранится не более PLAYLIST_CACHE_MAX_SNAPSHOTS последних снимков.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def load(self, file_path):
+        """Загружает каналы из снимка
+
+        Returns:
+            list | None: Список каналов или None, если снимка нет или он устарел
+        """
+        snapshot_path = self._get_snapshot_path(file_path)
+        if not os.path.exists(snapshot_path):
+            return None
+
+        try:
+            size, mtime_ns = self.get_file_signature(file_path)
+
+            with open(snapshot_path, 'rb') as f:
+                # Заголовок читается отдельно, чтобы не разбирать устаревшие данные
+                header_size, = HEADER_SIZE_STRUCT.unpack(f.read(HEADER_SIZE_STRUCT.size))
+                header = marshal.loads(f.read(header_size))
+                if header.get('version') != PLAYLIST_CACHE_VERSION or header.get('size') != size:
+                    return None
+
+                if header.get('mtime_ns') != mtime_ns:
+                    if header.get('sha1') != self._get_content_hash(file_path):
+                        return None
+                    stale_mtime = True
+                else:
+                    stale_mtime = False
+
+                # Сборщик мусора на время создания сотен тысяч объектов только мешает
+                gc_was_enabled = gc.isenabled()
+                gc.disable()
+                try:
+                    records = marshal.loads(f.read())
+                    channels = [Channel.from_record(record) for record in records]
+                finally:
+                    if gc_was_enabled:
+                        gc.enable()
+
+            # Содержимое не изменилось, но файл перезаписан - обновляем заголовок
+            if stale_mtime:
+                self._write(file_path, records, size, mtime_ns, header['sha1'])
+            else:
+                # Время изменения снимка - время последнего использования для prune()
+                os.utime(snapshot_path)
+
+            return channels
+        except Exception as e:
+            logging.warning(f"Не удалось прочитать кэш плейлиста {file_path}: {e}")
+            return None
+
+    def save(self, file_path, channels, signature):
+        """Сохраняет снимок каналов
+
+        Args:
+            file_path: Путь к исходному файлу плейлиста
+            channels: Разобранные каналы
+            signature: Размер и время изменения файла на момент начала разбора
+        """
+        try:
+            # Файл изменился во время разбора - снимок был бы некорректным
+            if self.get_file_signature(file_path) != signature:
+                return
+
+            records = [channel.to_record() for channel in channels]
+            size, mtime_ns = signature
+            self._write(file_path, records, size, mtime_ns, self._get_content_hash(file_path))
+        except Exception as e:
+            logging.warning(f"Не удалось сохранить кэш плейлиста {file_path}: {e}")
+            return
+
+        self.prune()
+
+    def prune(self, max_snapshots=PLAYLIST_CACHE_MAX_SNAPSHOTS):
+        """Удаляет снимки удаленных плейлистов и лишние старые снимки
+
+        Args:
+            max_snapshots: Сколько последних использованных снимков оставить
+        """
+        try:
+            snapshots = []
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.bin'):
+                        continue
+                    # Снимок без пути к файлу (старого формата) проверить нельзя
+                    source_path = self._read_header(entry.path).get('path')
+                    if source_path and os.path.exists(source_path):
+                        snapshots.append((entry.stat().st_mtime, entry.path))
+                    else:
+                        self._remove_snapshot(entry.path)
+
+            snapshots.sort(reverse=True)
+            for _, snapshot_path in snapshots[max_snapshots:]:
+                self._remove_snapshot(snapshot_path)
+        except OSError as e:
+            logging.warning(f"Не удалось очистить кэш плейлистов: {e}")
+
+    @staticmethod
+    def _read_header(snapshot_path):
+        """Читает заголовок снимка, при ошибке возвращает пустой словарь"""
+        try:
+            with open(snapshot_path, 'rb') as f:
+                header_size, = HEADER_SIZE_STRUCT.unpack(f.read(HEADER_SIZE_STRUCT.size))
+                header = marshal.loads(f.read(header_size))
+            return header if isinstance(header, dict) else {}
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _remove_snapshot(snapshot_path):
+        """Удаляет файл снимка"""
+        try:
+            os.remove(snapshot_path)
+            logging.debug(f"Удален снимок плейлиста {snapshot_path}")
+        except OSError as e:
+            logging.warning(f"Не удалось удалить снимок плейлиста {snapshot_path}: {e}")
+
+    def _write(self, file_path, records, size, mtime_ns, sha1):
+        """Атомарно записывает снимок на диск"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        snapshot_path = self._get_snapshot_path(file_path)
+        temp_path = f"{snapshot_path}.tmp"
+
+        header = {
+            'version': PLAYLIST_CACHE_VERSION,
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'sha1': sha1,
+            'path': os.path.abspath(file_path),
+        }
+        header_data = marshal.dumps(header)
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER_SIZE_STRUCT.pack(len(header_data)))
+            f.write(header_data)
+            f.write(marshal.dumps(records))
+        os.replace(temp_path, snapshot_path)
+
+    def _get_snapshot_path(self, file_path):
+        """Возвращает путь к снимку для файла плейлиста"""
+        key = hashlib.md5(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key + '.bin')
+
+    @staticmethod
+    def get_file_signature(file_path):
+        """Возвращает размер и время изменения файла"""
+        stat = os.stat(file_path)
+        return stat.st_size, stat.st_mtime_ns
+
+    @staticmethod
+    def _get_content_hash(file_path):
+        """Вычисляет SHA-1 содержимого файла"""
+        sha1 = hashlib.sha1()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha1.update(chunk)
+        return sha1.hexdigest()
+
+
+class ChannelSearchIndex:
+    """Поисковый индекс по названиям каналов
+
+    Хранит названия в casefold и триграммный индекс: для каждой триграммы -
+    список идентификаторов каналов по возрастанию. Запрос из нескольких слов
+    находит каналы, в названии которых встречаются все слова.
+    """
+
+    def __init__(self):
+        self._names = []
+        self._postings = defaultdict(list)
+
+    def __len__(self):
+        return len(self._names)
+
+    def add(self, name):
+        """Добавляет название следующего канала
+
+        Идентификатор канала - порядковый номер добавления, он совпадает
+        с идентификатором, который назначает PlaylistManager.add_channel.
+        """
+        channel_id = len(self._names)
+        folded = name.casefold()
+        self._names.append(folded)
+
+        postings = self._postings
+        for trigram in {folded[i:i + 3] for i in range(len(folded) - 2)}:
+            postings[trigram].append(channel_id)
+
+    def search(self, text, is_cancelled=None):
+        """Возвращает идентификаторы подходящих каналов по возрастанию
+
+        Args:
+            text: Поисковый запрос
+            is_cancelled: Функция без аргументов; если она вернула True
+                между этапами поиска, поиск прерывается и возвращается None
+        """
+        terms = text.casefold().split()
+        names = self._names
+        if not terms:
+            return list(range(len(names)))
+
+        # Кандидаты - самый короткий список среди триграмм всех слов запроса
+        candidates = None
+        for term in terms:
+            for i in range(len(term) - 2):
+                posting = self._postings.get(term[i:i + 3])
+                if posting is None:
+                    return []
+                if candidates is None or len(posting) < len(candidates):
+                    candidates = posting
+
+        # Слова короче трех символов не попадают в индекс
+        if candidates is None:
+            candidates = range(len(names))
+
+        # Проверяем вхождение слов, начиная с самых длинных (они отсекают больше)
+        for term in sorted(terms, key=len, reverse=True):
+            if is_cancelled is not None and is_cancelled():
+                return None
+            candidates = [channel_id for channel_id in candidates if term in names[channel_id]]
+        return candidates
+
+
+class PlaylistDiff:
+    """Изменения плейлиста между двумя загрузками
+
+    Каналы сопоставляются по tvg-id, а при его отсутствии - по названию и URL.
+    Канал, у которого сменились название или категория, считается удаленным
+    и добавленным заново, поэтому измененные каналы остаются на своих местах
+    в представлении.
+    """
+
+    def __init__(self):
+        self.added = []     # Новые каналы
+        self.removed = []   # Исчезнувшие каналы (со старыми идентификаторами)
+        self.changed = []   # Сохранившиеся каналы с изменившимися данными
+        self.id_map = {}    # Старый идентификатор -> новый для сохранившихся каналов
+
+    def is_empty(self):
+        """Проверяет, что плейлист не изменился, включая порядок каналов"""
+        return (not self.added and not self.removed and not self.changed and
+                all(old_id == new_id for old_id, new_id in self.id_map.items()))
+
+    def __repr__(self):
+        return (f"PlaylistDiff(added={len(self.added)}, removed={len(self.removed)}, "
+                f"changed={len(self.changed)})")
+
+
 class PlaylistManager:
     """Менеджер для управления плейлистами
 
@@ -18,10 +573,18 @@ class PlaylistManager:
     Реализует принцип единственной ответственности (SRP).
     """
 
-    def __init__(self):
+    def __init__(self, cache_dir=None):
         self.channels = []
         self.categories = {"Все каналы": []}
         self.category_icons = {}
+        self.search_index = None
+        self._display_rank = None
+        self._ids_by_name = {}
+
+        # Бинарный кэш разобранных плейлистов
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'playlists')
+        self.cache = PlaylistCache(cache_dir)
         self._init_category_icons()
 
     def _init_category_icons(self):
@@ -49,86 +612,123 @@ class PlaylistManager:
             raise FileNotFoundError(f"Плейлист {file_path} не найден!")
 
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-
-            self.channels = []
-            self.categories = {"Все каналы": []}
-
-            channel = None
-            current_group = "Без категории"
-
-            for line in lines:
-                line = line.strip()
-                if not line or line.startswith('#EXTM3U'):
-                    continue
-                elif line.startswith('#EXTINF:'):
-                    channel = self._parse_extinf_line(line)
-                elif line.startswith('#EXTGRP:'):
-                    current_group = self._parse_extgrp_line(line)
-                    if channel and 'name' in channel:
-                        channel['category'] = current_group
-                        self._ensure_category_exists(current_group)
-                elif line.startswith('#EXTVLCOPT:'):
-                    if channel:
-                        self._parse_vlc_option(line, channel)
-                elif channel and 'name' in channel and not line.startswith('#'):
-                    # Это URL канала
-                    channel['url'] = line
-                    self.channels.append(channel)
+            self.clear()
+            search_index = ChannelSearchIndex()
 
-                    # Добавляем канал в соответствующую категорию
-                    category = channel['category']
-                    self.categories[category].append(channel)
-                    self.categories["Все каналы"].append(channel)
+            for channel in self.iter_playlist(file_path):
+                self.add_channel(channel)
+                search_index.add(channel.name)
 
-                    channel = None
-                    current_group = "Без категории"
+            self.set_search_index(search_index)
 
         except Exception as e:
             raise Exception(f"Ошибка при чтении плейлиста: {str(e)}")
 
-    def _parse_extinf_line(self, line):
-        """Парсит строку #EXTINF"""
-        # Извлекаем группу
-        group_match = re.search(r'group-title="([^"]*)"', line)
-        group_title = group_match.group(1).strip() if group_match else "Без категории"
-        if not group_title:
-            group_title = "Без категории"
-
-        # Извлекаем tvg-id
-        tvg_id_match = re.search(r'tvg-id="([^"]*)"', line)
-        tvg_id = tvg_id_match.group(1).strip() if tvg_id_match else ""
-
-        # Извлекаем tvg-logo
-        tvg_logo_match = re.search(r'tvg-logo="([^"]*)"', line)
-        tvg_logo = tvg_logo_match.group(1).strip() if tvg_logo_match else ""
-
-        # Извлекаем имя канала
-        parts = line.split(',', 1)
-        if len(parts) > 1:
-            channel = {
-                'name': parts[1].strip(),
-                'options': {},
-                'category': group_title,
-                'tvg_id': tvg_id,
-                'tvg_logo': tvg_logo
-            }
-            self._ensure_category_exists(group_title)
-            return channel
-        return None
+    def iter_playlist(self, file_path):
+        """Лениво читает файл плейлиста и возвращает каналы по мере разбора
 
-    def _parse_extgrp_line(self, line):
-        """Парсит строку #EXTGRP"""
-        group = line[len('#EXTGRP:'):].strip()
-        return group if group else "Без категории"
+        Файл читается построчно (сжатые gzip, xz и zip распаковываются
+        на лету), поэтому потребление памяти не зависит от размера файла.
+        Если в кэше есть актуальный снимок плейлиста,
+        каналы берутся из него без разбора текста. Состояние менеджера
+        не изменяется.
+        """
+        cached_channels = self.cache.load(file_path)
+        if cached_channels is not None:
+            yield from cached_channels
+            return
 
-    def _parse_vlc_option(self, line, channel):
-        """Парсит опции VLC"""
-        opt = line[len('#EXTVLCOPT:'):].strip()
-        if 'http-user-agent=' in opt:
-            user_agent = opt.split('http-user-agent=')[1]
-            channel['options']['user-agent'] = user_agent
+        signature = PlaylistCache.get_file_signature(file_path)
+        parsed_channels = []
+
+        parser = M3UParser()
+        with open_playlist_file(file_path) as f:
+            for line in f:
+                channel = parser.feed_line(line)
+                if channel is not None:
+                    parsed_channels.append(channel)
+                    yield channel
+
+        # Сохраняем снимок только после полного разбора файла
+        self.cache.save(file_path, parsed_channels, signature)
+
+    def clear(self):
+        """Очищает текущий список каналов и категорий"""
+        self.channels = []
+        self.categories = {"Все каналы": []}
+        self.search_index = None
+        self._display_rank = None
+        self._ids_by_name = {}
+
+    def add_channel(self, channel):
+        """Добавляет разобранный канал в список и в его категорию
+
+        Каналу назначается стабильный идентификатор - его позиция
+        в self.channels, по которому канал находится за O(1).
+        """
+        category = channel.category
+        self._ensure_category_exists(category)
+
+        channel.id = len(self.channels)
+        self.channels.append(channel)
+        self._ids_by_name.setdefault(channel.name, []).append(channel.id)
+        self.categories[category].append(channel)
+        self.categories["Все каналы"].append(channel)
+
+    def merge_channels(self, channels, search_index=None):
+        """Заменяет каналы новой версией плейлиста и возвращает изменения
+
+        Каналы получают новые идентификаторы по порядку в новом плейлисте,
+        порядок сортировки по алфавиту сохраняется. Возвращаемый PlaylistDiff
+        позволяет обновить представления, не перестраивая их целиком.
+
+        Args:
+            channels: Каналы новой версии плейлиста
+            search_index: Поисковый индекс, построенный для этих каналов
+
+        Returns:
+            PlaylistDiff: Изменения относительно прежних каналов
+        """
+        old_by_key = defaultdict(deque)
+        for channel in self.channels:
+            old_by_key[self.get_channel_key(channel)].append(channel)
+        was_sorted = self._display_rank is not None
+
+        diff = PlaylistDiff()
+        self.clear()
+        for channel in channels:
+            self.add_channel(channel)
+
+            # Повторяющиеся ключи сопоставляются по порядку следования
+            matches = old_by_key.get(self.get_channel_key(channel))
+            old_channel = matches.popleft() if matches else None
+            if old_channel is None:
+                diff.added.append(channel)
+            elif old_channel.name != channel.name or old_channel.category != channel.category:
+                diff.removed.append(old_channel)
+                diff.added.append(channel)
+            else:
+                diff.id_map[old_channel.id] = channel.id
+                if old_channel.to_record() != channel.to_record():
+                    diff.changed.append(channel)
+
+        for matches in old_by_key.values():
+            diff.removed.extend(matches)
+
+        if was_sorted:
+            self.sort_channels_alphabetically()
+        self.set_search_index(search_index)
+        return diff
+
+    @staticmethod
+    def get_channel_key(channel):
+        """Возвращает ключ для сопоставления канала между версиями плейлиста"""
+        return channel.tvg_id or (channel.name, channel.url)
+
+    def get_display_position(self, channel_id):
+        """Возвращает позицию канала в порядке отображения (как в списке "Все каналы")"""
+        display_rank = self._display_rank
+        return display_rank[channel_id] if display_rank is not None else channel_id
 
     def _ensure_category_exists(self, category):
         """Убеждается, что категория существует"""
@@ -143,14 +743,92 @@ class PlaylistManager:
         """Возвращает словарь категорий"""
         return self.categories
 
-    def get_channel_by_index(self, index):
-        """Возвращает канал по индексу"""
-        if 0 <= index < len(self.channels):
-            return self.channels[index]
+    def get_channel(self, channel_id):
+        """Возвращает канал по идентификатору"""
+        if channel_id is not None and 0 <= channel_id < len(self.channels):
+            return self.channels[channel_id]
         return None
 
+    def get_channels_by_ids(self, channel_ids):
+        """Возвращает каналы по списку идентификаторов"""
+        channels = self.channels
+        return [channels[channel_id] for channel_id in channel_ids]
+
+    def set_search_index(self, search_index):
+        """Устанавливает поисковый индекс, построенный для текущих каналов"""
+        self.search_index = search_index
+
+    def search_channels(self, text, category="Все каналы", hidden_names=None, is_cancelled=None):
+        """Ищет каналы, в названии которых есть все слова запроса
+
+        Пока поисковый индекс не построен (плейлист еще загружается),
+        выполняется линейный поиск. Метод только читает данные менеджера,
+        поэтому может вызываться из потока поиска.
+
+        Args:
+            text: Поисковый запрос
+            category: Категория, в которой выполняется поиск
+            hidden_names: Названия каналов, которые нужно исключить
+            is_cancelled: Функция для проверки отмены запроса
+
+        Returns:
+            list | None: Идентификаторы каналов в порядке отображения
+                или None, если запрос отменен
+        """
+        channels = self.channels
+        search_index = self.search_index
+        if search_index is not None and len(search_index) == len(channels):
+            channel_ids = search_index.search(text, is_cancelled)
+            if channel_ids is None:
+                return None
+        else:
+            terms = text.casefold().split()
+            channel_ids = [channel.id for channel in channels
+                           if all(term in channel.name.casefold() for term in terms)]
+
+        if category != "Все каналы":
+            category_ids = {channel.id for channel in self.categories.get(category, [])}
+            channel_ids = [channel_id for channel_id in channel_ids if channel_id in category_ids]
+
+        if hidden_names:
+            channel_ids = [channel_id for channel_id in channel_ids
+                           if channels[channel_id].name not in hidden_names]
+
+        return self._sort_for_display(channel_ids)
+
+    def get_channel_ids_by_names(self, names):
+        """Возвращает идентификаторы каналов с указанными названиями
+
+        Время работы пропорционально числу найденных каналов, а не размеру
+        плейлиста. Каналы возвращаются в порядке списка "Все каналы".
+        """
+        ids_by_name = self._ids_by_name
+        channel_ids = []
+        for name in names:
+            channel_ids.extend(ids_by_name.get(name, ()))
+        channel_ids.sort()
+        return self._sort_for_display(channel_ids)
+
+    def _sort_for_display(self, channel_ids):
+        """Упорядочивает идентификаторы по возрастанию как список "Все каналы"
+
+        После сортировки по алфавиту порядок отображения отличается
+        от порядка идентификаторов.
+        """
+        display_rank = self._display_rank
+        if display_rank is not None:
+            channel_ids.sort(key=display_rank.__getitem__)
+        return channel_ids
+
     def sort_channels_alphabetically(self):
-        """Сортирует каналы по алфавиту"""
+        """Сортирует каналы по алфавиту
+
+        Сортируются списки категорий (включая "Все каналы"), сам self.channels
+        остается упорядоченным по идентификаторам.
+        """
         for category in self.categories:
-            self.categories[category].sort(key=lambda x: x['name'])
-        self.channels.sort(key=lambda x: x['name'])
+            self.categories[category].sort(key=attrgetter('name'))
+
+        self._display_rank = [0] * len(self.channels)
+        for position, channel in enumerate(self.categories["Все каналы"]):
+            self._display_rank[channel.id] = position
@@ -0,0 +1,49 @@
+"""
+Тесты разбора строк #EXTINF в M3UParser
+
+Запуск: python -m unittest discover tests (или python -m pytest tests)
+"""
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playlist import DEFAULT_CATEGORY, M3UParser  # noqa: E402
+
+
+def parse(text):
+    """Разбирает текст плейлиста и возвращает список каналов"""
+    parser = M3UParser()
+    return parser.feed(text.encode('utf-8')) + parser.finish()
+
+
+class ExtinfParsingTest(unittest.TestCase):
+    """Атрибуты и имя канала в строке #EXTINF"""
+
+    def test_adjacent_attributes(self):
+        channels = parse('#EXTM3U\n#EXTINF:-1 tvg-id="a"group-title="News",Chan\nhttp://example/1\n')
+        self.assertEqual(len(channels), 1)
+        self.assertEqual(channels[0].tvg_id, 'a')
+        self.assertEqual(channels[0].category, 'News')
+        self.assertEqual(channels[0].name, 'Chan')
+
+    def test_commas_inside_quoted_values(self):
+        channels = parse('#EXTINF:-1 tvg-id="a,b" tvg-logo="http://logo/x,y.png" group-title="Кино, сериалы",'
+                         'Канал, HD\nhttp://example/2\n')
+        self.assertEqual(len(channels), 1)
+        self.assertEqual(channels[0].tvg_id, 'a,b')
+        self.assertEqual(channels[0].tvg_logo, 'http://logo/x,y.png')
+        self.assertEqual(channels[0].category, 'Кино, сериалы')
+        self.assertEqual(channels[0].name, 'Канал, HD')
+
+    def test_without_attributes(self):
+        channels = parse('#EXTINF:-1,Простой канал\nhttp://example/3\n')
+        self.assertEqual(channels[0].name, 'Простой канал')
+        self.assertEqual(channels[0].category, DEFAULT_CATEGORY)
+        self.assertEqual(channels[0].url, 'http://example/3')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Тесты бинарного кэша плейлистов PlaylistCache
+
+Запуск: python -m unittest discover tests (или python -m pytest tests)
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playlist import M3UParser, PlaylistCache  # noqa: E402
+
+
+class PlaylistCacheTest(unittest.TestCase):
+    """Сохранение, загрузка и очистка снимков"""
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+        self.cache = PlaylistCache(os.path.join(self.work_dir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def make_playlist(self, name, channel_name='Канал'):
+        """Создает файл плейлиста и сохраняет его снимок"""
+        path = os.path.join(self.work_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(f'#EXTM3U\n#EXTINF:-1 group-title="News",{channel_name}\nhttp://example/{name}\n')
+        parser = M3UParser()
+        with open(path, 'rb') as f:
+            channels = parser.feed(f.read()) + parser.finish()
+        self.cache.save(path, channels, PlaylistCache.get_file_signature(path))
+        return path
+
+    def snapshot_count(self):
+        return len([name for name in os.listdir(self.cache.cache_dir) if name.endswith('.bin')])
+
+    def test_load_saved_snapshot(self):
+        path = self.make_playlist('local.m3u', 'Первый')
+        channels = self.cache.load(path)
+        self.assertEqual([channel.name for channel in channels], ['Первый'])
+
+    def test_prune_removes_snapshots_of_deleted_files(self):
+        temp_path = self.make_playlist('temp_playlist_1.m3u')
+        self.make_playlist('local.m3u')
+        os.remove(temp_path)
+
+        self.cache.prune()
+        self.assertEqual(self.snapshot_count(), 1)
+        self.assertIsNotNone(self.cache.load(os.path.join(self.work_dir, 'local.m3u')))
+
+    def test_prune_keeps_recently_used_snapshots(self):
+        paths = [self.make_playlist(f'playlist_{i}.m3u') for i in range(4)]
+        for i, path in enumerate(paths):
+            snapshot_path = self.cache._get_snapshot_path(path)
+            os.utime(snapshot_path, (1000 + i, 1000 + i))
+        # Загрузка отмечает снимок как использованный
+        self.cache.load(paths[0])
+
+        self.cache.prune(max_snapshots=2)
+        kept = [path for path in paths if os.path.exists(self.cache._get_snapshot_path(path))]
+        self.assertEqual(kept, [paths[0], paths[3]])
+
+
+if __name__ == '__main__':
+    unittest.main()
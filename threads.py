@@ -4,27 +4,44 @@
 
 Содержит все классы потоков для асинхронных операций:
 - ThreadManager - централизованное управление потоками
+- FileDownloadThread - базовый поток загрузки файла с условными запросами и докачкой
 - DownloadThread - загрузка файлов
 - ChannelPlayThread - подготовка медиа для воспроизведения
 - PlaylistDownloadThread - загрузка плейлистов
-- LogoDownloadThread - загрузка логотипов каналов
+- PlaylistParseThread - фоновый разбор плейлистов с выдачей каналов порциями
+- ChannelSearchThread - асинхронный поиск каналов с отменой устаревших запросов
+- LogoFetchService - пул загрузки логотипов каналов с общей очередью
+- LogoDownloadThread - рабочий поток пула загрузки логотипов
+- LogoCacheMaintenanceThread - фоновое обслуживание дискового кэша логотипов
+- LogoRevalidationThread - проверка актуальности кэшированных логотипов
 
 Все потоки поддерживают прерывание и корректное завершение.
 """
 
+import os
+import re
 import logging
-import socket
-import urllib.request
-import urllib.error
+import time
+import random
 import hashlib
 import requests
-from typing import Optional, Dict, Any
-from threading import Lock
+from urllib3.exceptions import ReadTimeoutError
+from typing import Callable, Dict, Optional
+from threading import Lock, Condition
 from concurrent.futures import ThreadPoolExecutor
 
-from PyQt5.QtCore import QThread, pyqtSignal
-from PyQt5.QtGui import QPixmap, QPainter
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import QObject, QThread, pyqtSignal
+from PyQt5.QtGui import QImage
+from PyQt5.QtCore import Qt, QBuffer, QByteArray, QIODevice
+
+from constants import (
+    PLAYLIST_PARSE_BATCH_SIZE, MAX_CONCURRENT_DOWNLOADS, LOGO_QUEUE_SIZE, LOGO_PRIORITY_BACKGROUND,
+    LOGO_SIZE, LOGO_REVALIDATE_AFTER, LOGO_REVALIDATE_BATCH, DOWNLOAD_CHUNK_SIZE, PLAYLIST_SIGNATURE_BYTES,
+    MAX_RETRY_COUNT, DOWNLOAD_CONNECT_TIMEOUT, DOWNLOAD_READ_TIMEOUT, DOWNLOAD_RETRY_DELAY,
+    DOWNLOAD_RETRY_MAX_DELAY, DOWNLOAD_RETRY_STATUSES
+)
+from playlist import ChannelSearchIndex, M3UParser, PlaylistCache, PlaylistDecompressor, open_playlist_file
+from http_client import HttpClient
 
 
 class ThreadManager:
@@ -136,14 +153,389 @@ class BaseThread(QThread):
         return self._abort
 
 
-class DownloadThread(BaseThread):
-    """Поток для загрузки файлов по URL с поддержкой прерывания"""
-    finished = pyqtSignal(bool, str)
+def is_playlist_head(head: bytes) -> bool:
+    """Проверяет по началу файла, похож ли он на плейлист IPTV"""
+    return b'#EXTM3U' in head or b'#EXTINF' in head
+
+
+class DownloadError(Exception):
+    """Загрузка не удалась после всех повторных попыток"""
+
+
+def describe_download_error(error: Exception) -> str:
+    """Возвращает понятное пользователю описание ошибки загрузки"""
+    if isinstance(error, requests.HTTPError) and error.response is not None:
+        return f"Ошибка HTTP: {error.response.status_code} {error.response.reason}"
+    if isinstance(error, requests.ConnectTimeout):
+        return "Превышено время ожидания соединения"
+    if isinstance(error, requests.Timeout):
+        return "Превышено время ожидания"
+    if isinstance(error, requests.exceptions.ChunkedEncodingError):
+        return "Соединение оборвалось во время загрузки"
+    if isinstance(error, requests.ConnectionError):
+        # Истечение времени чтения тела ответа requests сообщает как ошибку соединения
+        if error.args and isinstance(error.args[0], ReadTimeoutError):
+            return "Превышено время ожидания"
+        if error.args and isinstance(error.args[0], str):
+            return error.args[0]
+        return "Нет соединения с сервером"
+    return str(error)
+
+
+def get_if_range(response) -> Optional[str]:
+    """Возвращает значение If-Range для докачки файла из этого ответа
+
+    Докачка возможна, если сервер принимает Range в байтах, тело передается
+    без сжатия на уровне HTTP (иначе смещения распакованных данных не
+    совпадают с Range) и есть сильный ETag или Last-Modified, по которому
+    сервер отличит прежнюю версию файла от новой.
+
+    Returns:
+        str | None: ETag, Last-Modified или None, если докачка невозможна
+    """
+    if response.headers.get('Accept-Ranges', '').lower() != 'bytes':
+        return None
+    if response.headers.get('Content-Encoding', 'identity').lower() != 'identity':
+        return None
+    etag = response.headers.get('ETag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return response.headers.get('Last-Modified')
+
+
+def get_range_start(response) -> Optional[int]:
+    """Возвращает начальную позицию фрагмента из Content-Range ответа 206"""
+    match = re.match(r'bytes\s+(\d+)-', response.headers.get('Content-Range', ''))
+    return int(match.group(1)) if match else None
+
+
+class PartialDownload:
+    """Загрузка файла во временный файл, продолжаемая после обрыва соединения
+
+    Данные пишутся крупными порциями во временный файл рядом с целевым,
+    который переименовывается в целевой только после полной загрузки,
+    поэтому прерванная загрузка не портит прежнюю версию файла.
+
+    Тело файла может прийти несколькими ответами: ответ 206 на запрос с
+    Range дописывается с места обрыва, а в полном ответе 200 уже
+    полученная часть сверяется с временным файлом и пропускается. Хэш,
+    проверка начала, распаковка и on_chunk поэтому видят каждый байт
+    ровно один раз.
+
+    Сжатый файл (например, .m3u.gz) сохраняется как есть, а с decompressor
+    проверка начала и on_chunk получают уже распакованные данные. Если
+    формат нельзя распаковывать порциями (zip), начало проверяется по
+    загруженному файлу.
+    """
+
+    def __init__(self, file_path: str, is_aborted: Callable[[], bool],
+                 on_progress: Optional[Callable[[int, int], None]] = None,
+                 check_head: Optional[Callable[[bytes], bool]] = None,
+                 on_chunk: Optional[Callable[[bytes], None]] = None,
+                 decompressor: Optional[PlaylistDecompressor] = None):
+        """
+        Args:
+            file_path: Путь к целевому файлу
+            is_aborted: Функция, сообщающая о прерывании загрузки
+            on_progress: Функция (получено байт, всего байт или 0), вызываемая после каждой порции
+            check_head: Проверка первых PLAYLIST_SIGNATURE_BYTES байт содержимого
+            on_chunk: Функция, получающая каждую записанную порцию данных
+            decompressor: Распаковщик содержимого для check_head и on_chunk
+        """
+        self.file_path = file_path
+        self.temp_path = f"{file_path}.part"
+        self.is_aborted = is_aborted
+        self.on_progress = on_progress
+        self.check_head = check_head
+        self.on_chunk = on_chunk
+        self.decompressor = decompressor
+        self.received = 0  # Байт содержимого во временном файле
+        self._head = bytearray() if check_head else None
+        self._sha1 = hashlib.sha1()
+        self._file = open(self.temp_path, 'w+b')
+
+    def write(self, response) -> bool:
+        """Записывает тело очередного ответа
+
+        Ответ 206 должен продолжать содержимое с позиции received,
+        остальные ответы передают содержимое с начала.
+
+        Returns:
+            bool: False, если загрузка прервана
+
+        Raises:
+            ValueError: Если начало содержимого не прошло проверку или
+                повторно полученная часть не совпала с уже загруженной
+            requests.ConnectionError: Если соединение закрыто раньше конца тела
+        """
+        offset = self.received if response.status_code == 206 else 0
+        length = int(response.headers.get('Content-Length') or 0)
+        total = offset + length if length else 0
+        # При сжатии на уровне HTTP Content-Length задает размер сжатых данных,
+        # поэтому прогресс считается по байтам, прочитанным из соединения
+        raw_tell = getattr(response.raw, 'tell', None)
+        position = offset
+
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+            if self.is_aborted():
+                return False
+
+            if position < self.received:
+                # Уже загруженная часть пришла повторно
+                skip = min(len(chunk), self.received - position)
+                if not self._matches(position, chunk[:skip]):
+                    raise ValueError("Файл на сервере изменился во время загрузки")
+                position += skip
+                chunk = chunk[skip:]
+
+            if chunk:
+                self._append(chunk)
+                position += len(chunk)
+            if self.on_progress:
+                self.on_progress(offset + raw_tell() if raw_tell else position, total)
+
+        if self.is_aborted():
+            return False
+        encoded = response.headers.get('Content-Encoding', 'identity').lower() != 'identity'
+        if total and not encoded and position < total:
+            raise requests.ConnectionError("Соединение закрыто до окончания передачи")
+        if position < self.received:
+            raise ValueError("Файл на сервере изменился во время загрузки")
+        return True
 
-    def __init__(self, url: str, file_path: str):
+    def finish(self, unchanged_hash: Optional[str] = None, backup_path: Optional[str] = None) -> str:
+        """Завершает загрузку и заменяет целевой файл временным
+
+        Args:
+            unchanged_hash: SHA-1 текущего содержимого файла; при совпадении файл не перезаписывается
+            backup_path: Куда переместить прежнюю версию файла перед заменой
+
+        Returns:
+            str: SHA-1 загруженного содержимого
+
+        Raises:
+            ValueError: Если начало содержимого не прошло проверку
+        """
+        try:
+            self._file.close()
+            if self.decompressor:
+                self._consume(self.decompressor.flush())
+                if self._head is not None and not self.decompressor.streamable:
+                    with open_playlist_file(self.temp_path) as f:
+                        self._head = bytearray(f.read(PLAYLIST_SIGNATURE_BYTES).encode('utf-8'))
+            # Файл короче проверяемого размера
+            if self._head is not None and not self.check_head(bytes(self._head)):
+                raise ValueError("Скачанный файл не является плейлистом IPTV")
+
+            content_hash = self._sha1.hexdigest()
+            if content_hash == unchanged_hash and os.path.exists(self.file_path):
+                return content_hash
+
+            if backup_path and os.path.exists(self.file_path):
+                os.replace(self.file_path, backup_path)
+            os.replace(self.temp_path, self.file_path)
+            return content_hash
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        """Удаляет временный файл"""
+        self._file.close()
+        if os.path.exists(self.temp_path):
+            try:
+                os.remove(self.temp_path)
+            except OSError as e:
+                logging.warning(f"Не удалось удалить временный файл {self.temp_path}: {e}")
+
+    def _append(self, chunk: bytes) -> None:
+        """Обрабатывает и дописывает новую порцию содержимого"""
+        self._consume(self.decompressor.decompress(chunk) if self.decompressor else chunk)
+        self._file.write(chunk)
+        self._sha1.update(chunk)
+        self.received += len(chunk)
+
+    def _consume(self, data: bytes) -> None:
+        """Проверяет начало содержимого и передает данные в on_chunk"""
+        if self._head is not None:
+            self._head += data[:PLAYLIST_SIGNATURE_BYTES - len(self._head)]
+            if len(self._head) >= PLAYLIST_SIGNATURE_BYTES:
+                if not self.check_head(bytes(self._head)):
+                    raise ValueError("Скачанный файл не является плейлистом IPTV")
+                self._head = None
+        if self.on_chunk and data:
+            self.on_chunk(data)
+
+    def _matches(self, position: int, data: bytes) -> bool:
+        """Сравнивает данные с уже записанной частью временного файла"""
+        self._file.seek(position)
+        same = self._file.read(len(data)) == data
+        self._file.seek(0, os.SEEK_END)
+        return same
+
+
+class FileDownloadThread(BaseThread):
+    """Базовый поток загрузки файла с условными запросами
+
+    Если известны данные прошлой загрузки (ETag, Last-Modified, SHA-1
+    содержимого), запрос отправляется с If-None-Match/If-Modified-Since.
+    Сбои сети и временные ошибки сервера повторяются с докачкой файла.
+    После завершения атрибут not_modified сообщает, что содержимое не
+    изменилось (ответ 304 или тот же SHA-1), а validators содержит данные
+    для следующего запроса.
+
+    Если содержимое проверяется или разбирается при загрузке, сжатый
+    файл распаковывается на лету распаковщиком decompressor.
+    """
+    progress = pyqtSignal('qint64', 'qint64')  # Получено байт, всего байт (0 - неизвестно)
+
+    def __init__(self, url: str, file_path: str, validators: Optional[Dict[str, str]] = None,
+                 backup_path: Optional[str] = None):
+        """
+        Args:
+            url: Адрес файла
+            file_path: Путь для сохранения
+            validators: Данные прошлой загрузки этого файла: etag, last_modified, sha1
+            backup_path: Куда переместить прежнюю версию файла при замене
+        """
         super().__init__()
         self.url = url
         self.file_path = file_path
+        self.backup_path = backup_path
+        self.previous_validators = validators or {}
+        self.validators = {}
+        self.not_modified = False
+        self.decompressor = None
+
+    def _download(self, check_head: Optional[Callable[[bytes], bool]] = None,
+                  on_chunk: Optional[Callable[[bytes], None]] = None) -> bool:
+        """Загружает файл, если он изменился
+
+        Обрыв соединения, превышение времени ожидания и временные ошибки
+        сервера (DOWNLOAD_RETRY_STATUSES) приводят к повторной попытке после
+        паузы, растущей экспоненциально со случайным разбросом. Если сервер
+        поддерживает Range, загрузка продолжается с места обрыва. Попытка,
+        продвинувшая загрузку, сбрасывает счетчик повторов.
+
+        Returns:
+            bool: False, если загрузка прервана
+
+        Raises:
+            DownloadError: Если файл не удалось загрузить за MAX_RETRY_COUNT повторов
+        """
+        # Без хэша прежнего содержимого ответ 304 нечем было бы подтвердить
+        previous = self.previous_validators if self.previous_validators.get('sha1') else {}
+        conditional_headers = {}
+        if previous.get('etag'):
+            conditional_headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            conditional_headers['If-Modified-Since'] = previous['last_modified']
+
+        if check_head or on_chunk:
+            self.decompressor = PlaylistDecompressor()
+        # Пишем данные на диск порциями с возможностью прерывания
+        download = PartialDownload(self.file_path, self.is_aborted, self.progress.emit,
+                                   check_head=check_head, on_chunk=on_chunk, decompressor=self.decompressor)
+        validators = None  # ETag и Last-Modified первого ответа с содержимым
+        if_range = None  # Значение If-Range для докачки или None, если докачка невозможна
+        attempts = failures = 0
+
+        try:
+            while True:
+                attempts += 1
+                received = download.received
+                if validators is None:
+                    headers = conditional_headers
+                elif if_range and received:
+                    headers = {'Range': f"bytes={received}-", 'If-Range': if_range}
+                else:
+                    headers = {}
+
+                try:
+                    with HttpClient.shared().get(self.url, timeout=(DOWNLOAD_CONNECT_TIMEOUT, DOWNLOAD_READ_TIMEOUT),
+                                                 stream=True, headers=headers or None) as response:
+                        if response.status_code == 304 and previous and validators is None:
+                            self.not_modified = True
+                            self.validators = {
+                                'etag': response.headers.get('ETag') or previous.get('etag'),
+                                'last_modified': response.headers.get('Last-Modified') or previous.get('last_modified'),
+                                'sha1': previous['sha1'],
+                            }
+                            return True
+
+                        response.raise_for_status()
+                        if response.status_code == 206 and get_range_start(response) != received:
+                            raise ValueError("Сервер вернул не тот фрагмент файла")
+
+                        if validators is None:
+                            validators = {
+                                'etag': response.headers.get('ETag'),
+                                'last_modified': response.headers.get('Last-Modified'),
+                            }
+                            if_range = get_if_range(response)
+
+                        if not download.write(response):
+                            return False
+                    break
+
+                except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError,
+                        requests.HTTPError) as e:
+                    if self.is_aborted():
+                        return False
+                    if isinstance(e, requests.HTTPError) and e.response.status_code not in DOWNLOAD_RETRY_STATUSES:
+                        raise
+
+                    if download.received > received:
+                        failures = 0
+                    failures += 1
+                    reason = describe_download_error(e)
+                    if failures > MAX_RETRY_COUNT:
+                        raise DownloadError(f"{reason} (попыток: {attempts})") from e
+
+                    delay = self._get_retry_delay(failures, e)
+                    logging.warning(f"Ошибка загрузки {self.url}: {reason}. "
+                                    f"Повтор через {delay:.1f} с, загружено байт: {download.received}")
+                    if not self._wait_retry(delay):
+                        return False
+
+            content_hash = download.finish(unchanged_hash=previous.get('sha1'), backup_path=self.backup_path)
+        finally:
+            download.discard()
+
+        self.not_modified = content_hash == previous.get('sha1')
+        self.validators = dict(validators, sha1=content_hash)
+        return True
+
+    @staticmethod
+    def _get_retry_delay(failures: int, error: Exception) -> float:
+        """Вычисляет паузу перед повторной попыткой
+
+        Пауза удваивается с каждой неудачей подряд (не больше
+        DOWNLOAD_RETRY_MAX_DELAY) и выбирается случайно из второй половины
+        интервала, чтобы клиенты не повторяли запросы одновременно.
+        Заданный сервером Retry-After (в секундах) соблюдается.
+        """
+        delay = min(DOWNLOAD_RETRY_MAX_DELAY, DOWNLOAD_RETRY_DELAY * 2 ** (failures - 1))
+        if isinstance(error, requests.HTTPError):
+            retry_after = error.response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return float(min(DOWNLOAD_RETRY_MAX_DELAY, max(delay, int(retry_after))))
+        return random.uniform(delay / 2, delay)
+
+    def _wait_retry(self, delay: float) -> bool:
+        """Ждет перед повторной попыткой
+
+        Returns:
+            bool: False, если поток прерван во время ожидания
+        """
+        deadline = time.monotonic() + delay
+        while not self._abort and time.monotonic() < deadline:
+            self.msleep(100)
+        return not self._abort
+
+
+class DownloadThread(FileDownloadThread):
+    """Поток для загрузки файлов по URL с поддержкой прерывания"""
+    finished = pyqtSignal(bool, str)
 
     def run(self) -> None:
         """Выполняет загрузку файла с проверкой прерывания"""
@@ -152,51 +544,22 @@ class DownloadThread(BaseThread):
                 self.finished.emit(False, "Операция прервана")
                 return
 
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            
-            request = urllib.request.Request(self.url, headers=headers)
-            
-            if self._abort:
+            if not self._download():
                 self.finished.emit(False, "Операция прервана")
                 return
-                
-            response = urllib.request.urlopen(request, timeout=30)
-            
-            if self._abort:
-                self.finished.emit(False, "Операция прервана")
-                return
-
-            # Читаем данные порциями для возможности прерывания
-            data = b''
-            chunk_size = 8192
-            while True:
-                if self._abort:
-                    self.finished.emit(False, "Операция прервана")
-                    return
-                    
-                chunk = response.read(chunk_size)
-                if not chunk:
-                    break
-                data += chunk
-
-            # Записываем файл
-            with open(self.file_path, 'wb') as f:
-                f.write(data)
 
             if not self._abort:
                 self.finished.emit(True, "")
-                
-        except urllib.error.URLError as e:
-            if not self._abort:
-                self.finished.emit(False, f"Ошибка URL: {str(e)}")
-        except urllib.error.HTTPError as e:
+
+        except requests.HTTPError as e:
             if not self._abort:
-                self.finished.emit(False, f"Ошибка HTTP: {e.code} {e.reason}")
-        except (TimeoutError, socket.timeout, socket.error):
+                self.finished.emit(False, f"Ошибка HTTP: {e.response.status_code} {e.response.reason}")
+        except requests.Timeout:
             if not self._abort:
                 self.finished.emit(False, "Превышено время ожидания")
+        except requests.RequestException as e:
+            if not self._abort:
+                self.finished.emit(False, f"Ошибка URL: {str(e)}")
         except Exception as e:
             if not self._abort:
                 self.finished.emit(False, str(e))
@@ -206,10 +569,11 @@ class ChannelPlayThread(BaseThread):
     """Поток для асинхронного воспроизведения канала с поддержкой прерывания"""
     setup_finished = pyqtSignal(bool, str, object)  # Статус, сообщение об ошибке, медиа-объект
 
-    def __init__(self, url: str, options: Optional[Dict[str, Any]] = None, vlc_instance=None):
+    def __init__(self, channel, vlc_instance=None):
         super().__init__()
-        self.url = url
-        self.options = options or {}
+        self.channel = channel
+        self.url = channel.url
+        self.options = channel.options or {}
         self.vlc_instance = vlc_instance
         self.media = None
 
@@ -272,14 +636,28 @@ class ChannelPlayThread(BaseThread):
                 self.setup_finished.emit(False, str(e), None)
 
 
-class PlaylistDownloadThread(BaseThread):
-    """Поток для загрузки плейлистов с возвратом URL источника и поддержкой прерывания"""
+class PlaylistDownloadThread(FileDownloadThread):
+    """Поток для загрузки плейлистов с возвратом URL источника и поддержкой прерывания
+
+    Если передан playlist_manager, тело ответа разбирается по мере загрузки:
+    каналы отправляются порциями через channels_parsed, как в
+    PlaylistParseThread, а поисковый индекс и снимок для кэша разобранных
+    плейлистов строятся попутно. Плейлист в zip-архиве разбирается из
+    файла после загрузки.
+    """
     finished = pyqtSignal(bool, str, str)
+    channels_parsed = pyqtSignal(list)  # Очередная порция каналов при разборе во время загрузки
 
-    def __init__(self, url: str, file_path: str):
-        super().__init__()
-        self.url = url
-        self.file_path = file_path
+    def __init__(self, url: str, file_path: str, validators: Optional[Dict[str, str]] = None,
+                 backup_path: Optional[str] = None, playlist_manager=None,
+                 batch_size: int = PLAYLIST_PARSE_BATCH_SIZE):
+        super().__init__(url, file_path, validators, backup_path)
+        self.playlist_manager = playlist_manager
+        self.batch_size = batch_size
+        self.search_index = ChannelSearchIndex() if playlist_manager is not None else None
+        self._parser = None
+        self._batch = []
+        self._parsed_channels = []
 
     def run(self) -> None:
         """Выполняет загрузку плейлиста с проверкой прерывания"""
@@ -288,163 +666,593 @@ class PlaylistDownloadThread(BaseThread):
                 self.finished.emit(False, "Операция прервана", "")
                 return
 
-            # Настраиваем opener с User-Agent для обхода ограничений
-            opener = urllib.request.build_opener()
-            opener.addheaders = [('User-Agent', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')]
-            urllib.request.install_opener(opener)
+            on_chunk = None
+            if self.playlist_manager is not None:
+                self._parser = M3UParser()
+                on_chunk = self._parse_chunk
 
-            if self._abort:
+            # Содержимое проверяется на признаки плейлиста уже по первым байтам
+            if not self._download(check_head=is_playlist_head, on_chunk=on_chunk):
                 self.finished.emit(False, "Операция прервана", "")
                 return
 
-            # Скачиваем напрямую
-            request = urllib.request.Request(self.url)
-            response = urllib.request.urlopen(request, timeout=30)
+            if self.playlist_manager is not None:
+                self._finish_parsing()
 
-            if self._abort:
-                self.finished.emit(False, "Операция прервана", "")
-                return
+            if not self._abort:
+                self.finished.emit(True, "", self.url)
 
-            # Читаем содержимое порциями для возможности прерывания
-            content = b''
-            chunk_size = 8192
-            while True:
+        except requests.RequestException as e:
+            if not self._abort:
+                self.finished.emit(False, describe_download_error(e), "")
+        except Exception as e:
+            if not self._abort:
+                self.finished.emit(False, str(e), "")
+
+    def _parse_chunk(self, chunk: bytes) -> None:
+        """Разбирает очередную порцию загруженных данных"""
+        for channel in self._parser.feed(chunk):
+            self._add_parsed_channel(channel)
+
+    def _add_parsed_channel(self, channel) -> None:
+        """Добавляет канал в текущую порцию и отправляет заполненную порцию"""
+        self._batch.append(channel)
+        self._parsed_channels.append(channel)
+        self.search_index.add(channel.name)
+        if len(self._batch) >= self.batch_size:
+            self.channels_parsed.emit(self._batch)
+            self._batch = []
+
+    def _finish_parsing(self) -> None:
+        """Отправляет последние каналы и сохраняет снимок разобранного плейлиста"""
+        not_streamed = self.decompressor is not None and not self.decompressor.streamable
+        if (self.not_modified and not self._parsed_channels) or not_streamed:
+            # Файл на диске не изменился и не загружался (читаем его, обычно из кэша)
+            # или его нельзя было разобрать при загрузке
+            for channel in self.playlist_manager.iter_playlist(self.file_path):
+                self._add_parsed_channel(channel)
+        else:
+            for channel in self._parser.finish():
+                self._add_parsed_channel(channel)
+            self.playlist_manager.cache.save(self.file_path, self._parsed_channels,
+                                             PlaylistCache.get_file_signature(self.file_path))
+
+        if self._batch:
+            self.channels_parsed.emit(self._batch)
+            self._batch = []
+
+
+class PlaylistParseThread(BaseThread):
+    """Поток для фонового разбора плейлиста с выдачей каналов порциями
+
+    Каналы отправляются в главный поток пачками через сигнал channels_parsed,
+    поэтому интерфейс может заполняться по мере разбора файла. Попутно
+    строится поисковый индекс search_index, который главный поток забирает
+    после успешного завершения.
+    """
+    channels_parsed = pyqtSignal(list)  # Очередная порция разобранных каналов
+    finished = pyqtSignal(bool, str)  # Статус, сообщение об ошибке
+
+    def __init__(self, playlist_manager, file_path: str, batch_size: int = PLAYLIST_PARSE_BATCH_SIZE):
+        super().__init__()
+        self.playlist_manager = playlist_manager
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.search_index = ChannelSearchIndex()
+
+    def run(self) -> None:
+        """Выполняет разбор плейлиста с проверкой прерывания"""
+        try:
+            batch = []
+            for channel in self.playlist_manager.iter_playlist(self.file_path):
                 if self._abort:
-                    self.finished.emit(False, "Операция прервана", "")
+                    self.finished.emit(False, "Операция прервана")
                     return
-                    
-                chunk = response.read(chunk_size)
-                if not chunk:
-                    break
-                content += chunk
+
+                batch.append(channel)
+                self.search_index.add(channel.name)
+                if len(batch) >= self.batch_size:
+                    self.channels_parsed.emit(batch)
+                    batch = []
 
             if self._abort:
-                self.finished.emit(False, "Операция прервана", "")
+                self.finished.emit(False, "Операция прервана")
                 return
 
-            # Проверяем, что контент похож на плейлист
-            content_str = content.decode('utf-8', errors='ignore')
-            if not ('#EXTM3U' in content_str or '#EXTINF' in content_str):
-                self.finished.emit(False, "Скачанный файл не является плейлистом IPTV", "")
-                return
+            if batch:
+                self.channels_parsed.emit(batch)
 
-            # Записываем файл
-            with open(self.file_path, 'wb') as f:
-                f.write(content)
+            self.finished.emit(True, "")
 
-            if not self._abort:
-                self.finished.emit(True, "", self.url)
-                
-        except (TimeoutError, socket.timeout, socket.error):
-            if not self._abort:
-                self.finished.emit(False, "Превышено время ожидания", "")
         except Exception as e:
             if not self._abort:
-                self.finished.emit(False, str(e), "")
+                logging.error(f"Ошибка в потоке разбора плейлиста: {str(e)}")
+                self.finished.emit(False, str(e))
 
 
-class LogoDownloadThread(BaseThread):
-    """Поток для асинхронной загрузки логотипов каналов с поддержкой прерывания"""
-    logo_loaded = pyqtSignal(str, QPixmap)  # URL логотипа, загруженный логотип
-    logo_failed = pyqtSignal(str)  # URL логотипа, который не удалось загрузить
+class ChannelSearchThread(BaseThread):
+    """Поток для асинхронного поиска каналов
+
+    Живет все время работы приложения и выполняет запросы по одному.
+    Новый запрос вытесняет еще не начатый, а выполняющийся прерывается
+    между этапами поиска. Каждый запрос получает номер, по которому
+    главный поток отличает актуальный результат от устаревших.
+    """
+    search_finished = pyqtSignal(int, list)  # Номер запроса, идентификаторы каналов
 
-    def __init__(self, logo_url: str):
+    def __init__(self, playlist_manager):
         super().__init__()
-        self.logo_url = logo_url
-        self.debug_mode = False  # По умолчанию режим отладки выключен
+        self.playlist_manager = playlist_manager
+        self._condition = Condition()
+        self._request = None
+        self._generation = 0
+
+    def search(self, text: str, category: str, hidden_names=None) -> int:
+        """Ставит запрос в очередь вместо ожидающего
+
+        Returns:
+            int: Номер запроса
+        """
+        with self._condition:
+            self._generation += 1
+            self._request = (self._generation, text, category, hidden_names)
+            self._condition.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """Отменяет ожидающий и выполняющийся запросы"""
+        with self._condition:
+            self._generation += 1
+            self._request = None
+
+    def abort(self) -> None:
+        """Прерывает поток, пробуждая его, если он ждет запрос"""
+        super().abort()
+        with self._condition:
+            self._condition.notify()
 
     def run(self) -> None:
-        """Выполняет загрузку логотипа с проверкой прерывания"""
+        """Обрабатывает запросы, пока поток не прерван"""
+        while True:
+            with self._condition:
+                while self._request is None and not self._abort:
+                    self._condition.wait()
+                if self._abort:
+                    return
+                generation, text, category, hidden_names = self._request
+                self._request = None
+
+            def is_cancelled():
+                return self._abort or generation != self._generation
+
+            try:
+                started = time.perf_counter()
+                channel_ids = self.playlist_manager.search_channels(
+                    text, category, hidden_names, is_cancelled)
+                logging.debug(f"Поиск '{text}': {(time.perf_counter() - started) * 1000:.1f} мс")
+            except Exception as e:
+                logging.error(f"Ошибка в потоке поиска каналов: {str(e)}")
+                continue
+
+            if channel_ids is not None and not is_cancelled():
+                self.search_finished.emit(generation, channel_ids)
+
+
+def decode_logo(image_data: bytes) -> Optional[QImage]:
+    """Декодирует и масштабирует логотип
+
+    QImage, в отличие от QPixmap, можно безопасно создавать вне главного потока.
+
+    Returns:
+        QImage | None: Логотип не больше LOGO_SIZE или None, если данные не являются изображением
+    """
+    try:
+        # Предварительная обработка изображения через PIL для устранения проблем с iCCP профилем
+        # но с сохранением альфа-канала для прозрачности
         try:
-            # Проверяем флаг прерывания
-            if self._abort:
-                self.logo_failed.emit(self.logo_url)
-                return
+            from PIL import Image
+            import io
+            # Открываем изображение через PIL
+            img = Image.open(io.BytesIO(image_data))
 
-            # Пропускаем URL от известных проблемных серверов
-            skip_domains = ['fe-ural.svc.iptv.rt.ru', 'fe-sib.svc.iptv.rt.ru',
-                          'fe-sth.svc.iptv.rt.ru', 'fe-vlg.svc.iptv.rt.ru',
-                          'fe-nw.svc.iptv.rt.ru', 'picon.ml', 'yt3.ggpht.com',
-                          'pbs.twimg.com', 'television-live.com', 'tsifra-tv.ru',
-                          'nm-tv.ru', 'gas-kvas.com', 'online-television.net']
+            # Сохраняем альфа-канал для прозрачности
+            output = io.BytesIO()
+            if img.mode in ('RGBA', 'LA') or 'transparency' in img.info:
+                # Сохраняем с альфа-каналом для прозрачности
+                if img.mode != 'RGBA':
+                    img = img.convert('RGBA')
+                img.save(output, format='PNG', icc_profile=None)
+            else:
+                # Для изображений без прозрачности можем конвертировать в RGB
+                if img.mode == 'RGBA':
+                    # Создаем белый фон только если нет реальной прозрачности
+                    background = Image.new('RGB', img.size, (255, 255, 255))
+                    background.paste(img, mask=img.split()[3])
+                    img = background
+                img.save(output, format='PNG', icc_profile=None)
+            image_data = output.getvalue()
+        except (ImportError, Exception):
+            # Пропускаем предобработку, если PIL не установлен или возникла ошибка
+            pass
 
-            if any(domain in self.logo_url for domain in skip_domains):
-                self.logo_failed.emit(self.logo_url)
-                return
+        image = QImage.fromData(image_data)
+        if image.isNull():
+            return None
+
+        # Масштабируем логотип до нужного размера с сохранением пропорций
+        image = image.scaled(LOGO_SIZE[0], LOGO_SIZE[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        # Приводим к формату, который QPixmap.fromImage принимает без преобразования,
+        # сохраняя альфа-канал у прозрачных логотипов
+        if image.hasAlphaChannel():
+            return image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+        return image.convertToFormat(QImage.Format_RGB32)
+    except Exception:
+        return None
 
-            # Проверяем флаг прерывания еще раз
+
+def store_logo(disk_cache, atlas, logo_url: str, image: QImage, response=None) -> None:
+    """Сохраняет подготовленный логотип в дисковый кэш и атлас
+
+    Args:
+        disk_cache: Дисковый кэш логотипов (LogoDiskCache)
+        atlas: Атлас логотипов (LogoAtlas) или None
+        logo_url: URL логотипа
+        image: Логотип, подготовленный decode_logo
+        response: Ответ сервера, из которого берутся ETag и Last-Modified
+    """
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.WriteOnly)
+    if not image.save(buffer, 'PNG'):
+        return
+
+    headers = response.headers if response is not None else {}
+    disk_cache.store(logo_url, bytes(data), headers.get('ETag'), headers.get('Last-Modified'))
+    if atlas is not None:
+        atlas.add(logo_url, image)
+
+
+class LogoCacheMaintenanceThread(BaseThread):
+    """Поток обслуживания дискового кэша логотипов
+
+    Сверяет индекс кэша с каталогом и вытесняет давно не использованные
+    логотипы, не занимая главный поток обходом файлов. Если включен атлас
+    логотипов, перестраивает его без плиток, вытесненных из кэша.
+    """
+    finished = pyqtSignal(bool, str)  # Статус, сообщение об ошибке
+
+    def __init__(self, disk_cache, atlas=None):
+        super().__init__()
+        self.disk_cache = disk_cache
+        self.atlas = atlas
+
+    def run(self) -> None:
+        """Выполняет обслуживание кэша с проверкой прерывания"""
+        try:
+            self.disk_cache.maintain(self.is_aborted)
+            if self.atlas is not None and not self._abort:
+                keys = self.disk_cache.get_keys()
+                if self.atlas.needs_compaction(keys):
+                    self.atlas.compact(keys, self.is_aborted)
             if self._abort:
-                self.logo_failed.emit(self.logo_url)
-                return
+                self.finished.emit(False, "Операция прервана")
+            else:
+                self.finished.emit(True, "")
+        except Exception as e:
+            if not self._abort:
+                logging.error(f"Ошибка обслуживания кэша логотипов: {str(e)}")
+                self.finished.emit(False, str(e))
+
+
+class LogoRevalidationThread(BaseThread):
+    """Поток проверки актуальности кэшированных логотипов
+
+    Для логотипов, не проверявшихся LOGO_REVALIDATE_AFTER секунд, выполняет
+    условные запросы с If-None-Match/If-Modified-Since. Неизменившийся
+    логотип стоит только ответа 304, а обновленный сохраняется в кэш и
+    передается главному потоку через logo_updated. Запросы идут по одному,
+    чтобы проверка не мешала загрузке видимых логотипов.
+
+    Логотипы заблокированных хостов не запрашиваются, а ошибки соединения
+    учитываются в кэше неудачных загрузок. Непроверенный из-за ошибки
+    логотип остается в кэше и проверяется снова через LOGO_REVALIDATE_AFTER.
+    """
+    logo_updated = pyqtSignal(str, QImage)  # URL логотипа, новый логотип
+    finished = pyqtSignal(bool, str)  # Статус, сообщение об ошибке
+
+    def __init__(self, disk_cache, atlas=None, failure_cache=None,
+                 max_age: float = LOGO_REVALIDATE_AFTER, limit: int = LOGO_REVALIDATE_BATCH):
+        super().__init__()
+        self.disk_cache = disk_cache
+        self.atlas = atlas
+        self.failure_cache = failure_cache
+        self.max_age = max_age
+        self.limit = limit
+
+    def run(self) -> None:
+        """Проверяет устаревшие логотипы с проверкой прерывания"""
+        try:
+            unchanged = updated = failed = 0
+            failure_cache = self.failure_cache
+            for logo_url, etag, last_modified in self.disk_cache.get_stale(self.max_age, self.limit):
+                if self._abort:
+                    self.finished.emit(False, "Операция прервана")
+                    return
+
+                # Хост недоступен - откладываем проверку до следующего срока
+                if failure_cache is not None and failure_cache.is_host_blocked(failure_cache.get_host(logo_url)):
+                    self.disk_cache.mark_validated(logo_url)
+                    failed += 1
+                    continue
+
+                headers = {}
+                if etag:
+                    headers['If-None-Match'] = etag
+                if last_modified:
+                    headers['If-Modified-Since'] = last_modified
 
-            # Пробуем загрузить изображение из URL с проверкой сертификата
-            response = requests.get(self.logo_url, timeout=3, verify=False)
-            if response.status_code == 200:
                 try:
-                    # Предварительная обработка изображения через PIL для устранения проблем с iCCP профилем
-                    # но с сохранением альфа-канала для прозрачности
-                    image_data = response.content
-                    try:
-                        from PIL import Image
-                        import io
-                        # Открываем изображение через PIL
-                        img = Image.open(io.BytesIO(image_data))
-
-                        # Сохраняем альфа-канал для прозрачности
-                        output = io.BytesIO()
-                        if img.mode in ('RGBA', 'LA') or 'transparency' in img.info:
-                            # Сохраняем с альфа-каналом для прозрачности
-                            if img.mode != 'RGBA':
-                                img = img.convert('RGBA')
-                            img.save(output, format='PNG', icc_profile=None)
-                        else:
-                            # Для изображений без прозрачности можем конвертировать в RGB
-                            if img.mode == 'RGBA':
-                                # Создаем белый фон только если нет реальной прозрачности
-                                background = Image.new('RGB', img.size, (255, 255, 255))
-                                background.paste(img, mask=img.split()[3])
-                                img = background
-                            img.save(output, format='PNG', icc_profile=None)
-                        image_data = output.getvalue()
-                    except (ImportError, Exception):
-                        # Пропускаем предобработку, если PIL не установлен или возникла ошибка
-                        pass
+                    response = HttpClient.shared().get(logo_url, timeout=3, verify=False, headers=headers)
+                except requests.RequestException as e:
+                    # Недоступный сервер не повод выбрасывать логотип, проверим в следующий раз.
+                    # Отмечаем только хост: сам логотип из кэша должен показываться и дальше
+                    if failure_cache is not None and isinstance(e, (requests.Timeout, requests.ConnectionError)):
+                        failure_cache.record_host_failure(logo_url)
+                    self.disk_cache.mark_validated(logo_url)
+                    failed += 1
+                    continue
 
-                    if self._abort:
-                        self.logo_failed.emit(self.logo_url)
-                        return
+                if failure_cache is not None and response.status_code in (200, 304):
+                    failure_cache.record_success(logo_url)
 
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(image_data)
-                    if not pixmap.isNull():
-                        # Масштабируем логотип до нужного размера с сохранением альфа-канала
-                        scaled_pixmap = pixmap.scaled(32, 32, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-
-                        # Убеждаемся, что масштабированный pixmap поддерживает прозрачность
-                        if pixmap.hasAlphaChannel() and not scaled_pixmap.hasAlphaChannel():
-                            # Создаем новый pixmap с альфа-каналом
-                            alpha_pixmap = QPixmap(scaled_pixmap.size())
-                            alpha_pixmap.fill(Qt.transparent)
-                            painter = QPainter(alpha_pixmap)
-                            painter.setCompositionMode(QPainter.CompositionMode_SourceOver)
-                            painter.drawPixmap(0, 0, scaled_pixmap)
-                            painter.end()
-                            scaled_pixmap = alpha_pixmap
-
-                        if not self._abort:
-                            self.logo_loaded.emit(self.logo_url, scaled_pixmap)
-                    else:
-                        if not self._abort:
-                            self.logo_failed.emit(self.logo_url)
-                except Exception:
+                if response.status_code == 304:
+                    self.disk_cache.mark_validated(logo_url)
+                    unchanged += 1
+                elif response.status_code == 200:
+                    image = decode_logo(response.content)
+                    if image is None:
+                        self.disk_cache.mark_validated(logo_url)
+                        continue
+                    store_logo(self.disk_cache, self.atlas, logo_url, image, response)
+                    updated += 1
                     if not self._abort:
-                        self.logo_failed.emit(self.logo_url)
-            else:
-                if not self._abort:
-                    self.logo_failed.emit(self.logo_url)
+                        self.logo_updated.emit(logo_url, image)
+                else:
+                    self.disk_cache.mark_validated(logo_url)
+
+            logging.info(f"Проверка логотипов: без изменений {unchanged}, обновлено {updated}, "
+                         f"не проверено {failed}")
+            self.disk_cache.save_index()
+            if failure_cache is not None:
+                failure_cache.save()
+            if not self._abort:
+                self.finished.emit(True, "")
         except Exception as e:
-            # Выводим ошибку только в режиме отладки
-            if self.debug_mode and not self._abort:
-                print(f"Ошибка загрузки логотипа {self.logo_url}: {str(e)}")
             if not self._abort:
-                self.logo_failed.emit(self.logo_url)
+                logging.error(f"Ошибка проверки актуальности логотипов: {str(e)}")
+                self.finished.emit(False, str(e))
+
+
+class LogoFetchService(QObject):
+    """Сервис загрузки логотипов с фиксированным пулом рабочих потоков
+
+    Запросы складываются в ограниченную очередь и выбираются по приоритету
+    (меньшее значение - раньше), при равном приоритете - в порядке поступления.
+    Повторные запросы URL, который уже ждет в очереди или загружается,
+    объединяются с первым. При переполнении очереди вытесняется самый старый
+    из наименее срочных запросов: его строки давно не отрисовывались и
+    запросят логотип снова, когда появятся на экране.
+
+    Рабочие потоки сверяются с кэшем неудачных загрузок: логотипы с
+    заблокированных хостов не запрашиваются, а результаты каждой загрузки
+    записываются в кэш. Декодирование, масштабирование и запись в дисковый
+    кэш тоже выполняются в рабочих потоках, а главный поток получает готовый
+    QImage и только превращает его в QPixmap.
+    """
+    logo_loaded = pyqtSignal(str, QImage)  # URL логотипа, логотип LOGO_SIZE
+    logo_failed = pyqtSignal(str)  # URL логотипа, который не удалось загрузить
+
+    def __init__(self, failure_cache, disk_cache, atlas=None, worker_count: int = MAX_CONCURRENT_DOWNLOADS,
+                 max_queued: int = LOGO_QUEUE_SIZE, parent=None):
+        """
+        Args:
+            failure_cache: Кэш неудачных загрузок (LogoFailureCache)
+            disk_cache: Дисковый кэш логотипов (LogoDiskCache)
+            atlas: Атлас логотипов (LogoAtlas) или None, если он отключен
+            worker_count: Количество рабочих потоков
+            max_queued: Максимальная длина очереди
+            parent: Родительский объект Qt
+        """
+        super().__init__(parent)
+        self.failure_cache = failure_cache
+        self.disk_cache = disk_cache
+        self.atlas = atlas
+        self.max_queued = max_queued
+        self._condition = Condition()
+        self._queue: Dict[str, tuple] = {}  # URL -> (приоритет, порядковый номер)
+        self._in_flight = set()  # URL, которые сейчас загружаются
+        self._sequence = 0
+        self._stopped = False
+        self._workers = [LogoDownloadThread(self) for _ in range(worker_count)]
+
+    def start(self) -> None:
+        """Запускает рабочие потоки"""
+        for worker in self._workers:
+            worker.start()
+
+    def request(self, logo_url: str, priority: int = LOGO_PRIORITY_BACKGROUND) -> bool:
+        """Ставит логотип в очередь на загрузку
+
+        Returns:
+            bool: False, если сервис остановлен
+        """
+        with self._condition:
+            if self._stopped:
+                return False
+            self._enqueue(logo_url, priority)
+            self._condition.notify()
+            return True
+
+    def reprioritize(self, priorities: Dict[str, int]) -> None:
+        """Пересчитывает очередь по положению строк относительно видимой области
+
+        Запросы из priorities получают указанный приоритет (недостающие
+        ставятся в очередь), остальные ожидающие запросы снимаются: их строки
+        ушли далеко от видимой области. Начатые загрузки не прерываются.
+
+        Args:
+            priorities: Словарь URL логотипа -> приоритет
+        """
+        with self._condition:
+            if self._stopped:
+                return
+            for logo_url in [url for url in self._queue if url not in priorities]:
+                del self._queue[logo_url]
+            for logo_url, priority in priorities.items():
+                entry = self._queue.get(logo_url)
+                if entry is not None:
+                    self._queue[logo_url] = (priority, entry[1])
+                else:
+                    self._enqueue(logo_url, priority)
+            self._condition.notify_all()
+
+    def _enqueue(self, logo_url: str, priority: int) -> None:
+        """Добавляет запрос или повышает приоритет ожидающего (вызывается под блокировкой)"""
+        if logo_url in self._in_flight:
+            return
+
+        entry = self._queue.get(logo_url)
+        if entry is not None:
+            # Повторный запрос может только повысить срочность, место в очереди сохраняется
+            if priority < entry[0]:
+                self._queue[logo_url] = (priority, entry[1])
+            return
+
+        if len(self._queue) >= self.max_queued:
+            evicted = max(self._queue, key=lambda url: (self._queue[url][0], -self._queue[url][1]))
+            del self._queue[evicted]
+
+        self._sequence += 1
+        self._queue[logo_url] = (priority, self._sequence)
+
+    def clear(self) -> None:
+        """Очищает очередь, не затрагивая уже начатые загрузки"""
+        with self._condition:
+            self._queue.clear()
+
+    def pending_count(self) -> int:
+        """Возвращает количество ожидающих и выполняющихся запросов"""
+        with self._condition:
+            return len(self._queue) + len(self._in_flight)
+
+    def abort(self) -> None:
+        """Прерывает рабочие потоки без ожидания их завершения"""
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            for worker in self._workers:
+                worker.abort()
+            self._condition.notify_all()
+
+    def stop(self, timeout: int = 1000) -> None:
+        """Прерывает рабочие потоки и ждет их завершения"""
+        self.abort()
+        for worker in self._workers:
+            if not worker.wait(timeout):
+                logging.warning("Принудительное завершение потока загрузки логотипов")
+                worker.terminate()
+                worker.wait(500)
+
+    def _take(self, worker):
+        """Забирает самый срочный запрос, ожидая его появления
+
+        Returns:
+            str | None: URL логотипа или None, если поток прерван
+        """
+        with self._condition:
+            while not self._queue and not worker.is_aborted():
+                self._condition.wait()
+            if worker.is_aborted():
+                return None
+            logo_url = min(self._queue, key=self._queue.get)
+            del self._queue[logo_url]
+            self._in_flight.add(logo_url)
+            return logo_url
+
+    def _done(self, logo_url: str) -> None:
+        with self._condition:
+            self._in_flight.discard(logo_url)
+
+
+class LogoDownloadThread(BaseThread):
+    """Рабочий поток пула LogoFetchService
+
+    Загружает логотипы из общей очереди сервиса, пока не будет прерван,
+    и сообщает о результатах через сигналы сервиса.
+    """
+
+    def __init__(self, service: LogoFetchService):
+        super().__init__()
+        self.service = service
+        self.debug_mode = False  # По умолчанию режим отладки выключен
+
+    def run(self) -> None:
+        """Обрабатывает запросы сервиса, пока поток не прерван"""
+        while True:
+            logo_url = self.service._take(self)
+            if logo_url is None:
+                return
+
+            failure_cache = self.service.failure_cache
+            image = None
+            try:
+                # Хост мог попасть в список недоступных, пока запрос ждал в очереди
+                if failure_cache.is_host_blocked(failure_cache.get_host(logo_url)):
+                    continue
+                image, response = self._download_logo(logo_url)
+                if not self._abort:
+                    if image is not None:
+                        failure_cache.record_success(logo_url)
+                        store_logo(self.service.disk_cache, self.service.atlas, logo_url, image, response)
+                    else:
+                        failure_cache.record_failure(logo_url)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                # Хост не ответил или не принял соединение - это учитывается для его блокировки
+                if not self._abort:
+                    failure_cache.record_failure(logo_url, host_error=True)
+                    if self.debug_mode:
+                        print(f"Ошибка соединения при загрузке логотипа {logo_url}: {str(e)}")
+            except Exception as e:
+                if not self._abort:
+                    failure_cache.record_failure(logo_url)
+                    # Выводим ошибку только в режиме отладки
+                    if self.debug_mode:
+                        print(f"Ошибка загрузки логотипа {logo_url}: {str(e)}")
+            finally:
+                self.service._done(logo_url)
+                if not self._abort:
+                    if image is not None:
+                        self.service.logo_loaded.emit(logo_url, image)
+                    else:
+                        self.service.logo_failed.emit(logo_url)
+
+            if self._abort:
+                return
+
+    def _download_logo(self, logo_url: str):
+        """Загружает и подготавливает логотип
+
+        Returns:
+            tuple: (QImage | None, ответ сервера | None)
+        """
+        # Проверяем флаг прерывания
+        if self._abort:
+            return None, None
+
+        # Пробуем загрузить изображение из URL без проверки сертификата
+        response = HttpClient.shared().get(logo_url, timeout=3, verify=False)
+        if response.status_code != 200 or self._abort:
+            return None, None
+
+        return decode_logo(response.content), response